@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 from helpers.config import get_settings
 
 from stores.llm.LLMProviderFactory import LLMProviderFactory
@@ -6,15 +7,58 @@ from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
 from stores.llm.templates.template_parser import TemplateParser
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+import asyncio
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# worker-process scoped resources, set up by worker_process_init
+_worker_loop = None
+_worker_setup_utils = None
+_worker_listener = None
+
 async def get_setup_utils():
+    """
+    Engine, providers and clients for a task. Inside an initialized worker
+    process these are shared for the worker's lifetime; elsewhere a fresh set
+    is built. Hand them back with release_setup_utils().
+    """
+    if _worker_setup_utils is not None and asyncio.get_running_loop() is _worker_loop:
+        return _worker_setup_utils
+
+    return await create_setup_utils()
+
+async def release_setup_utils(db_engine=None, vectordb_client=None):
+    # shared resources are closed on worker shutdown
+    if _worker_setup_utils is not None and db_engine is _worker_setup_utils[0]:
+        return
+
+    if db_engine:
+        await db_engine.dispose()
+
+    if vectordb_client:
+        await vectordb_client.disconnect()
+
+def run_async(coroutine):
+    """Run a task coroutine on the worker's event loop, or in a new loop outside a worker."""
+    if _worker_loop is None:
+        return asyncio.run(coroutine)
+
+    return asyncio.run_coroutine_threadsafe(coroutine, _worker_loop).result()
+
+async def create_setup_utils():
     settings = get_settings()
 
     postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
 
-    db_engine = create_async_engine(postgres_conn)
+    db_engine = create_async_engine(
+        postgres_conn,
+        pool_size=settings.CELERY_WORKER_DB_POOL_SIZE,
+        pool_pre_ping=True,
+    )
     db_client = sessionmaker(
         db_engine, class_=AsyncSession, expire_on_commit=False
     )
@@ -45,6 +89,61 @@ async def get_setup_utils():
     return (db_engine, db_client, llm_provider_factory, vectordb_provider_factory,
             generation_client, embedding_client, vectordb_client, template_parser)
 
+@worker_process_init.connect
+def init_worker_resources(**kwargs):
+    """
+    Give each worker process one event loop (on its own thread) and one set of
+    engine/providers/clients for all of its tasks, instead of building and
+    disposing them in a fresh asyncio.run() per task.
+    """
+    global _worker_loop, _worker_setup_utils, _worker_listener
+
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="celery-worker-loop", daemon=True).start()
+
+    try:
+        setup_utils = asyncio.run_coroutine_threadsafe(create_setup_utils(), loop).result()
+    except Exception as e:
+        # tasks fall back to per-task setup
+        logger.error(f"Failed to initialize worker resources: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        return
+
+    vectordb_client = setup_utils[6]
+
+    async def start_listener():
+        # cached collection metadata must follow invalidations from the API and other workers
+        return asyncio.create_task(vectordb_client.metadata_cache.listen())
+
+    _worker_listener = asyncio.run_coroutine_threadsafe(start_listener(), loop).result()
+    _worker_setup_utils = setup_utils
+    _worker_loop = loop
+
+@worker_process_shutdown.connect
+def shutdown_worker_resources(**kwargs):
+    global _worker_loop, _worker_setup_utils, _worker_listener
+
+    if _worker_loop is None:
+        return
+
+    loop, setup_utils, listener = _worker_loop, _worker_setup_utils, _worker_listener
+    _worker_loop, _worker_setup_utils, _worker_listener = None, None, None
+
+    async def close_resources():
+        if listener:
+            listener.cancel()
+
+        db_engine, vectordb_client = setup_utils[0], setup_utils[6]
+        await db_engine.dispose()
+        await vectordb_client.disconnect()
+
+    try:
+        asyncio.run_coroutine_threadsafe(close_resources(), loop).result(timeout=30)
+    except Exception as e:
+        logger.error(f"Failed to close worker resources: {e}")
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+
 # Create Celery application instance
 celery_app = Celery(
     "minirag",
@@ -55,6 +154,7 @@ celery_app = Celery(
         "tasks.data_indexing",
         "tasks.process_workflow",
         "tasks.maintenance",
+        "tasks.eda",
     ]
 )
 
@@ -87,9 +187,14 @@ celery_app.conf.update(
 
     task_routes={
         "tasks.file_processing.process_project_files": {"queue": "file_processing"},
+        "tasks.file_processing.append_file_tail": {"queue": "file_processing"},
         "tasks.data_indexing.index_data_content": {"queue": "data_indexing"},
+        "tasks.data_indexing.index_chunk_batch": {"queue": "data_indexing"},
         "tasks.process_workflow.process_and_push_workflow": {"queue": "file_processing"},
         "tasks.maintenance.clean_celery_executions_table": {"queue": "default"},
+        "tasks.eda.analyze_log_file": {"queue": "file_processing"},
+        "tasks.eda.scan_log_range": {"queue": "file_processing"},
+        "tasks.eda.merge_log_ranges": {"queue": "file_processing"},
     },
 
     beat_schedule={
@@ -1,132 +1,179 @@
 from .BaseController import BaseController
 from .ProjectController import ProjectController
-import re
+from stores.logparser.LogParser import LogParser
+from stores.logparser.LogFormats import detect_file_log_format
+from stores.logparser.LogSummary import LogSummary, summarize_file_range
+from stores.logparser.ParallelColumnarLog import split_file_ranges
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import multiprocessing
+import hashlib
+import mmap
 import os
 import logging
-from typing import Dict, Any
 
 logger = logging.getLogger('uvicorn.error')
 
 class EDAController(BaseController):
-    def __init__(self, project_id: str, file_id: str):
+
+    # bump when the EDA payload changes shape, persisted results are then recomputed
+    CACHE_VERSION = 1
+
+    def __init__(self, project_id: str, file_id: str, log_format: str = None):
         super().__init__()
         self.project_id = project_id
         self.file_id = file_id
         self.project_path = ProjectController().get_project_path(project_id=project_id)
         self.file_path = os.path.join(self.project_path, file_id)
+        self.log_format = log_format
+        self.block_size = self.app_settings.EDA_BLOCK_SIZE
+        self.range_size = self.app_settings.EDA_RANGE_SIZE
 
-    def analyze_log(self) -> Dict[str, Any]:
-        if not os.path.exists(self.file_path):
-            return {"error": f"File not found: {self.file_path}"}
+    def resolve_log_format(self) -> str:
+        """The log format of the file, detected from its first lines when not given."""
+        if self.log_format is None:
+            self.log_format = detect_file_log_format(self.file_path, LogParser(encoding="latin-1"))
+        return self.log_format
 
-        # Parsing logic - optimized for zero-footprint memory usage
-        log_pattern = re.compile(r'(?P<ip>\S+) - - \[(?P<timestamp>.*?)\] "(?P<method>\S+) (?P<url>\S+) \S+" (?P<status>\d{3}) (?P<size>\d+|-)')
-        
-        # Aggregators
-        total_requests = 0
-        unique_ips = set()
-        total_size = 0
-        error_count = 0
-        status_counts = {}
-        ip_counts = {}
-        url_counts = {}
-        hourly_traffic = {}
+    def split_ranges(self, parts: int) -> List[Tuple[int, int]]:
+        """
+        Newline-aligned [start, stop) byte ranges covering the file: `parts`
+        of them, fewer when that would make ranges smaller than range_size.
+        """
+        size = os.path.getsize(self.file_path)
+        if size == 0:
+            return []
 
-        try:
-            line_count = 0
-            # latin-1 is safer for logs as it never fails on weird bytes
-            with open(self.file_path, 'r', encoding='latin-1', errors='ignore') as f:
-                for line in f:
-                    line_count += 1
-                    if line_count % 100000 == 0:
-                        logger.info(f"EDA Processed {line_count} lines...")
-
-                    match = log_pattern.match(line)
-                    if not match:
-                        continue
-                    
-                    data = match.groupdict()
-                    total_requests += 1
-                    
-                    # IP logic
-                    ip = data['ip']
-                    if len(unique_ips) < 10000 or ip in unique_ips:
-                        unique_ips.add(ip)
-                        ip_counts[ip] = ip_counts.get(ip, 0) + 1
-                    
-                    # Status logic
-                    try:
-                        status = int(data['status'])
-                        status_counts[status] = status_counts.get(status, 0) + 1
-                        if status >= 400:
-                            error_count += 1
-                    except:
-                        pass
-                    
-                    # Size logic
-                    try:
-                        sz = data['size']
-                        size_val = int(sz) if sz != '-' else 0
-                        total_size += size_val
-                    except:
-                        pass
-                    
-                    # URL logic
-                    url = data['url']
-                    if len(url_counts) < 10000 or url in url_counts:
-                         url_counts[url] = url_counts.get(url, 0) + 1
-                    
-                    # Time logic
-                    try:
-                        # Extract "10/Jan/2026:05" from "10/Jan/2026:05:14:22 +0000"
-                        parts = data['timestamp'].split(':')
-                        if len(parts) >= 2:
-                            ts_hour = parts[0] + ":" + parts[1]
-                            if len(hourly_traffic) < 5000: # ~7 months of hourly data
-                                hourly_traffic[ts_hour] = hourly_traffic.get(ts_hour, 0) + 1
-                    except Exception as e:
-                        pass
-            
-            logger.info(f"EDA Finished reading {line_count} lines. Total valid: {total_requests}")
-        except Exception as e:
-             logger.error(f"Error reading file at line {line_count}: {str(e)}")
-             return {"error": f"Error reading file: {str(e)}"}
+        range_size = max(self.range_size, -(-size // max(parts, 1)))
+        with open(self.file_path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                return split_file_ranges(buffer, range_size)
 
-        
-        if total_requests == 0:
-            return {"error": "No valid log lines found"}
+    def can_scan_in_parallel(self, parallel_workers: int, ranges: int) -> bool:
+        if parallel_workers <= 1 or ranges <= 1:
+            return False
+
+        # daemonic processes (e.g. Celery prefork children) can not start a pool
+        if multiprocessing.current_process().daemon:
+            logger.warning("Parallel EDA is not available in a daemonic worker process, "
+                           "scanning sequentially")
+            return False
+
+        return True
+
+    def summarize(self, parallel_workers: int = 0,
+                  on_progress: Callable[[int, int], None] = None) -> LogSummary:
+        """
+        Aggregate the whole file into a LogSummary. With `parallel_workers` > 1
+        the file is cut into newline-aligned ranges (a few per worker) scanned
+        by a process pool, and their partial summaries are merged.
+        `on_progress(bytes_done, total_bytes)` follows the scan.
+        """
+        log_format = self.resolve_log_format()
+        total = os.path.getsize(self.file_path)
+
+        ranges = self.split_ranges(parallel_workers * 4)
+        if not self.can_scan_in_parallel(parallel_workers, len(ranges)):
+            def on_block(done):
+                logger.info(f"EDA Processed {done} of {total} bytes...")
+                if on_progress is not None:
+                    on_progress(done, total)
+
+            return summarize_file_range(self.file_path, 0, total, log_format,
+                                        block_size=self.block_size, on_block=on_block)
+
+        summary = LogSummary()
+        done = 0
+
+        # spawn, the API and Celery processes run threads and an event loop
+        with ProcessPoolExecutor(max_workers=parallel_workers,
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {
+                executor.submit(summarize_file_range, self.file_path, start, stop,
+                                log_format, self.block_size): stop - start
+                for start, stop in ranges
+            }
+
+            # summaries merge in any order
+            for future in as_completed(futures):
+                summary.merge(future.result())
+                done += futures[future]
+                logger.info(f"EDA Processed {done} of {total} bytes in {len(ranges)} ranges...")
+                if on_progress is not None:
+                    on_progress(done, total)
+
+        return summary
 
-        # Format and Sort Data for Charts
-        
-        # 1. Top IPs (Top 10)
-        sorted_ips = dict(sorted(ip_counts.items(), key=lambda x: x[1], reverse=True)[:10])
-        
-        # 2. Top URLs (Top 10)
-        sorted_urls = dict(sorted(url_counts.items(), key=lambda x: x[1], reverse=True)[:10])
-        
-        # 3. Traffic Over Time (Sorted by time)
-        sorted_hours = sorted(hourly_traffic.keys())
-        traffic_data = {
-            "labels": sorted_hours,
-            "values": [hourly_traffic[h] for h in sorted_hours]
+    def file_hash(self) -> str:
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(self.file_path, "rb") as file:
+            while block := file.read(self.block_size):
+                hasher.update(block)
+        return hasher.hexdigest()
+
+    def fingerprint(self) -> Dict[str, Any]:
+        """What identifies the file's content: size, mtime and content hash."""
+        stat = os.stat(self.file_path)
+        return {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "hash": self.file_hash(),
         }
 
-        metrics = {
-            "total_requests": total_requests,
-            "unique_visitors": len(unique_ips),
-            "total_bandwidth_mb": round(total_size / (1024 * 1024), 2),
-            "error_rate": round((error_count / total_requests * 100), 2) if total_requests > 0 else 0,
-            "avg_response_size": round(total_size / total_requests, 2) if total_requests > 0 else 0
+    def cache_entry(self, fingerprint: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """The EDA result as persisted in the asset config, with the fingerprint of the file it describes."""
+        return {
+            "version": self.CACHE_VERSION,
+            "fingerprint": fingerprint,
+            "etag": f'"{fingerprint["hash"]}-{self.CACHE_VERSION}"',
+            "result": result,
         }
 
+    def validate_cache(self, cache: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        The current fingerprint of the file when a persisted entry still
+        describes it, else None. Same size and mtime is enough; when only the
+        mtime moved (e.g. the file was copied back) the content hash decides.
+        """
+        if not cache or cache.get("version") != self.CACHE_VERSION:
+            return None
+
+        cached = cache.get("fingerprint") or {}
+        if self.log_format is not None and cache.get("result", {}).get("log_format") != self.log_format:
+            return None
+
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+
+        if stat.st_size != cached.get("size"):
+            return None
+        if stat.st_mtime_ns == cached.get("mtime"):
+            return cached
+
+        fingerprint = self.fingerprint()
+        return fingerprint if fingerprint["hash"] == cached.get("hash") else None
+
+    def render(self, summary: LogSummary) -> Dict[str, Any]:
+        if summary.total_requests == 0:
+            return {"error": "No valid log lines found"}
+
         return {
-            "metrics": metrics,
-            "charts": {
-                "status_counts": status_counts,
-                "top_ips": sorted_ips,
-                "top_urls": sorted_urls,
-                "traffic_over_time": traffic_data
-            }
+            "log_format": self.log_format,
+            **summary.render()
         }
 
+    def analyze_log(self, parallel_workers: int = 0) -> Dict[str, Any]:
+        if not os.path.exists(self.file_path):
+            return {"error": f"File not found: {self.file_path}"}
+
+        try:
+            summary = self.summarize(parallel_workers=parallel_workers)
+            logger.info(f"EDA Finished reading {summary.lines} lines ({self.log_format} format). "
+                        f"Total valid: {summary.total_requests}")
+        except Exception as e:
+            logger.error(f"Error reading file: {str(e)}")
+            return {"error": f"Error reading file: {str(e)}"}
 
+        return self.render(summary)
@@ -1,7 +1,11 @@
 from .BaseController import BaseController
 from models.db_schemes import Project, DataChunk
 from stores.llm.LLMEnums import DocumentTypeEnum
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, AsyncIterator, Callable, Awaitable
+from utils.lru_cache import AsyncLRUCache
+from array import array
+import asyncio
+import hashlib
 import json
 import logging
 
@@ -9,13 +13,19 @@ import logging
 class NLPController(BaseController):
 
     def __init__(self, vectordb_client, generation_client, 
-                 embedding_client, template_parser):
+                 embedding_client, template_parser,
+                 query_embedding_cache: AsyncLRUCache = None,
+                 retrieval_cache: AsyncLRUCache = None):
         super().__init__()
 
         self.vectordb_client = vectordb_client
         self.generation_client = generation_client
         self.embedding_client = embedding_client
         self.template_parser = template_parser
+
+        # shared app-level caches for repeated questions (both optional)
+        self.query_embedding_cache = query_embedding_cache
+        self.retrieval_cache = retrieval_cache
         self.logger = logging.getLogger("uvicorn")
 
     def create_collection_name(self, project_id: str):
@@ -64,36 +74,201 @@ class NLPController(BaseController):
 
         return True
 
-    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10):
+    async def index_chunks_pipelined(self, project: Project, chunk_pages: AsyncIterator,
+                                     on_progress: Callable[[int], Awaitable] = None,
+                                     on_checkpoint: Callable[[int, int], Awaitable] = None,
+                                     concurrency: int = None, batch_size: int = None) -> int:
+        """
+        Index a stream of chunk pages with three overlapping stages:
+        read pages -> embed batches (`concurrency` requests in flight) -> write vectors.
 
-        # step1: get collection name
-        query_vector = None
+        Stages are connected by bounded queues, so a slow stage applies backpressure
+        instead of buffering the whole project. Returns the number of inserted chunks.
+
+        Batches may be written out of order; `on_checkpoint(last_chunk_id, inserted)`
+        is called whenever every chunk up to last_chunk_id is in the vector store.
+        """
         collection_name = self.create_collection_name(project_id=project.project_id)
 
-        # step2: get text embedding vector
+        concurrency = max(1, concurrency or getattr(self.embedding_client, "embedding_concurrency", 1))
+        batch_size = max(1, batch_size or getattr(self.embedding_client, "embedding_batch_size", 50))
+
+        embed_queue = asyncio.Queue(maxsize=concurrency * 2)
+        write_queue = asyncio.Queue(maxsize=concurrency * 2)
+        inserted_items_count = 0
+
+        # batch sequence number -> (last chunk id, size), for the checkpoint watermark
+        written_batches = {}
+        next_checkpoint_seq = 0
+        checkpointed_count = 0
+
+        async def read_stage():
+            seq = 0
+            async for page_chunks in chunk_pages:
+                for i in range(0, len(page_chunks), batch_size):
+                    batch = page_chunks[i:i + batch_size]
+                    await embed_queue.put((
+                        seq,
+                        [ c.data_chunk_id for c in batch ],
+                        [ c.chunk_text for c in batch ],
+                        [ c.chunk_metadata for c in batch ],
+                    ))
+                    seq += 1
+
+            for _ in range(concurrency):
+                await embed_queue.put(None)
+
+        async def embed_stage():
+            while True:
+                batch = await embed_queue.get()
+                if batch is None:
+                    await write_queue.put(None)
+                    return
+
+                seq, chunks_ids, texts, metadata = batch
+                # provider clients are blocking, run them off the event loop
+                vectors = await asyncio.to_thread(self.embedding_client.embed_text,
+                                                  text=texts,
+                                                  document_type=DocumentTypeEnum.DOCUMENT.value)
+                if not vectors or len(vectors) != len(texts):
+                    raise Exception(f"Embedding failed for chunks {chunks_ids[0]}..{chunks_ids[-1]}")
+
+                await write_queue.put((seq, chunks_ids, texts, metadata, vectors))
+
+        async def write_stage():
+            nonlocal inserted_items_count, next_checkpoint_seq, checkpointed_count
+            finished_embedders = 0
+
+            while finished_embedders < concurrency:
+                batch = await write_queue.get()
+                if batch is None:
+                    finished_embedders += 1
+                    continue
+
+                seq, chunks_ids, texts, metadata, vectors = batch
+                is_inserted = await self.vectordb_client.insert_many(
+                    collection_name=collection_name,
+                    texts=texts,
+                    metadata=metadata,
+                    vectors=vectors,
+                    record_ids=chunks_ids,
+                )
+                if not is_inserted:
+                    raise Exception(f"Can not insert into vector db collection: {collection_name}")
+
+                inserted_items_count += len(chunks_ids)
+                if on_progress:
+                    await on_progress(inserted_items_count)
+
+                if on_checkpoint:
+                    written_batches[seq] = (chunks_ids[-1], len(chunks_ids))
+
+                    last_chunk_id = None
+                    while next_checkpoint_seq in written_batches:
+                        last_chunk_id, batch_count = written_batches.pop(next_checkpoint_seq)
+                        checkpointed_count += batch_count
+                        next_checkpoint_seq += 1
+
+                    if last_chunk_id is not None:
+                        await on_checkpoint(last_chunk_id, checkpointed_count)
+
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(read_stage())
+                for _ in range(concurrency):
+                    task_group.create_task(embed_stage())
+                task_group.create_task(write_stage())
+        except ExceptionGroup as eg:
+            # the first failure cancels the other stages, surface it as-is
+            raise eg.exceptions[0]
+
+        return inserted_items_count
+
+    def embed_query(self, text: str):
+
         vector = self.embedding_client.embed_text(text=text, 
                                                  document_type=DocumentTypeEnum.QUERY.value)
 
         if not vector or len(vector) == 0:
-            return False
+            return None
         if isinstance(vector, list) and len(vector)>0:
-            query_vector = vector[0]
+            return vector[0]
+        return None
+
+    async def get_query_vector(self, text: str):
+        if not self.query_embedding_cache:
+            return self.embed_query(text=text)
+
+        # repeated questions differ in case/spacing more often than in wording
+        normalized_text = " ".join(text.split()).casefold()
+        cache_key = (self.embedding_client.embedding_model_id, normalized_text)
+
+        return await self.query_embedding_cache.get_or_set(
+            cache_key, lambda: asyncio.to_thread(self.embed_query, text=text)
+        )
+
+    def create_vector_hash(self, vector: list) -> str:
+        return hashlib.sha256(array("f", vector).tobytes()).hexdigest()
+
+    @staticmethod
+    def invalidate_collection_results(retrieval_cache: AsyncLRUCache, collection_name: str = None):
+        """Drop cached search results of a re-indexed collection (all of them if None)."""
+        if collection_name is None:
+            retrieval_cache.invalidate()
+        else:
+            retrieval_cache.invalidate(lambda key: key[0] == collection_name)
+
+    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10,
+                                          ef_search: int = None, probes: int = None):
+
+        # step1: get collection name
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        # step2: get text embedding vector
+        query_vector = await self.get_query_vector(text=text)
         if not query_vector:
             return False
         # step3: do semantic search
-        results = await self.vectordb_client.search_by_vector(
+        search = lambda: self.vectordb_client.search_by_vector(
             collection_name=collection_name,
             vector=query_vector,
-            limit=limit
+            limit=limit,
+            ef_search=ef_search,
+            probes=probes,
         )
 
+        if self.retrieval_cache:
+            # collection name first: invalidate_collection_results matches on it
+            cache_key = (collection_name, self.create_vector_hash(query_vector), limit, ef_search, probes)
+            results = await self.retrieval_cache.get_or_set(cache_key, search)
+        else:
+            results = await search()
+
         if not results:
             return False
 
         return results
+
+    async def explain_vector_db_search(self, project: Project, text: str, limit: int = 10,
+                                       ef_search: int = None, probes: int = None):
+
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        query_vector = await self.get_query_vector(text=text)
+        if not query_vector:
+            return None
+
+        return await self.vectordb_client.explain_search(
+            collection_name=collection_name,
+            vector=query_vector,
+            limit=limit,
+            ef_search=ef_search,
+            probes=probes,
+        )
     
     async def answer_rag_question(self, project: Project, query: str, limit: int = 10, 
-                                   chat_history: List[dict] = None) -> Tuple[Optional[str], Optional[str], Optional[List[dict]]]:
+                                   chat_history: List[dict] = None,
+                                   ef_search: int = None, probes: int = None) -> Tuple[Optional[str], Optional[str], Optional[List[dict]]]:
         """
         Answer user question using RAG
         
@@ -126,6 +301,8 @@ class NLPController(BaseController):
                 project=project,
                 text=search_query,
                 limit=limit,
+                ef_search=ef_search,
+                probes=probes,
             )
 
             if not retrieved_documents or len(retrieved_documents) == 0:
@@ -4,8 +4,19 @@ import os
 from langchain_community.document_loaders import TextLoader
 from langchain_community.document_loaders import PyMuPDFLoader
 from models import ProcessingEnum
+from stores.logparser.LogParser import LogParser
+from stores.logparser.LogFormats import LOG_FORMATS, detect_file_log_format
+from stores.logparser.ColumnarLog import ColumnarLog, MISSING
+from stores.logparser.StreamingColumnarLog import StreamingColumnarLog
+from stores.logparser.ParallelColumnarLog import ParallelColumnarLog, BilliardPoolExecutor, billiard
+from stores.logparser.TemplateMiner import TemplateMiner
+from stores.logparser.ChunkBuilder import ChunkBuilder
+from concurrent.futures import ProcessPoolExecutor
 from typing import List
 from dataclasses import dataclass
+from collections import Counter
+import multiprocessing
+import hashlib
 import re
 import logging
 
@@ -24,6 +35,30 @@ class ProcessController(BaseController):
         self.project_id = project_id
         self.project_path = ProjectController().get_project_path(project_id=project_id)
 
+        self.log_parser = LogParser()
+        self.log_parsers = { self.log_parser.log_format.name: self.log_parser }
+        self.progress_log_interval = 10000
+
+    def get_log_parser(self, log_format: str = None) -> LogParser:
+        """The parser for a registered log format, the default parser for None."""
+        if log_format is None or log_format not in LOG_FORMATS:
+            return self.log_parser
+
+        parser = self.log_parsers.get(log_format)
+        if parser is None:
+            parser = LogParser(encoding=self.log_parser.encoding, log_format=log_format)
+            self.log_parsers[log_format] = parser
+        return parser
+
+    def detect_log_format(self, file_id: str, sample_lines: int = 200):
+        """Name of the log format of a text/log file from its first lines, None for other files."""
+        file_path = os.path.join(self.project_path, file_id)
+        if self.get_file_extension(file_id=file_id) not in [ ProcessingEnum.TXT.value, ProcessingEnum.LOG.value ] \
+                or not os.path.exists(file_path):
+            return None
+
+        return detect_file_log_format(file_path, self.log_parser, sample_lines=sample_lines)
+
     def get_file_extension(self, file_id: str):
         return os.path.splitext(file_id)[-1]
 
@@ -59,92 +94,385 @@ class ProcessController(BaseController):
 
     def process_file_content(self, file_content: list, file_id: str,
                             chunk_size: int=100, overlap_size: int=20,
-                            chunking_method: str="simple"):
+                            chunking_method: str="simple", log_format: str=None):
 
         file_content_texts = [
             rec.page_content
             for rec in file_content
         ]
 
-        file_content_metadata = [
-            rec.metadata
-            for rec in file_content
-        ]
+        # parse once into columns, every chunking method reads the same ColumnarLog
+        log = self.get_log_parser(log_format).parse_text(" ".join(file_content_texts))
+        logger.info(f"Parsed {len(log)} log entries from {file_id}")
+
+        return list(self.process_log(
+            log=log,
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            chunking_method=chunking_method
+        ))
+
+    def iter_file_chunks(self, file_id: str, chunk_size: int=100, overlap_size: int=20,
+                         chunking_method: str="simple", block_size: int=1024 * 1024,
+                         parallel_workers: int=0, range_size: int=64 * 1024 * 1024,
+                         tail_state: dict=None, log_format: str=None):
+        """
+        Chunk a file lazily. Text and log files are read in blocks of
+        `block_size` bytes and their chunks are yielded as soon as they are
+        complete; other files go through their loader. Returns None when the
+        file cannot be loaded.
+
+        With `parallel_workers` > 1, files larger than `range_size` are parsed
+        in newline-aligned ranges by a process pool instead.
+
+        For text and log files, `tail_state["end_offset"]` is set to the number
+        of bytes read once the chunks are exhausted, with the open last chunk
+        (see process_growing_log), for later appends.
+
+        Lines are parsed with the registered `log_format` (see LogFormats),
+        detected from the first lines of the file when not given.
+        """
+        file_ext = self.get_file_extension(file_id=file_id)
+        file_path = os.path.join(
+            self.project_path,
+            file_id
+        )
+
+        if file_ext in [ ProcessingEnum.TXT.value, ProcessingEnum.LOG.value ]:
+            if not os.path.exists(file_path):
+                return None
+
+            if log_format is None:
+                log_format = self.detect_log_format(file_id=file_id)
+
+            return self.stream_file_chunks(
+                file_path=file_path,
+                parser=self.get_log_parser(log_format),
+                chunk_size=chunk_size,
+                overlap_size=overlap_size,
+                chunking_method=chunking_method,
+                block_size=block_size,
+                parallel_workers=parallel_workers,
+                range_size=range_size,
+                tail_state=tail_state
+            )
+
+        file_content = self.get_file_content(file_id=file_id)
+        if file_content is None:
+            return None
+
+        return iter(self.process_file_content(
+            file_content=file_content,
+            file_id=file_id,
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            chunking_method=chunking_method,
+            log_format=log_format
+        ))
+
+    def stream_file_chunks(self, file_path: str, parser: LogParser, chunk_size: int, overlap_size: int,
+                           chunking_method: str, block_size: int,
+                           parallel_workers: int=0, range_size: int=64 * 1024 * 1024,
+                           tail_state: dict=None):
+
+        if self.can_parse_in_parallel(file_path, parallel_workers, range_size):
+            yield from self.parallel_file_chunks(
+                file_path=file_path,
+                parser=parser,
+                chunk_size=chunk_size,
+                overlap_size=overlap_size,
+                chunking_method=chunking_method,
+                parallel_workers=parallel_workers,
+                range_size=range_size,
+                tail_state=tail_state
+            )
+            return
+
+        with open(file_path, "rb") as file:
+            log = StreamingColumnarLog(
+                file=file,
+                parser=parser,
+                block_size=block_size
+            )
+
+            yield from self.process_growing_log(
+                log=log,
+                chunk_size=chunk_size,
+                overlap_size=overlap_size,
+                chunking_method=chunking_method,
+                tail_state=tail_state
+            )
+
+        if tail_state is not None:
+            tail_state["end_offset"] = log.end_offset
+
+        logger.info(f"Streamed {len(log)} log entries from {file_path}")
+
+    def tail_file_chunks(self, file_id: str, offset: int, chunk_size: int, overlap_size: int,
+                         chunking_method: str, block_size: int, tail_state: dict,
+                         log_format: str=None):
+        """
+        Chunk what a growing log file gained since `offset`, complete lines only.
+
+        The last chunk is still open: its time window or size may keep growing
+        with the next append. It is yielded like the others (so it can be
+        searched right away) and `tail_state["open_offset"]` points at its first
+        line, so the next run starts there and re-chunks it together with the
+        new lines, carrying over the open window and the overlap. The end of the
+        last complete line read goes to `tail_state["end_offset"]`.
+        Returns None when the file does not exist.
+        """
+        file_path = os.path.join(self.project_path, file_id)
+        if not os.path.exists(file_path):
+            return None
+
+        return self._tail_file_chunks(file_path, offset, chunk_size, overlap_size,
+                                      chunking_method, block_size, tail_state,
+                                      self.get_log_parser(log_format))
+
+    def _tail_file_chunks(self, file_path: str, offset: int, chunk_size: int, overlap_size: int,
+                          chunking_method: str, block_size: int, tail_state: dict,
+                          parser: LogParser):
+
+        with open(file_path, "rb") as file:
+            file.seek(offset)
+            log = StreamingColumnarLog(
+                file=file,
+                parser=parser,
+                block_size=block_size,
+                complete_lines_only=True
+            )
+
+            yield from self.process_growing_log(
+                log=log,
+                chunk_size=chunk_size,
+                overlap_size=overlap_size,
+                chunking_method=chunking_method,
+                tail_state=tail_state
+            )
+
+            tail_state["end_offset"] = log.end_offset
+
+        logger.info(f"Tailed {len(log)} log entries from {file_path} at offset {offset}")
+
+    def read_file_range(self, file_id: str, start: int, end: int, max_bytes: int=1024 * 1024):
+        """Raw text of bytes start..end of a project file (at most `max_bytes`), None if missing."""
+        file_path = os.path.join(self.project_path, file_id)
+        if not os.path.exists(file_path):
+            return None
+
+        with open(file_path, "rb") as file:
+            file.seek(start)
+            data = file.read(max(0, min(end - start, max_bytes)))
+
+        return data.decode(self.log_parser.encoding, errors="replace")
+
+    def get_last_line_hash(self, file_id: str, end_offset: int, max_line_size: int=65536):
+        """sha256 of the line ending right before `end_offset`, None when there is none."""
+        file_path = os.path.join(self.project_path, file_id)
+        if end_offset <= 0 or not os.path.exists(file_path) or os.path.getsize(file_path) < end_offset:
+            return None
+
+        with open(file_path, "rb") as file:
+            start = max(0, end_offset - max_line_size)
+            file.seek(start)
+            data = file.read(end_offset - start)
+
+        line = data[data.rfind(b"\n", 0, len(data) - 1) + 1:]
+        return hashlib.sha256(line).hexdigest()
+
+    def can_parse_in_parallel(self, file_path: str, parallel_workers: int, range_size: int):
+
+        if parallel_workers <= 1 or os.path.getsize(file_path) <= range_size:
+            return False
+
+        # daemonic processes (e.g. Celery prefork children) start a billiard pool instead
+        if multiprocessing.current_process().daemon and billiard is None:
+            logger.warning("Parallel parsing in a daemonic worker process needs billiard, "
+                           "falling back to sequential streaming")
+            return False
+
+        return True
+
+    def parse_executor(self, parallel_workers: int):
+        """
+        The process pool parsing byte ranges. Inside a Celery prefork child,
+        which is daemonic, it is a billiard pool: multiprocessing can not
+        start processes there. Either way processes are spawned, not forked,
+        since the Celery worker process runs threads and an event loop.
+        """
+        if multiprocessing.current_process().daemon:
+            return BilliardPoolExecutor(max_workers=parallel_workers, start_method="spawn")
+
+        return ProcessPoolExecutor(max_workers=parallel_workers,
+                                   mp_context=multiprocessing.get_context("spawn"))
+
+    def parallel_file_chunks(self, file_path: str, parser: LogParser, chunk_size: int, overlap_size: int,
+                             chunking_method: str, parallel_workers: int, range_size: int,
+                             tail_state: dict=None):
+
+        with self.parse_executor(parallel_workers) as executor:
+            log = ParallelColumnarLog(
+                file_path=file_path,
+                parser=parser,
+                executor=executor,
+                range_size=range_size,
+                prefetch=parallel_workers * 2
+            )
+
+            try:
+                yield from self.process_growing_log(
+                    log=log,
+                    chunk_size=chunk_size,
+                    overlap_size=overlap_size,
+                    chunking_method=chunking_method,
+                    tail_state=tail_state
+                )
+
+                if tail_state is not None:
+                    tail_state["end_offset"] = len(log.buffer)
+            finally:
+                log.close()
+
+        logger.info(f"Parsed {len(log)} log entries from {file_path} with {parallel_workers} processes")
+
+    def process_growing_log(self, log: ColumnarLog, chunk_size: int, overlap_size: int,
+                            chunking_method: str, tail_state: dict=None):
+        """
+        process_log for a file that may keep growing. The chunk sequence goes on
+        from `tail_state["seed"]`, left there by the previous run (chunk index,
+        overlap flag and mined templates of its open chunk). Once the chunks are
+        exhausted, `tail_state["open_offset"]` points at the first line of the
+        last, still open, chunk and `tail_state["seed"]` is what the next run,
+        starting at that line, continues from.
+        """
+        if tail_state is None:
+            yield from self.process_log(log=log, chunk_size=chunk_size, overlap_size=overlap_size,
+                                        chunking_method=chunking_method)
+            return
+
+        seed = tail_state.get("seed") or {}
+        miner = TemplateMiner.from_dict(seed["templates"]) if seed.get("templates") else TemplateMiner()
+
+        chunks = self.process_log(
+            log=log,
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            chunking_method=chunking_method,
+            chunk_index=seed.get("chunk_index", 0),
+            has_overlap=seed.get("has_overlap", False),
+            miner=miner
+        )
+
+        last_chunk = None
+        for chunk in chunks:
+            if last_chunk is not None:
+                yield last_chunk
+            last_chunk = chunk
+
+        tail_state["open_offset"] = None
+        tail_state["seed"] = seed
+        if last_chunk is not None:
+            raw_range = last_chunk.metadata.get("raw_range")
+            if raw_range:
+                tail_state["open_offset"] = raw_range[0]
+            else:
+                # chunks are runs of consecutive lines, the open one ends at the last row
+                open_row = len(log) - (last_chunk.page_content.count("\n") + 1)
+                tail_state["open_offset"] = log.file_offset(max(open_row, log.first_row))
+
+            # the open chunk is chunked again by the next run, with its index and overlap
+            tail_state["seed"] = {
+                "chunk_index": last_chunk.metadata.get("chunk_index", 0),
+                "has_overlap": last_chunk.metadata.get("has_overlap", False),
+            }
+            if miner.clusters:
+                tail_state["seed"]["templates"] = miner.to_dict()
+            yield last_chunk
+
+    def process_log(self, log: ColumnarLog, chunk_size: int=100, overlap_size: int=20,
+                    chunking_method: str="simple", chunk_index: int=0, has_overlap: bool=False,
+                    miner: TemplateMiner=None):
+        """
+        Return a generator of chunks of `log` for the given chunking method.
+        Chunkers numbering their chunks start at `chunk_index`, the first chunk
+        flagged `has_overlap`; the template compressed one mines with `miner`.
+        """
 
         # Route to appropriate chunking method
         if chunking_method == "log_hybrid_adaptive":
             chunks = self.process_log_hybrid_adaptive_splitter(
-                texts=file_content_texts,
-                metadatas=file_content_metadata,
+                log=log,
                 chunk_size=chunk_size,
-                overlap_size=overlap_size
+                overlap_size=overlap_size,
+                chunk_index=chunk_index,
+                has_overlap=has_overlap
             )
         elif chunking_method == "log_hybrid_intelligent":
             chunks = self.process_log_hybrid_intelligent_splitter(
-                texts=file_content_texts,
-                metadatas=file_content_metadata,
+                log=log,
                 chunk_size=chunk_size,
-                overlap_size=overlap_size
+                overlap_size=overlap_size,
+                chunk_index=chunk_index,
+                has_overlap=has_overlap
             )
         elif chunking_method == "log_error_block":
             chunks = self.process_log_error_block_splitter(
-                texts=file_content_texts,
-                metadatas=file_content_metadata,
+                log=log,
                 chunk_size=chunk_size
             )
         elif chunking_method == "log_time_window":
             chunks = self.process_log_time_window_splitter(
-                texts=file_content_texts,
-                metadatas=file_content_metadata,
+                log=log,
                 chunk_size=chunk_size
             )
         elif chunking_method == "log_component_based":
             chunks = self.process_log_component_based_splitter(
-                texts=file_content_texts,
-                metadatas=file_content_metadata,
+                log=log,
                 chunk_size=chunk_size
             )
         elif chunking_method == "log_status_code":
             chunks = self.process_log_status_code_splitter(
-                texts=file_content_texts,
-                metadatas=file_content_metadata,
+                log=log,
                 chunk_size=chunk_size
             )
         # elif chunking_method == "log_url_pattern":
         #     chunks = self.process_log_url_pattern_splitter(
-        #         texts=file_content_texts,
-        #         metadatas=file_content_metadata,
+        #         log=log,
         #         chunk_size=chunk_size
         #     )
         # elif chunking_method == "log_bot_human":
         #     chunks = self.process_log_bot_human_splitter(
-        #         texts=file_content_texts,
-        #         metadatas=file_content_metadata,
+        #         log=log,
         #         chunk_size=chunk_size
         #     )
         elif chunking_method == "log_semantic_sliding":
             chunks = self.process_log_semantic_sliding_splitter(
-                texts=file_content_texts,
-                metadatas=file_content_metadata,
+                log=log,
                 chunk_size=chunk_size,
-                overlap_size=overlap_size
+                overlap_size=overlap_size,
+                chunk_index=chunk_index,
+                has_overlap=has_overlap
+            )
+        elif chunking_method == "log_template_compressed":
+            chunks = self.process_log_template_compressed_splitter(
+                log=log,
+                chunk_size=chunk_size,
+                miner=miner
             )
         # elif chunking_method == "log_http_method":
         #     chunks = self.process_log_http_method_splitter(
-        #         texts=file_content_texts,
-        #         metadatas=file_content_metadata,
+        #         log=log,
         #         chunk_size=chunk_size
         #     )
         # elif chunking_method == "simpler_splitter":
         #     chunks = self.process_simpler_splitter(
-        #         texts=file_content_texts,
-        #         metadatas=file_content_metadata,
+        #         log=log,
         #         chunk_size=chunk_size
         #     )
         else:  # Default to log_time_window (best for general log analysis)
             chunks = self.process_log_time_window_splitter(
-                texts=file_content_texts,
-                metadatas=file_content_metadata,
+                log=log,
                 chunk_size=chunk_size
             )
 
@@ -163,6 +491,7 @@ class ProcessController(BaseController):
         - log_bot_human: Separates bot traffic from human traffic
         - log_semantic_sliding: Sliding window with overlap for context preservation
         - log_http_method: Groups logs by HTTP method (GET, POST, etc.)
+        - log_template_compressed: Collapses repeated line templates into counted runs
         - simpler_splitter: Simple size-based chunking
         """
         return [
@@ -171,11 +500,13 @@ class ProcessController(BaseController):
             "log_time_window",
             "log_error_block",
             "log_hybrid_intelligent",
-            "log_component_based"
+            "log_component_based",
+            "log_template_compressed"
         ]
 
-    def process_log_hybrid_adaptive_splitter(self, texts: List[str], metadatas: List[dict], 
-                                            chunk_size: int, overlap_size: int = 20):
+    def process_log_hybrid_adaptive_splitter(self, log: ColumnarLog,
+                                            chunk_size: int, overlap_size: int = 20,
+                                            chunk_index: int = 0, has_overlap: bool = False):
         """
         HYBRID ADAPTIVE CHUNKING METHOD - Best of all worlds!
         
@@ -196,197 +527,139 @@ class ProcessController(BaseController):
         about errors, performance, user behavior, and temporal patterns.
         """
         logger.info(f"[HYBRID_ADAPTIVE] Starting adaptive hybrid chunking...")
-        full_text = " ".join(texts)
-        
-        lines = [line.strip() for line in full_text.split('\n') if line.strip()]
-        logger.info(f"[HYBRID_ADAPTIVE] Found {len(lines)} log entries to process")
-        
-        # Patterns for analysis
-        timestamp_pattern = r'\[(\d{2})/(\w{3})/(\d{4}):(\d{2}):(\d{2}):(\d{2})'
-        status_pattern = r'" (\d{3}) '
-        ip_pattern = r'^(\d+\.\d+\.\d+\.\d+)'
-        error_statuses = ['400', '401', '403', '404', '405', '500', '501', '502', '503', '504']
-        
-        def analyze_line(line):
-            """Extract key features from log line"""
-            features = {
-                'time_window': None,
-                'is_error': False,
-                'status_category': None,
-                'ip': None
+
+        def new_context(time_window=MISSING):
+            return {
+                'time_window': time_window,
+                'has_errors': False,
+                'primary_ip': MISSING,
+                'status_category': 0
             }
-            
-            # Extract timestamp
-            ts_match = re.search(timestamp_pattern, line)
-            if ts_match:
-                day, month, year, hour, minute, second = ts_match.groups()
-                features['time_window'] = f"{year}-{month}-{day}_{hour}:00"
-            
-            # Extract status code
-            status_match = re.search(status_pattern, line)
-            if status_match:
-                status = status_match.group(1)
-                features['is_error'] = any(f" {err} " in line for err in error_statuses)
-                
-                # Categorize status
-                first_digit = status[0]
-                if first_digit == '2':
-                    features['status_category'] = '2xx'
-                elif first_digit == '3':
-                    features['status_category'] = '3xx'
-                elif first_digit == '4':
-                    features['status_category'] = '4xx'
-                elif first_digit == '5':
-                    features['status_category'] = '5xx'
-            
-            # Extract IP
-            ip_match = re.search(ip_pattern, line)
-            if ip_match:
-                features['ip'] = ip_match.group(1)
-            
-            return features
-        
-        chunks = []
-        current_chunk = []
-        current_chunk_size = 0
-        current_context = {
-            'time_window': None,
-            'has_errors': False,
-            'primary_ip': None,
-            'status_category': None
-        }
-        overlap_buffer = []
-        
-        for idx, line in enumerate(lines):
-            features = analyze_line(line)
-            line_size = len(line) + 1
+
+        def chunk_metadata(context, chunk_reasons, has_overlap):
+            nonlocal entries_count, error_chunks_count
+            entries_count += len(chunk)
+            error_chunks_count += context['has_errors']
+            return {
+                "method": "hybrid_adaptive",
+                "chunk_index": chunk_index + chunks_count,
+                "entries": len(chunk),
+                "time_window": log.format_time_window(context['time_window']),
+                "has_errors": context['has_errors'],
+                "error_count": chunk.error_count,
+                "primary_ip": log.ips[context['primary_ip']] if context['primary_ip'] != MISSING else None,
+                "status_category": f"{context['status_category']}xx" if context['status_category'] else None,
+                "chunk_reasons": chunk_reasons,
+                "has_overlap": has_overlap
+            }
+
+        chunks_count = 0
+        entries_count = 0
+        error_chunks_count = 0
+        chunk = ChunkBuilder(log)
+        current_context = new_context()
+        
+        for idx in log.rows():
+            time_window = log.local_hour(idx)
+            is_error = log.is_error(idx)
+            status_category = log.status_class(idx)
+            ip_id = log.ip_key(idx)
             
             # Decide if we should start a new chunk based on hybrid criteria
             should_chunk = False
             chunk_reason = []
             
             # Criterion 1: Size threshold reached
-            if current_chunk_size >= chunk_size:
+            if chunk.size >= chunk_size:
                 should_chunk = True
                 chunk_reason.append("size_limit")
             
             # Criterion 2: Time window changed (but only if we have enough content)
-            if (current_context['time_window'] and 
-                features['time_window'] and 
-                current_context['time_window'] != features['time_window'] and
-                len(current_chunk) >= 5):
+            if (current_context['time_window'] != MISSING and 
+                time_window != MISSING and 
+                current_context['time_window'] != time_window and
+                len(chunk) >= 5):
                 should_chunk = True
                 chunk_reason.append("time_window_change")
             
             # Criterion 3: Error context boundary - if current chunk has errors
             # and we're moving to non-errors (keep error context together)
             if (current_context['has_errors'] and 
-                not features['is_error'] and 
-                current_chunk_size >= chunk_size * 0.6):  # At least 60% full
+                not is_error and 
+                chunk.size >= chunk_size * 0.6):  # At least 60% full
                 should_chunk = True
                 chunk_reason.append("error_boundary")
             
             # Criterion 4: Status category major change (but not for minor transitions)
             if (current_context['status_category'] and 
-                features['status_category'] and
-                current_context['status_category'] != features['status_category'] and
-                current_chunk_size >= chunk_size * 0.8):  # At least 80% full
+                status_category and
+                current_context['status_category'] != status_category and
+                chunk.size >= chunk_size * 0.8):  # At least 80% full
                 
                 # Only chunk on major category changes (e.g., success -> error)
                 major_change = (
-                    (current_context['status_category'] in ['2xx', '3xx'] and 
-                    features['status_category'] in ['4xx', '5xx']) or
-                    (current_context['status_category'] in ['4xx', '5xx'] and 
-                    features['status_category'] in ['2xx', '3xx'])
+                    (current_context['status_category'] in (2, 3) and 
+                    status_category in (4, 5)) or
+                    (current_context['status_category'] in (4, 5) and 
+                    status_category in (2, 3))
                 )
                 if major_change:
                     should_chunk = True
                     chunk_reason.append("status_category_major_change")
             
             # Add line to current chunk
-            current_chunk.append(line)
-            current_chunk_size += line_size
+            chunk.add(idx)
             
             # Update context
-            if features['time_window']:
-                current_context['time_window'] = features['time_window']
-            if features['is_error']:
+            if time_window != MISSING:
+                current_context['time_window'] = time_window
+            if is_error:
                 current_context['has_errors'] = True
-            if features['ip']:
-                current_context['primary_ip'] = features['ip']
-            if features['status_category']:
-                current_context['status_category'] = features['status_category']
+            if ip_id != MISSING:
+                current_context['primary_ip'] = ip_id
+            if status_category:
+                current_context['status_category'] = status_category
             
             # Create chunk if needed
-            if should_chunk and current_chunk:
-                # Calculate chunk metadata
-                error_count = sum(1 for l in current_chunk if any(f" {err} " in l for err in error_statuses))
-                
-                chunks.append(Document(
-                    page_content="\n".join(current_chunk),
-                    metadata={
-                        "method": "hybrid_adaptive",
-                        "chunk_index": len(chunks),
-                        "entries": len(current_chunk),
-                        "time_window": current_context['time_window'],
-                        "has_errors": current_context['has_errors'],
-                        "error_count": error_count,
-                        "primary_ip": current_context['primary_ip'],
-                        "status_category": current_context['status_category'],
-                        "chunk_reasons": ", ".join(chunk_reason),
-                        "has_overlap": len(overlap_buffer) > 0
-                    }
-                ))
+            if should_chunk:
+                yield Document(
+                    page_content=chunk.text(),
+                    metadata=chunk_metadata(current_context, ", ".join(chunk_reason), has_overlap)
+                )
+                chunks_count += 1
                 
                 # Calculate overlap (20% of chunk)
-                overlap_count = max(1, len(current_chunk) * overlap_size // 100)
-                overlap_buffer = current_chunk[-overlap_count:]
+                overlap_count = max(1, len(chunk) * overlap_size // 100)
+                has_overlap = True
                 
                 # Start new chunk with overlap
-                current_chunk = overlap_buffer.copy()
-                current_chunk_size = sum(len(l) + 1 for l in current_chunk)
+                chunk.carry_over(overlap_count)
+                log.release(chunk.start)
                 
                 # Reset context (except keep last time_window for continuity)
-                last_time_window = current_context['time_window']
-                current_context = {
-                    'time_window': last_time_window,
-                    'has_errors': False,
-                    'primary_ip': None,
-                    'status_category': None
-                }
+                current_context = new_context(time_window=current_context['time_window'])
             
-            if (idx + 1) % 100 == 0:
-                logger.info(f"[HYBRID_ADAPTIVE] Progress: Processed {idx + 1}/{len(lines)} entries, Created {len(chunks)} chunks")
+            if (idx + 1) % self.progress_log_interval == 0:
+                logger.info(f"[HYBRID_ADAPTIVE] Progress: Processed {idx + 1} entries, Created {chunks_count} chunks")
         
         # Don't forget the last chunk
-        if current_chunk:
-            error_count = sum(1 for l in current_chunk if any(f" {err} " in l for err in error_statuses))
-            
-            chunks.append(Document(
-                page_content="\n".join(current_chunk),
-                metadata={
-                    "method": "hybrid_adaptive",
-                    "chunk_index": len(chunks),
-                    "entries": len(current_chunk),
-                    "time_window": current_context['time_window'],
-                    "has_errors": current_context['has_errors'],
-                    "error_count": error_count,
-                    "primary_ip": current_context['primary_ip'],
-                    "status_category": current_context['status_category'],
-                    "chunk_reasons": "final_chunk",
-                    "has_overlap": len(overlap_buffer) > 0
-                }
-            ))
+        if len(chunk):
+            yield Document(
+                page_content=chunk.text(),
+                metadata=chunk_metadata(current_context, "final_chunk", has_overlap)
+            )
+            chunks_count += 1
         
-        logger.info(f"[HYBRID_ADAPTIVE] Chunking complete! Total chunks: {len(chunks)}")
-        logger.info(f"[HYBRID_ADAPTIVE] Avg entries per chunk: {sum(c.metadata['entries'] for c in chunks) / len(chunks):.1f}")
-        logger.info(f"[HYBRID_ADAPTIVE] Chunks with errors: {sum(1 for c in chunks if c.metadata['has_errors'])}")
+        logger.info(f"[HYBRID_ADAPTIVE] Chunking complete! Total chunks: {chunks_count}")
+        if chunks_count:
+            logger.info(f"[HYBRID_ADAPTIVE] Avg entries per chunk: {entries_count / chunks_count:.1f}")
+            logger.info(f"[HYBRID_ADAPTIVE] Chunks with errors: {error_chunks_count}")
         
-        return chunks
 
 
-    def process_log_hybrid_intelligent_splitter(self, texts: List[str], metadatas: List[dict], 
-                                            chunk_size: int, overlap_size: int = 15):
+    def process_log_hybrid_intelligent_splitter(self, log: ColumnarLog,
+                                            chunk_size: int, overlap_size: int = 15,
+                                            chunk_index: int = 0, has_overlap: bool = False):
         """
         HYBRID INTELLIGENT CHUNKING - Context-Aware Smart Splitting
         
@@ -407,62 +680,36 @@ class ProcessController(BaseController):
         accurate context retrieval for complex queries.
         """
         logger.info(f"[HYBRID_INTELLIGENT] Starting intelligent context-aware chunking...")
-        full_text = " ".join(texts)
-        
-        lines = [line.strip() for line in full_text.split('\n') if line.strip()]
-        logger.info(f"[HYBRID_INTELLIGENT] Found {len(lines)} log entries to process")
-        
-        # Parse all lines first for intelligent analysis
-        timestamp_pattern = r'\[(\d{2})/(\w{3})/(\d{4}):(\d{2}):(\d{2}):(\d{2})'
-        status_pattern = r'" (\d{3}) '
-        ip_pattern = r'^(\d+\.\d+\.\d+\.\d+)'
-        url_pattern = r'"[A-Z]+ ([^ ]+)'
-        
-        parsed_lines = []
-        for line in lines:
-            info = {'line': line}
-            
-            # Parse timestamp
-            ts_match = re.search(timestamp_pattern, line)
-            if ts_match:
-                day, month, year, hour, minute, second = ts_match.groups()
-                info['timestamp'] = f"{year}-{month}-{day} {hour}:{minute}:{second}"
-            else:
-                info['timestamp'] = None
-            
-            # Parse status
-            status_match = re.search(status_pattern, line)
-            info['status'] = int(status_match.group(1)) if status_match else None
-            info['is_error'] = info['status'] >= 400 if info['status'] else False
-            
-            # Parse IP
-            ip_match = re.search(ip_pattern, line)
-            info['ip'] = ip_match.group(1) if ip_match else None
-            
-            # Parse URL
-            url_match = re.search(url_pattern, line)
-            info['url'] = url_match.group(1) if url_match else None
-            
-            parsed_lines.append(info)
+
+        # static-resource flag per distinct URL, computed once
+        static_extensions = ['.css', '.js', '.jpg', '.png', '.gif']
+        static_urls = {}
+
+        def is_static(url_id):
+            if url_id not in static_urls:
+                static_urls[url_id] = any(ext in log.urls[url_id] for ext in static_extensions)
+            return static_urls[url_id]
+
+        def is_error(idx):
+            return log.status_code(idx) >= 400
         
-        def detect_boundary(idx, parsed_lines):
+        def detect_boundary(idx):
             """Detect if this is a good chunk boundary"""
-            if idx == 0 or idx >= len(parsed_lines):
+            if idx == 0 or idx >= len(log):
                 return False, []
             
-            current = parsed_lines[idx]
-            previous = parsed_lines[idx - 1]
             reasons = []
             
             # Check for time gap (natural boundary)
             # This would require proper datetime parsing - simplified here
             
             # Check for IP session change
-            if previous['ip'] and current['ip'] and previous['ip'] != current['ip']:
+            previous_ip, current_ip = log.ip_key(idx - 1), log.ip_key(idx)
+            if previous_ip != MISSING and current_ip != MISSING and previous_ip != current_ip:
                 # Look back to see if previous IP had a session (5+ consecutive)
                 consecutive_count = 1
                 for j in range(idx - 2, max(-1, idx - 10), -1):
-                    if parsed_lines[j]['ip'] == previous['ip']:
+                    if log.ip_key(j) == previous_ip:
                         consecutive_count += 1
                     else:
                         break
@@ -472,37 +719,30 @@ class ProcessController(BaseController):
             
             # Check for error sequence boundary
             # Don't split if current or previous 2 are errors
-            if (current['is_error'] or 
-                (idx >= 1 and parsed_lines[idx-1]['is_error']) or
-                (idx >= 2 and parsed_lines[idx-2]['is_error'])):
+            if (is_error(idx) or 
+                (idx >= 1 and is_error(idx - 1)) or
+                (idx >= 2 and is_error(idx - 2))):
                 return False, ['error_context_protection']
             
             # Check for URL pattern shift
-            if previous['url'] and current['url']:
-                prev_is_static = any(ext in previous['url'] for ext in ['.css', '.js', '.jpg', '.png', '.gif'])
-                curr_is_static = any(ext in current['url'] for ext in ['.css', '.js', '.jpg', '.png', '.gif'])
-                
-                if prev_is_static != curr_is_static:
+            previous_url, current_url = log.url_key(idx - 1), log.url_key(idx)
+            if previous_url != MISSING and current_url != MISSING:
+                if is_static(previous_url) != is_static(current_url):
                     reasons.append('url_pattern_shift')
             
             return len(reasons) > 0, reasons
         
-        chunks = []
-        current_chunk = []
-        current_chunk_size = 0
-        overlap_buffer = []
+        chunks_count = 0
+        entries_count = 0
+        chunk = ChunkBuilder(log, is_error=is_error)
         error_protection_count = 0
         
-        for idx, item in enumerate(parsed_lines):
-            line = item['line']
-            line_size = len(line) + 1
-            
+        for idx in log.rows():
             # Add to current chunk
-            current_chunk.append(line)
-            current_chunk_size += line_size
+            chunk.add(idx)
             
             # Track error protection
-            if item['is_error']:
+            if is_error(idx):
                 error_protection_count = 5  # Protect next 5 lines
             elif error_protection_count > 0:
                 error_protection_count -= 1
@@ -512,134 +752,121 @@ class ProcessController(BaseController):
             chunk_reasons = []
             
             # Size-based chunking
-            if current_chunk_size >= chunk_size:
+            if chunk.size >= chunk_size:
                 # But only if not in error protection and at a good boundary
                 if error_protection_count == 0:
-                    is_boundary, boundary_reasons = detect_boundary(idx + 1, parsed_lines)
+                    is_boundary, boundary_reasons = detect_boundary(idx + 1)
                     
                     if is_boundary:
                         should_chunk = True
                         chunk_reasons.extend(boundary_reasons)
                         chunk_reasons.append('size_with_smart_boundary')
-                    elif current_chunk_size >= chunk_size * 1.3:  # Allow 30% overflow
+                    elif chunk.size >= chunk_size * 1.3:  # Allow 30% overflow
                         should_chunk = True
                         chunk_reasons.append('size_overflow')
             
-            if should_chunk and current_chunk:
-                # Calculate metadata
-                chunk_ips = set(parsed_lines[max(0, idx - len(current_chunk)):idx]['ip'] 
-                            for item in parsed_lines[max(0, idx - len(current_chunk)):idx])
-                chunk_errors = sum(1 for item in parsed_lines[max(0, idx - len(current_chunk)):idx] 
-                                if item['is_error'])
-                
-                chunks.append(Document(
-                    page_content="\n".join(current_chunk),
+            if should_chunk:
+                yield Document(
+                    page_content=chunk.text(),
                     metadata={
                         "method": "hybrid_intelligent",
-                        "chunk_index": len(chunks),
-                        "entries": len(current_chunk),
-                        "unique_ips": len([ip for ip in chunk_ips if ip]),
-                        "error_count": chunk_errors,
+                        "chunk_index": chunk_index + chunks_count,
+                        "entries": len(chunk),
+                        "unique_ips": chunk.unique_ips,
+                        "error_count": chunk.error_count,
                         "boundary_reasons": ", ".join(chunk_reasons),
-                        "has_overlap": len(overlap_buffer) > 0
+                        "has_overlap": has_overlap
                     }
-                ))
+                )
+                chunks_count += 1
+                entries_count += len(chunk)
                 
                 # Create overlap
-                overlap_count = max(2, len(current_chunk) * overlap_size // 100)
-                overlap_buffer = current_chunk[-overlap_count:]
+                overlap_count = max(2, len(chunk) * overlap_size // 100)
+                has_overlap = True
                 
-                current_chunk = overlap_buffer.copy()
-                current_chunk_size = sum(len(l) + 1 for l in current_chunk)
+                chunk.carry_over(overlap_count)
+                log.release(chunk.start)
             
-            if (idx + 1) % 100 == 0:
-                logger.info(f"[HYBRID_INTELLIGENT] Progress: Processed {idx + 1}/{len(parsed_lines)} entries, Created {len(chunks)} chunks")
+            if (idx + 1) % self.progress_log_interval == 0:
+                logger.info(f"[HYBRID_INTELLIGENT] Progress: Processed {idx + 1} entries, Created {chunks_count} chunks")
         
         # Final chunk
-        if current_chunk:
-            chunks.append(Document(
-                page_content="\n".join(current_chunk),
+        if len(chunk):
+            yield Document(
+                page_content=chunk.text(),
                 metadata={
                     "method": "hybrid_intelligent",
-                    "chunk_index": len(chunks),
-                    "entries": len(current_chunk),
+                    "chunk_index": chunk_index + chunks_count,
+                    "entries": len(chunk),
                     "boundary_reasons": "final_chunk",
-                    "has_overlap": len(overlap_buffer) > 0
+                    "has_overlap": has_overlap
                 }
-            ))
+            )
+            chunks_count += 1
+            entries_count += len(chunk)
         
-        logger.info(f"[HYBRID_INTELLIGENT] Chunking complete! Total chunks: {len(chunks)}")
-        logger.info(f"[HYBRID_INTELLIGENT] Avg entries per chunk: {sum(c.metadata['entries'] for c in chunks) / len(chunks):.1f}")
+        logger.info(f"[HYBRID_INTELLIGENT] Chunking complete! Total chunks: {chunks_count}")
+        if chunks_count:
+            logger.info(f"[HYBRID_INTELLIGENT] Avg entries per chunk: {entries_count / chunks_count:.1f}")
         
-        return chunks
 
 
-    def process_log_error_block_splitter(self, texts: List[str], metadatas: List[dict], chunk_size: int):
+    def process_log_error_block_splitter(self, log: ColumnarLog, chunk_size: int):
         """
         Log-specific error block splitter method.
         Groups log entries by error patterns and status codes to keep related errors together.
         Best for analyzing error patterns and their context.
         """
         logger.info(f"[LOG_ERROR_BLOCK] Starting chunking - grouping errors together...")
-        full_text = " ".join(texts)
         
-        # Split by lines
-        lines = [line.strip() for line in full_text.split('\n') if line.strip()]
-        logger.info(f"[LOG_ERROR_BLOCK] Found {len(lines)} log entries to process")
+        chunks_count = 0
+        chunk = ChunkBuilder(log)
         
-        # Error status codes
-        error_statuses = ['400', '401', '403', '404', '405', '500', '501', '502', '503', '504']
-        
-        chunks = []
-        current_chunk = []
-        current_chunk_size = 0
-        
-        for idx, line in enumerate(lines):
-            is_error = any(f" {status} " in line for status in error_statuses)
-            line_size = len(line) + 1
+        for idx in log.rows():
+            is_error = log.is_error(idx)
             
             # Add line to current chunk
-            current_chunk.append(line)
-            current_chunk_size += line_size
+            chunk.add(idx)
             
             # Check if we should create a chunk
             # Chunk on: size threshold OR if we have errors and hit a non-error line
             should_chunk = (
-                current_chunk_size >= chunk_size or 
-                (any(any(f" {status} " in l for status in error_statuses) for l in current_chunk) and 
-                 not is_error and len(current_chunk) > 1)
+                chunk.size >= chunk_size or 
+                (chunk.error_count > 0 and not is_error and len(chunk) > 1)
             )
             
-            if should_chunk and current_chunk:
-                chunks.append(Document(
-                    page_content="\n".join(current_chunk),
+            if should_chunk:
+                yield Document(
+                    page_content=chunk.text(),
                     metadata={
                         "method": "log_error_block",
-                        "error_lines": sum(1 for l in current_chunk if any(f" {status} " in l for status in error_statuses)),
-                        "total_lines": len(current_chunk)
+                        "error_lines": chunk.error_count,
+                        "total_lines": len(chunk)
                     }
-                ))
-                current_chunk = []
-                current_chunk_size = 0
+                )
+                chunks_count += 1
+                chunk.reset()
+                log.release(chunk.start)
             
-            if (idx + 1) % 100 == 0:
-                logger.info(f"✅ [LOG_ERROR_BLOCK] Progress: Processed {idx + 1}/{len(lines)} entries, Created {len(chunks)} chunks")
+            if (idx + 1) % self.progress_log_interval == 0:
+                logger.info(f"✅ [LOG_ERROR_BLOCK] Progress: Processed {idx + 1} entries, Created {chunks_count} chunks")
         
         # Don't forget the last chunk
-        if current_chunk:
-            chunks.append(Document(
-                page_content="\n".join(current_chunk),
+        if len(chunk):
+            yield Document(
+                page_content=chunk.text(),
                 metadata={
                     "method": "log_error_block",
-                    "error_lines": sum(1 for l in current_chunk if any(f" {status} " in l for status in error_statuses)),
-                    "total_lines": len(current_chunk)
+                    "error_lines": chunk.error_count,
+                    "total_lines": len(chunk)
                 }
-            ))
+            )
+            chunks_count += 1
         
-        logger.info(f"[LOG_ERROR_BLOCK] Chunking complete! Total chunks: {len(chunks)}")
-        return chunks
+        logger.info(f"[LOG_ERROR_BLOCK] Chunking complete! Total chunks: {chunks_count}")
 
-    def process_log_time_window_splitter(self, texts: List[str], metadatas: List[dict], chunk_size: int):
+    def process_log_time_window_splitter(self, log: ColumnarLog, chunk_size: int):
         """
         Log-specific time window splitter method.
         Groups log entries by time windows (minute/hour boundaries).
@@ -647,142 +874,118 @@ class ProcessController(BaseController):
         Detects timestamp patterns like [23/Jan/2019:03:56:14 +0330]
         """
         logger.info(f"[LOG_TIME_WINDOW] Starting chunking - grouping by time windows...")
-        full_text = " ".join(texts)
-        
-        # Split by lines
-        lines = [line.strip() for line in full_text.split('\n') if line.strip()]
-        logger.info(f"[LOG_TIME_WINDOW] Found {len(lines)} log entries to process")
-        
-        # Pattern to extract timestamps like [23/Jan/2019:03:56:14 +0330]
-        timestamp_pattern = r'\[(\d{2})/(\w{3})/(\d{4}):(\d{2}):(\d{2}):(\d{2})'
         
-        chunks = []
-        current_chunk = []
-        current_chunk_size = 0
-        current_time_window = None
+        chunks_count = 0
+        chunk = ChunkBuilder(log)
+        current_time_window = MISSING
         
-        for idx, line in enumerate(lines):
-            # Extract timestamp from log line
-            match = re.search(timestamp_pattern, line)
-            time_window = None
-            
-            if match:
-                day, month, year, hour, minute, second = match.groups()
-                # Time window key (hour-based grouping)
-                time_window = f"{year}-{month}-{day}_{hour}:00"
+        for idx in log.rows():
+            # Time window key (hour-based grouping)
+            time_window = log.local_hour(idx)
             
-            line_size = len(line) + 1
-            current_chunk.append(line)
-            current_chunk_size += line_size
+            chunk.add(idx)
             
             # Check if we should create a chunk
             # Chunk on: size threshold OR time window change
             should_chunk = (
-                current_chunk_size >= chunk_size or 
-                (current_time_window and time_window and current_time_window != time_window)
+                chunk.size >= chunk_size or 
+                (current_time_window != MISSING and time_window != MISSING and current_time_window != time_window)
             )
             
-            if should_chunk and current_chunk:
-                chunks.append(Document(
-                    page_content="\n".join(current_chunk),
+            if should_chunk:
+                yield Document(
+                    page_content=chunk.text(),
                     metadata={
                         "method": "log_time_window",
-                        "time_window": current_time_window,
-                        "entries": len(current_chunk)
+                        "time_window": log.format_time_window(current_time_window),
+                        "entries": len(chunk)
                     }
-                ))
-                current_chunk = []
-                current_chunk_size = 0
+                )
+                chunks_count += 1
+                chunk.reset()
+                log.release(chunk.start)
             
-            if time_window:
+            if time_window != MISSING:
                 current_time_window = time_window
             
-            if (idx + 1) % 100 == 0:
-                logger.info(f"[LOG_TIME_WINDOW] Progress: Processed {idx + 1}/{len(lines)} entries, Created {len(chunks)} chunks")
+            if (idx + 1) % self.progress_log_interval == 0:
+                logger.info(f"[LOG_TIME_WINDOW] Progress: Processed {idx + 1} entries, Created {chunks_count} chunks")
         
         # Don't forget the last chunk
-        if current_chunk:
-            chunks.append(Document(
-                page_content="\n".join(current_chunk),
+        if len(chunk):
+            yield Document(
+                page_content=chunk.text(),
                 metadata={
                     "method": "log_time_window",
-                    "time_window": current_time_window,
-                    "entries": len(current_chunk)
+                    "time_window": log.format_time_window(current_time_window),
+                    "entries": len(chunk)
                 }
-            ))
+            )
+            chunks_count += 1
         
-        logger.info(f"[LOG_TIME_WINDOW] Chunking complete! Total chunks: {len(chunks)}")
-        return chunks
+        logger.info(f"[LOG_TIME_WINDOW] Chunking complete! Total chunks: {chunks_count}")
 
-    def process_log_component_based_splitter(self, texts: List[str], metadatas: List[dict], chunk_size: int):
+    def process_log_component_based_splitter(self, log: ColumnarLog, chunk_size: int):
         """
         Log-specific component-based splitter method.
         Groups log entries by component/source (IP addresses, user agents, endpoints).
         Best for analyzing logs by component or client.
         """
         logger.info(f"[LOG_COMPONENT_BASED] Starting chunking - grouping by components...")
-        full_text = " ".join(texts)
-        
-        # Split by lines
-        lines = [line.strip() for line in full_text.split('\n') if line.strip()]
-        logger.info(f"[LOG_COMPONENT_BASED] Found {len(lines)} log entries to process")
-        
-        # Extract IP address pattern (at start of most log lines)
-        ip_pattern = r'^(\d+\.\d+\.\d+\.\d+)'
+
+        def component_name(ip_id):
+            return log.ips[ip_id] if ip_id != MISSING else "UNKNOWN"
         
-        chunks = []
-        current_chunk = []
-        current_chunk_size = 0
+        chunks_count = 0
+        chunk = ChunkBuilder(log)
         current_component = None
         
-        for idx, line in enumerate(lines):
-            # Extract IP/component from log line
-            match = re.search(ip_pattern, line)
-            component = match.group(1) if match else "UNKNOWN"
+        for idx in log.rows():
+            # IP id of the line, MISSING stands for UNKNOWN
+            component = log.ip_key(idx)
             
-            line_size = len(line) + 1
-            current_chunk.append(line)
-            current_chunk_size += line_size
+            chunk.add(idx)
             
             # Check if we should create a chunk
             # Chunk on: size threshold OR component change with multiple lines
             should_chunk = (
-                current_chunk_size >= chunk_size or 
-                (current_component and current_component != component and len(current_chunk) > 1)
+                chunk.size >= chunk_size or 
+                (current_component is not None and current_component != component and len(chunk) > 1)
             )
             
-            if should_chunk and current_chunk:
-                chunks.append(Document(
-                    page_content="\n".join(current_chunk),
+            if should_chunk:
+                yield Document(
+                    page_content=chunk.text(),
                     metadata={
                         "method": "log_component_based",
-                        "component": current_component,
-                        "entries": len(current_chunk)
+                        "component": component_name(current_component) if current_component is not None else None,
+                        "entries": len(chunk)
                     }
-                ))
-                current_chunk = []
-                current_chunk_size = 0
+                )
+                chunks_count += 1
+                chunk.reset()
+                log.release(chunk.start)
             
             current_component = component
             
-            if (idx + 1) % 100 == 0:
-                logger.info(f" [LOG_COMPONENT_BASED] Progress: Processed {idx + 1}/{len(lines)} entries, Created {len(chunks)} chunks")
+            if (idx + 1) % self.progress_log_interval == 0:
+                logger.info(f" [LOG_COMPONENT_BASED] Progress: Processed {idx + 1} entries, Created {chunks_count} chunks")
         
         # Don't forget the last chunk
-        if current_chunk:
-            chunks.append(Document(
-                page_content="\n".join(current_chunk),
+        if len(chunk):
+            yield Document(
+                page_content=chunk.text(),
                 metadata={
                     "method": "log_component_based",
-                    "component": current_component,
-                    "entries": len(current_chunk)
+                    "component": component_name(current_component),
+                    "entries": len(chunk)
                 }
-            ))
+            )
+            chunks_count += 1
         
-        logger.info(f"[LOG_COMPONENT_BASED] Chunking complete! Total chunks: {len(chunks)}")
-        return chunks
+        logger.info(f"[LOG_COMPONENT_BASED] Chunking complete! Total chunks: {chunks_count}")
 
-    def process_log_status_code_splitter(self, texts: List[str], metadatas: List[dict], chunk_size: int):
+    def process_log_status_code_splitter(self, log: ColumnarLog, chunk_size: int):
         """
         Log-specific status code splitter method.
         Groups log entries by HTTP status code categories:
@@ -790,82 +993,63 @@ class ProcessController(BaseController):
         Best for analyzing logs by response status type.
         """
         logger.info(f"[LOG_STATUS_CODE] Starting chunking - grouping by status codes...")
-        full_text = " ".join(texts)
-        
-        # Split by lines
-        lines = [line.strip() for line in full_text.split('\n') if line.strip()]
-        logger.info(f"[LOG_STATUS_CODE] Found {len(lines)} log entries to process")
         
-        # Status code pattern: extract 3-digit code
-        status_pattern = r'" (\d{3}) '
-        
-        chunks = []
-        current_chunk = []
-        current_chunk_size = 0
+        status_categories = {
+            2: '2xx_success',
+            3: '3xx_redirect',
+            4: '4xx_client_error',
+            5: '5xx_server_error',
+        }
+
+        chunks_count = 0
+        chunk = ChunkBuilder(log)
         current_status_category = None
         
-        def get_status_category(status_code):
-            if status_code:
-                first_digit = status_code[0]
-                if first_digit == '2':
-                    return '2xx_success'
-                elif first_digit == '3':
-                    return '3xx_redirect'
-                elif first_digit == '4':
-                    return '4xx_client_error'
-                elif first_digit == '5':
-                    return '5xx_server_error'
-            return 'unknown'
-        
-        for idx, line in enumerate(lines):
-            # Extract status code from log line
-            match = re.search(status_pattern, line)
-            status_code = match.group(1) if match else None
-            status_category = get_status_category(status_code)
+        for idx in log.rows():
+            status_category = status_categories.get(log.status_class(idx), 'unknown')
             
-            line_size = len(line) + 1
-            current_chunk.append(line)
-            current_chunk_size += line_size
+            chunk.add(idx)
             
             # Check if we should create a chunk
             # Chunk on: size threshold OR status category change
             should_chunk = (
-                current_chunk_size >= chunk_size or 
+                chunk.size >= chunk_size or 
                 (current_status_category and current_status_category != status_category)
             )
             
-            if should_chunk and current_chunk:
-                chunks.append(Document(
-                    page_content="\n".join(current_chunk),
+            if should_chunk:
+                yield Document(
+                    page_content=chunk.text(),
                     metadata={
                         "method": "log_status_code",
                         "status_category": current_status_category,
-                        "entries": len(current_chunk)
+                        "entries": len(chunk)
                     }
-                ))
-                current_chunk = []
-                current_chunk_size = 0
+                )
+                chunks_count += 1
+                chunk.reset()
+                log.release(chunk.start)
             
             current_status_category = status_category
             
-            if (idx + 1) % 100 == 0:
-                logger.info(f"[LOG_STATUS_CODE] Progress: Processed {idx + 1}/{len(lines)} entries, Created {len(chunks)} chunks")
+            if (idx + 1) % self.progress_log_interval == 0:
+                logger.info(f"[LOG_STATUS_CODE] Progress: Processed {idx + 1} entries, Created {chunks_count} chunks")
         
         # Don't forget the last chunk
-        if current_chunk:
-            chunks.append(Document(
-                page_content="\n".join(current_chunk),
+        if len(chunk):
+            yield Document(
+                page_content=chunk.text(),
                 metadata={
                     "method": "log_status_code",
                     "status_category": current_status_category,
-                    "entries": len(current_chunk)
+                    "entries": len(chunk)
                 }
-            ))
+            )
+            chunks_count += 1
         
-        logger.info(f"[LOG_STATUS_CODE] Chunking complete! Total chunks: {len(chunks)}")
-        return chunks
+        logger.info(f"[LOG_STATUS_CODE] Chunking complete! Total chunks: {chunks_count}")
 
-    def process_log_url_pattern_splitter(self, texts: List[str], metadatas: List[dict], chunk_size: int):
+    def process_log_url_pattern_splitter(self, log: ColumnarLog, chunk_size: int):
         """
         Log-specific URL pattern splitter method.
         Groups log entries by URL patterns:
@@ -879,75 +1063,80 @@ class ProcessController(BaseController):
         Best for analyzing traffic by resource type.
         """
         logger.info(f"[LOG_URL_PATTERN] Starting chunking - grouping by URL patterns...")
-        full_text = " ".join(texts)
-        
-        lines = [line.strip() for line in full_text.split('\n') if line.strip()]
-        logger.info(f"[LOG_URL_PATTERN] Found {len(lines)} log entries to process")
         
-        # URL patterns with priorities
+        # URL patterns with priorities: (allowed methods, URL prefix pattern)
         url_patterns = {
-            'image': r'GET /image/',
-            'static': r'GET /static/',
-            'filter': r'(GET|POST) /(ajax)?[fF]ilter',
-            'mobile': r'GET /m/',
-            'api': r'GET /(settings|site|order)/',
-            'product': r'GET /product/',
-            'browse': r'GET /browse/',
+            'image': (('GET',), re.compile(r'/image/')),
+            'static': (('GET',), re.compile(r'/static/')),
+            'filter': (('GET', 'POST'), re.compile(r'/(ajax)?[fF]ilter')),
+            'mobile': (('GET',), re.compile(r'/m/')),
+            'api': (('GET',), re.compile(r'/(settings|site|order)/')),
+            'product': (('GET',), re.compile(r'/product/')),
+            'browse': (('GET',), re.compile(r'/browse/')),
         }
-        
-        def get_url_category(line):
-            for category, pattern in url_patterns.items():
-                if re.search(pattern, line):
-                    return category
-            return 'other'
-        
-        chunks = []
-        current_chunk = []
-        current_chunk_size = 0
+
+        # one category per distinct (method, url) pair
+        url_categories = {}
+        
+        def get_url_category(idx):
+            key = (log.method_key(idx), log.url_key(idx))
+            category = url_categories.get(key)
+            if category is None:
+                category = 'other'
+                method, url = log.method(idx), log.url(idx)
+                if method and url:
+                    for name, (methods, pattern) in url_patterns.items():
+                        if method in methods and pattern.match(url):
+                            category = name
+                            break
+                url_categories[key] = category
+            return category
+        
+        chunks_count = 0
+        chunk = ChunkBuilder(log)
         current_category = None
         
-        for idx, line in enumerate(lines):
-            category = get_url_category(line)
-            line_size = len(line) + 1
-            current_chunk.append(line)
-            current_chunk_size += line_size
+        for idx in log.rows():
+            category = get_url_category(idx)
+            chunk.add(idx)
             
             should_chunk = (
-                current_chunk_size >= chunk_size or
-                (current_category and current_category != category and len(current_chunk) > 1)
+                chunk.size >= chunk_size or
+                (current_category and current_category != category and len(chunk) > 1)
             )
             
-            if should_chunk and current_chunk:
-                chunks.append(Document(
-                    page_content="\n".join(current_chunk),
+            if should_chunk:
+                yield Document(
+                    page_content=chunk.text(),
                     metadata={
                         "method": "log_url_pattern",
                         "url_category": current_category,
-                        "entries": len(current_chunk)
+                        "entries": len(chunk)
                     }
-                ))
-                current_chunk = []
-                current_chunk_size = 0
+                )
+                chunks_count += 1
+                chunk.reset()
+                log.release(chunk.start)
             
             current_category = category
             
-            if (idx + 1) % 100 == 0:
-                logger.info(f"[LOG_URL_PATTERN] Progress: Processed {idx + 1}/{len(lines)} entries, Created {len(chunks)} chunks")
+            if (idx + 1) % self.progress_log_interval == 0:
+                logger.info(f"[LOG_URL_PATTERN] Progress: Processed {idx + 1} entries, Created {chunks_count} chunks")
         
-        if current_chunk:
-            chunks.append(Document(
-                page_content="\n".join(current_chunk),
+        if len(chunk):
+            yield Document(
+                page_content=chunk.text(),
                 metadata={
                     "method": "log_url_pattern",
                     "url_category": current_category,
-                    "entries": len(current_chunk)
+                    "entries": len(chunk)
                 }
-            ))
+            )
+            chunks_count += 1
         
-        logger.info(f"[LOG_URL_PATTERN] Chunking complete! Total chunks: {len(chunks)}")
-        return chunks
+        logger.info(f"[LOG_URL_PATTERN] Chunking complete! Total chunks: {chunks_count}")
 
-    def process_log_bot_human_splitter(self, texts: List[str], metadatas: List[dict], chunk_size: int):
+    def process_log_bot_human_splitter(self, log: ColumnarLog, chunk_size: int):
         """
         Log-specific bot vs human traffic splitter method.
         Separates log entries by traffic source:
@@ -956,217 +1145,304 @@ class ProcessController(BaseController):
         Best for analyzing bot behavior vs user behavior separately.
         """
         logger.info(f"[LOG_BOT_HUMAN] Starting chunking - separating bot and human traffic...")
-        full_text = " ".join(texts)
         
-        lines = [line.strip() for line in full_text.split('\n') if line.strip()]
-        logger.info(f"[LOG_BOT_HUMAN] Found {len(lines)} log entries to process")
-        
-        # Bot patterns in User-Agent
+        # Bot patterns in User-Agent (the user agent is not a column, match the raw line bytes)
         bot_patterns = [
-            r'[Gg]ooglebot', r'[Bb]ingbot', r'[Yy]ahoo', r'[Bb]aidu',
-            r'[Ss]lurp', r'[Dd]uckDuck', r'[Ff]acebot', r'[Ii]A_[Aa]rchiver',
-            r'AhrefsBot', r'MJ12bot', r'SemrushBot', r'DotBot',
-            r'crawler', r'spider', r'bot\.html', r'[Rr]obot'
+            rb'[Gg]ooglebot', rb'[Bb]ingbot', rb'[Yy]ahoo', rb'[Bb]aidu',
+            rb'[Ss]lurp', rb'[Dd]uckDuck', rb'[Ff]acebot', rb'[Ii]A_[Aa]rchiver',
+            rb'AhrefsBot', rb'MJ12bot', rb'SemrushBot', rb'DotBot',
+            rb'crawler', rb'spider', rb'bot\.html', rb'[Rr]obot'
         ]
-        bot_regex = '|'.join(bot_patterns)
-        
-        def is_bot(line):
-            return bool(re.search(bot_regex, line, re.IGNORECASE))
+        bot_regex = re.compile(b'|'.join(bot_patterns), re.IGNORECASE)
         
-        chunks = []
-        current_chunk = []
-        current_chunk_size = 0
+        chunks_count = 0
+        chunk = ChunkBuilder(log)
         current_is_bot = None
         
-        for idx, line in enumerate(lines):
-            line_is_bot = is_bot(line)
-            line_size = len(line) + 1
-            current_chunk.append(line)
-            current_chunk_size += line_size
+        for idx in log.rows():
+            line_is_bot = log.search(bot_regex, idx) is not None
+            chunk.add(idx)
             
             should_chunk = (
-                current_chunk_size >= chunk_size or
-                (current_is_bot is not None and current_is_bot != line_is_bot and len(current_chunk) > 1)
+                chunk.size >= chunk_size or
+                (current_is_bot is not None and current_is_bot != line_is_bot and len(chunk) > 1)
             )
             
-            if should_chunk and current_chunk:
-                chunks.append(Document(
-                    page_content="\n".join(current_chunk),
+            if should_chunk:
+                yield Document(
+                    page_content=chunk.text(),
                     metadata={
                         "method": "log_bot_human",
                         "traffic_type": "bot" if current_is_bot else "human",
-                        "entries": len(current_chunk)
+                        "entries": len(chunk)
                     }
-                ))
-                current_chunk = []
-                current_chunk_size = 0
+                )
+                chunks_count += 1
+                chunk.reset()
+                log.release(chunk.start)
             
             current_is_bot = line_is_bot
             
-            if (idx + 1) % 100 == 0:
-                logger.info(f"[LOG_BOT_HUMAN] Progress: Processed {idx + 1}/{len(lines)} entries, Created {len(chunks)} chunks")
+            if (idx + 1) % self.progress_log_interval == 0:
+                logger.info(f"[LOG_BOT_HUMAN] Progress: Processed {idx + 1} entries, Created {chunks_count} chunks")
         
-        if current_chunk:
-            chunks.append(Document(
-                page_content="\n".join(current_chunk),
+        if len(chunk):
+            yield Document(
+                page_content=chunk.text(),
                 metadata={
                     "method": "log_bot_human",
                     "traffic_type": "bot" if current_is_bot else "human",
-                    "entries": len(current_chunk)
+                    "entries": len(chunk)
                 }
-            ))
+            )
+            chunks_count += 1
         
-        logger.info(f"[LOG_BOT_HUMAN] Chunking complete! Total chunks: {len(chunks)}")
-        return chunks
+        logger.info(f"[LOG_BOT_HUMAN] Chunking complete! Total chunks: {chunks_count}")
 
-    def process_log_semantic_sliding_splitter(self, texts: List[str], metadatas: List[dict], chunk_size: int, overlap_size: int = 20):
+    def process_log_semantic_sliding_splitter(self, log: ColumnarLog, chunk_size: int, overlap_size: int = 20,
+                                              chunk_index: int = 0, has_overlap: bool = False):
         """
         Log-specific semantic sliding window splitter with overlap.
         Creates chunks with overlapping log entries to preserve context.
         Best for RAG applications where context between chunks matters.
         """
         logger.info(f"[LOG_SEMANTIC_SLIDING] Starting chunking with overlap_size={overlap_size}...")
-        full_text = " ".join(texts)
         
-        lines = [line.strip() for line in full_text.split('\n') if line.strip()]
-        logger.info(f"[LOG_SEMANTIC_SLIDING] Found {len(lines)} log entries to process")
+        chunks_count = 0
+        chunk = ChunkBuilder(log)
         
-        chunks = []
-        current_chunk = []
-        current_chunk_size = 0
-        overlap_buffer = []  # Store lines for overlap
-        
-        for idx, line in enumerate(lines):
-            line_size = len(line) + 1
-            current_chunk.append(line)
-            current_chunk_size += line_size
+        for idx in log.rows():
+            chunk.add(idx)
             
-            if current_chunk_size >= chunk_size:
-                chunks.append(Document(
-                    page_content="\n".join(current_chunk),
+            if chunk.size >= chunk_size:
+                yield Document(
+                    page_content=chunk.text(),
                     metadata={
                         "method": "log_semantic_sliding",
-                        "chunk_index": len(chunks),
-                        "entries": len(current_chunk),
-                        "has_overlap": len(overlap_buffer) > 0
+                        "chunk_index": chunk_index + chunks_count,
+                        "entries": len(chunk),
+                        "has_overlap": has_overlap
                     }
-                ))
+                )
+                chunks_count += 1
                 
                 # Calculate overlap lines (based on percentage of chunk)
-                overlap_count = max(1, len(current_chunk) * overlap_size // 100)
-                overlap_buffer = current_chunk[-overlap_count:]
+                overlap_count = max(1, len(chunk) * overlap_size // 100)
+                has_overlap = True
                 
                 # Start new chunk with overlap
-                current_chunk = overlap_buffer.copy()
-                current_chunk_size = sum(len(l) + 1 for l in current_chunk)
+                chunk.carry_over(overlap_count)
+                log.release(chunk.start)
             
-            if (idx + 1) % 100 == 0:
-                logger.info(f"[LOG_SEMANTIC_SLIDING] Progress: Processed {idx + 1}/{len(lines)} entries, Created {len(chunks)} chunks")
+            if (idx + 1) % self.progress_log_interval == 0:
+                logger.info(f"[LOG_SEMANTIC_SLIDING] Progress: Processed {idx + 1} entries, Created {chunks_count} chunks")
         
-        if current_chunk:
-            chunks.append(Document(
-                page_content="\n".join(current_chunk),
+        if len(chunk):
+            yield Document(
+                page_content=chunk.text(),
                 metadata={
                     "method": "log_semantic_sliding",
-                    "chunk_index": len(chunks),
-                    "entries": len(current_chunk),
-                    "has_overlap": len(overlap_buffer) > 0
+                    "chunk_index": chunk_index + chunks_count,
+                    "entries": len(chunk),
+                    "has_overlap": has_overlap
                 }
-            ))
+            )
+            chunks_count += 1
         
-        logger.info(f"[LOG_SEMANTIC_SLIDING] Chunking complete! Total chunks: {len(chunks)}")
-        return chunks
+        logger.info(f"[LOG_SEMANTIC_SLIDING] Chunking complete! Total chunks: {chunks_count}")
+
+    def process_log_template_compressed_splitter(self, log: ColumnarLog, chunk_size: int,
+                                                 top_values: int = 3, miner: TemplateMiner = None):
+        """
+        Log-specific template compressed splitter.
+        Mines line templates (Drain-style, see TemplateMiner) and renders a chunk
+        as one line per run of lines sharing a template and status code:
+        `template x N (status, first..last, top IPs)`, instead of the lines
+        themselves. Chunks also break on hour windows. The metadata keeps the
+        template ids, counts and most frequent parameter values. Chunks of a
+        text or log file keep the byte range of their raw lines (raw_range,
+        see /chunk-raw); chunks of loader text, e.g. a PDF, have none.
+        Best for bot-heavy logs made of near-identical lines. Pass a `miner`
+        to keep mining (and numbering) templates from a previous run.
+        """
+        logger.info(f"[LOG_TEMPLATE_COMPRESSED] Starting chunking - mining line templates...")
+
+        miner = miner if miner is not None else TemplateMiner()
+
+        chunks_count = 0
+        chunk = ChunkBuilder(log)
+        runs = {}               # (template_id, status) -> run, in order of first appearance
+        rendered_size = 0
+        current_time_window = MISSING
+
+        def run_params(template_id, run):
+            # values per wildcard of the template as rendered, counted by token index
+            return [ run["params"].get(i, Counter()) for i in miner.wildcard_positions(template_id) ]
+
+        def render(key, run):
+            template_id, status = key
+            top_ips = ", ".join(f"{ip} ({n})" for ip, n in run["ips"].most_common(top_values))
+            # the most frequent value of each wildcard keeps the URL or agent in the text
+            example = " | ".join(values.most_common(1)[0][0] for values in run_params(template_id, run) if values)
+            return (f"{miner.template(template_id)} \u00d7 {run['count']} "
+                    f"(status {status}, {log.format_timestamp(run['first'])}..{log.format_timestamp(run['last'])}"
+                    f"{', top IPs: ' + top_ips if top_ips else ''}"
+                    f"{', e.g. ' + example if example else ''})")
+
+        def make_chunk():
+            metadata = {
+                "method": "log_template_compressed",
+                "time_window": log.format_time_window(current_time_window),
+                "entries": len(chunk),
+                "templates": [
+                    {
+                        "template_id": template_id,
+                        "template": miner.template(template_id),
+                        "status": status,
+                        "count": run["count"],
+                        "first_ts": log.format_timestamp(run["first"]),
+                        "last_ts": log.format_timestamp(run["last"]),
+                        "top_ips": run["ips"].most_common(top_values),
+                        "params": [ values.most_common(top_values) for values in run_params(template_id, run) ],
+                    }
+                    for (template_id, status), run in runs.items()
+                ],
+            }
+            if log.from_file:
+                metadata["raw_range"] = chunk.file_range()
+
+            return Document(
+                page_content="\n".join(render(key, run) for key, run in runs.items()),
+                metadata=metadata
+            )
+
+        for idx in log.rows():
+            template_id, params = miner.add(log.line(idx))
+            key = (template_id, log.status_code(idx))
+            time_window = log.local_hour(idx)
+
+            run = runs.get(key)
+            window_changed = (current_time_window != MISSING and time_window != MISSING
+                              and time_window != current_time_window)
+            run_size = len(miner.template(template_id)) + 80 if run is None else 0
+
+            # a repeated run costs nothing, only new runs grow the rendered chunk
+            if runs and (window_changed or rendered_size + run_size > chunk_size):
+                yield make_chunk()
+                chunks_count += 1
+                chunk.reset()
+                log.release(chunk.start)
+                runs, rendered_size, run = {}, 0, None
+                run_size = len(miner.template(template_id)) + 80
+
+            if run is None:
+                run = { "count": 0, "first": idx, "last": idx, "ips": Counter(), "params": {} }
+                runs[key] = run
+                rendered_size += run_size
 
-    def process_log_http_method_splitter(self, texts: List[str], metadatas: List[dict], chunk_size: int):
+            chunk.add(idx)
+            run["count"] += 1
+            run["last"] = idx
+            ip = log.ip(idx)
+            if ip is not None:
+                run["ips"][ip] += 1
+            for i, value in params:
+                values = run["params"].get(i)
+                if values is None:
+                    values = run["params"][i] = Counter()
+                values[value] += 1
+
+            if time_window != MISSING:
+                current_time_window = time_window
+
+            if (idx + 1) % self.progress_log_interval == 0:
+                logger.info(f"[LOG_TEMPLATE_COMPRESSED] Progress: Processed {idx + 1} entries, Created {chunks_count} chunks")
+
+        if runs:
+            yield make_chunk()
+            chunks_count += 1
+
+        logger.info(f"[LOG_TEMPLATE_COMPRESSED] Chunking complete! Total chunks: {chunks_count}, "
+                    f"templates: {len(miner.clusters)}")
+
+    def process_log_http_method_splitter(self, log: ColumnarLog, chunk_size: int):
         """
         Log-specific HTTP method splitter.
         Groups log entries by HTTP method (GET, POST, PUT, DELETE, etc.).
         Best for analyzing different types of operations separately.
         """
         logger.info(f"[LOG_HTTP_METHOD] Starting chunking - grouping by HTTP methods...")
-        full_text = " ".join(texts)
-        
-        lines = [line.strip() for line in full_text.split('\n') if line.strip()]
-        logger.info(f"[LOG_HTTP_METHOD] Found {len(lines)} log entries to process")
         
-        # HTTP method pattern
-        method_pattern = r'"(GET|POST|PUT|DELETE|PATCH|HEAD|OPTIONS|CONNECT|TRACE) '
-        
-        def get_http_method(line):
-            match = re.search(method_pattern, line)
-            return match.group(1) if match else 'UNKNOWN'
-        
-        chunks = []
-        current_chunk = []
-        current_chunk_size = 0
+        chunks_count = 0
+        chunk = ChunkBuilder(log)
         current_method = None
         
-        for idx, line in enumerate(lines):
-            method = get_http_method(line)
-            line_size = len(line) + 1
-            current_chunk.append(line)
-            current_chunk_size += line_size
+        for idx in log.rows():
+            method = log.method(idx) or 'UNKNOWN'
+            chunk.add(idx)
             
             should_chunk = (
-                current_chunk_size >= chunk_size or
-                (current_method and current_method != method and len(current_chunk) > 1)
+                chunk.size >= chunk_size or
+                (current_method and current_method != method and len(chunk) > 1)
             )
             
-            if should_chunk and current_chunk:
-                chunks.append(Document(
-                    page_content="\n".join(current_chunk),
+            if should_chunk:
+                yield Document(
+                    page_content=chunk.text(),
                     metadata={
                         "method": "log_http_method",
                         "http_method": current_method,
-                        "entries": len(current_chunk)
+                        "entries": len(chunk)
                     }
-                ))
-                current_chunk = []
-                current_chunk_size = 0
+                )
+                chunks_count += 1
+                chunk.reset()
+                log.release(chunk.start)
             
             current_method = method
             
-            if (idx + 1) % 100 == 0:
-                logger.info(f"[LOG_HTTP_METHOD] Progress: Processed {idx + 1}/{len(lines)} entries, Created {len(chunks)} chunks")
+            if (idx + 1) % self.progress_log_interval == 0:
+                logger.info(f"[LOG_HTTP_METHOD] Progress: Processed {idx + 1} entries, Created {chunks_count} chunks")
         
-        if current_chunk:
-            chunks.append(Document(
-                page_content="\n".join(current_chunk),
+        if len(chunk):
+            yield Document(
+                page_content=chunk.text(),
                 metadata={
                     "method": "log_http_method",
                     "http_method": current_method,
-                    "entries": len(current_chunk)
+                    "entries": len(chunk)
                 }
-            ))
+            )
+            chunks_count += 1
         
-        logger.info(f"[LOG_HTTP_METHOD] Chunking complete! Total chunks: {len(chunks)}")
-        return chunks
+        logger.info(f"[LOG_HTTP_METHOD] Chunking complete! Total chunks: {chunks_count}")
 
 
-    def process_simpler_splitter(self, texts: List[str], metadatas: List[dict], chunk_size: int, splitter_tag: str="\n"):
+    def process_simpler_splitter(self, log: ColumnarLog, chunk_size: int):
         
-        full_text = " ".join(texts)
-
-        # split by splitter_tag
-        lines = [ doc.strip() for doc in full_text.split(splitter_tag) if len(doc.strip()) > 1 ]
+        chunk_lines = []
+        current_chunk_size = 0
 
-        chunks = []
-        current_chunk = ""
+        for idx in log.rows():
+            # single-character lines carry no content
+            if log.line_size(idx) <= 2:
+                continue
 
-        for line in lines:
-            current_chunk += line + splitter_tag
-            if len(current_chunk) >= chunk_size:
-                chunks.append(Document(
-                    page_content=current_chunk.strip(),
+            chunk_lines.append(idx)
+            current_chunk_size += log.line_size(idx)
+            if current_chunk_size >= chunk_size:
+                yield Document(
+                    page_content="\n".join(log.line(i) for i in chunk_lines),
                     metadata={}
-                ))
+                )
 
-                current_chunk = ""
+                chunk_lines = []
+                current_chunk_size = 0
+                log.release(idx + 1)
 
-        if len(current_chunk) >= 0:
-            chunks.append(Document(
-                page_content=current_chunk.strip(),
+        if chunk_lines:
+            yield Document(
+                page_content="\n".join(log.line(i) for i in chunk_lines),
                 metadata={}
-            ))
+            )
 
-        return chunks
@@ -10,6 +10,21 @@ class Settings(BaseSettings):
     FILE_ALLOWED_TYPES: list
     FILE_MAX_SIZE: int
     FILE_DEFAULT_CHUNK_SIZE: int
+    FILE_PROCESSING_BLOCK_SIZE: int = 1048576
+    FILE_PROCESSING_INSERT_BATCH_SIZE: int = 500
+    FILE_PROCESSING_PARALLEL_WORKERS: int = 0
+    FILE_PROCESSING_RANGE_SIZE: int = 67108864
+    FILE_PROCESSING_FAN_OUT: bool = False
+    FILE_PROCESSING_STREAM_TO_INDEX: bool = False
+    FILE_PROCESSING_STREAM_MAX_IN_FLIGHT: int = 4
+    FILE_PROCESSING_STREAM_JOIN_INTERVAL: int = 2
+    LOG_FORMAT_DETECTION_LINES: int = 200
+    EDA_BLOCK_SIZE: int = 4194304
+    EDA_RANGE_SIZE: int = 33554432
+    EDA_PARALLEL_WORKERS: int = 0
+    EDA_PRECOMPUTE_ON_UPLOAD: bool = True
+    EDA_STREAM_ON_UPLOAD: bool = True
+    EDA_LINE_INDEX_INTERVAL: int = 1048576
 
     POSTGRES_USERNAME: str
     POSTGRES_PASSWORD: str
@@ -23,6 +38,13 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = None
     OPENAI_API_URL: str = None
     COHERE_API_KEY: str = None
+    OPENAI_EMBEDDING_CONCURRENCY: int = 4
+    OPENAI_EMBEDDING_BATCH_SIZE: int = 256
+    COHERE_EMBEDDING_CONCURRENCY: int = 4
+    COHERE_EMBEDDING_BATCH_SIZE: int = 96
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PATH: str = "embedding_cache"
+    EMBEDDING_CACHE_SIZE_LIMIT_MB: int = 2048
     GENERATION_MODEL_ID_LITERAL : List[str]= None
     GENERATION_MODEL_ID: str = None
     EMBEDDING_MODEL_ID: str = None
@@ -35,6 +57,22 @@ class Settings(BaseSettings):
     VECTOR_DB_PATH : str
     VECTOR_DB_DISTANCE_METHOD: str = None
     VECTOR_DB_PGVEC_INDEX_THRESHOLD : int
+    VECTOR_DB_PGVEC_HNSW_EF_SEARCH : int = None
+    VECTOR_DB_PGVEC_IVFFLAT_PROBES : int = None
+    VECTOR_DB_PGVEC_INSERT_MODE : str = "copy"
+    VECTOR_DB_PGVEC_COPY_FLUSH_SIZE : int = 1000
+    VECTOR_DB_PGVEC_INDEX_BUILD_MODE : str = "deferred"
+    VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM : str = "512MB"
+    VECTOR_DB_PGVEC_MAINTENANCE_WORKERS : int = 2
+    VECTOR_DB_COLLECTION_CACHE_TTL : int = 300
+    VECTOR_DB_CACHE_INVALIDATION_URL : str = None
+    VECTOR_DB_INDEXING_PAGE_SIZE : int = 500
+    VECTOR_DB_INDEXING_CHECKPOINT_INTERVAL : int = 5000
+
+    QUERY_EMBEDDING_CACHE_SIZE: int = 1024
+    QUERY_EMBEDDING_CACHE_TTL: int = 3600
+    RETRIEVAL_CACHE_SIZE: int = 0
+    RETRIEVAL_CACHE_TTL: int = 300
 
     PRIMARY_LANG: str = "en"
     DEFAULT_LANG: str = "en"
@@ -45,6 +83,7 @@ class Settings(BaseSettings):
     CELERY_TASK_TIME_LIMIT: int=600
     CELERY_TASK_ACKS_LATE: bool=True
     CELERY_WORKER_CONCURRENCY: int=2
+    CELERY_WORKER_DB_POOL_SIZE: int=5
     CELERY_FLOWER_PASSWORD: str=None
 
 
@@ -6,8 +6,11 @@ from helpers.config import get_settings
 from stores.llm.LLMProviderFactory import LLMProviderFactory
 from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
 from stores.llm.templates.template_parser import TemplateParser
+from controllers import NLPController
+from utils.lru_cache import AsyncLRUCache
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+import asyncio
 
 # Import metrics setup
 from utils.metrics import setup_metrics
@@ -57,6 +60,28 @@ async def startup_span():
     )
     await app.vectordb_client.connect()
 
+    # repeated questions: query embeddings, and optionally their search results
+    app.query_embedding_cache = AsyncLRUCache(
+        maxsize=settings.QUERY_EMBEDDING_CACHE_SIZE,
+        ttl=settings.QUERY_EMBEDDING_CACHE_TTL,
+    )
+    app.retrieval_cache = None
+    if settings.RETRIEVAL_CACHE_SIZE > 0:
+        app.retrieval_cache = AsyncLRUCache(
+            maxsize=settings.RETRIEVAL_CACHE_SIZE,
+            ttl=settings.RETRIEVAL_CACHE_TTL,
+        )
+        app.vectordb_client.metadata_cache.add_invalidation_listener(
+            lambda collection_name: NLPController.invalidate_collection_results(
+                app.retrieval_cache, collection_name
+            )
+        )
+
+    # apply collection invalidations broadcast by the celery workers
+    app.collection_cache_listener = asyncio.create_task(
+        app.vectordb_client.metadata_cache.listen()
+    )
+
     app.template_parser = TemplateParser(
         language=settings.PRIMARY_LANG,
         default_language=settings.DEFAULT_LANG,
@@ -64,6 +89,7 @@ async def startup_span():
 
 
 async def shutdown_span():
+    app.collection_cache_listener.cancel()
     app.db_engine.dispose()
     await app.vectordb_client.disconnect()
 
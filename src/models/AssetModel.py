@@ -1,8 +1,9 @@
 from .BaseDataModel import BaseDataModel
-from .db_schemes import Asset
+from .db_schemes import Asset, DataChunk
 from .enums.DataBaseEnum import DataBaseEnum
 from bson import ObjectId
 from sqlalchemy.future import select
+from sqlalchemy import insert
 
 class AssetModel(BaseDataModel):
 
@@ -46,5 +47,82 @@ class AssetModel(BaseDataModel):
             record = result.scalar_one_or_none()
         return record
 
+    async def get_asset_by_id(self, asset_id: int):
+
+        async with self.db_client() as session:
+            record = await session.get(Asset, asset_id)
+        return record
+
+    async def update_asset_config(self, asset_id: int, **config):
+        """Set top-level keys of the asset's config, keeping the others."""
+        async with self.db_client() as session:
+            async with session.begin():
+                asset = await session.get(Asset, asset_id, with_for_update=True)
+                if asset is None:
+                    return None
+
+                asset.asset_config = { **(asset.asset_config or {}), **config }
+        return asset
+
+    async def append_asset_chunks(self, asset_id: int, chunks: list, tail: dict,
+                                  expected_offset: int, asset_size: int,
+                                  replaced_chunk_id: int = None, has_open_chunk: bool = False):
+        """
+        Commit the chunks (dicts of DataChunk columns) of a file's appended tail
+        together with its new tail state, so the saved offset never moves without
+        its chunks. The new chunks are listed as unindexed and the previous open
+        chunk, re-chunked in this tail, as stale until settle_asset_tail() is
+        called for them. Returns the new chunk ids, or None, writing nothing,
+        when another run moved the tail meanwhile.
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                asset = await session.get(Asset, asset_id, with_for_update=True)
+                current_tail = (asset.asset_config or {}).get("tail") or {}
+                if current_tail.get("offset", 0) != expected_offset:
+                    return None
+
+                chunk_ids = []
+                if chunks:
+                    result = await session.execute(
+                        insert(DataChunk).returning(DataChunk.data_chunk_id, sort_by_parameter_order=True),
+                        chunks
+                    )
+                    chunk_ids = result.scalars().all()
+
+                tail["open_chunk_id"] = chunk_ids[-1] if has_open_chunk and chunk_ids else None
+                tail["unindexed_chunk_ids"] = [
+                    i for i in current_tail.get("unindexed_chunk_ids", []) if i != replaced_chunk_id
+                ] + list(chunk_ids)
+                tail["stale_chunk_ids"] = current_tail.get("stale_chunk_ids", []) + (
+                    [replaced_chunk_id] if replaced_chunk_id else []
+                )
+                asset.asset_config = { **(asset.asset_config or {}), "tail": tail }
+                asset.asset_size = asset_size
+        return chunk_ids
+
+    async def settle_asset_tail(self, asset_id: int, indexed_chunk_ids: list = None,
+                                deleted_chunk_ids: list = None):
+        """Drop the chunks now indexed, and the stale ones now deleted, from the asset's tail state."""
+        indexed_chunk_ids = set(indexed_chunk_ids or [])
+        deleted_chunk_ids = set(deleted_chunk_ids or [])
+
+        async with self.db_client() as session:
+            async with session.begin():
+                asset = await session.get(Asset, asset_id, with_for_update=True)
+                tail = (asset.asset_config or {}).get("tail") if asset else None
+                if not tail:
+                    return None
+
+                tail = {
+                    **tail,
+                    "unindexed_chunk_ids": [ i for i in tail.get("unindexed_chunk_ids", [])
+                                             if i not in indexed_chunk_ids ],
+                    "stale_chunk_ids": [ i for i in tail.get("stale_chunk_ids", [])
+                                         if i not in deleted_chunk_ids ],
+                }
+                asset.asset_config = { **asset.asset_config, "tail": tail }
+        return tail
+
 
     
\ No newline at end of file
@@ -4,7 +4,7 @@ from .enums.DataBaseEnum import DataBaseEnum
 from bson.objectid import ObjectId
 from pymongo import InsertOne
 from sqlalchemy.future import select
-from sqlalchemy import func, delete
+from sqlalchemy import func, delete, insert
 
 class ChunkModel(BaseDataModel):
 
@@ -33,15 +33,25 @@ class ChunkModel(BaseDataModel):
             chunk = result.scalar_one_or_none()
         return chunk
 
-    async def insert_many_chunks(self, chunks: list, batch_size: int=100):
+    async def insert_many_chunks(self, chunks: list, batch_size: int=1000):
+        """
+        Bulk insert chunks given as dicts of DataChunk columns (chunk_text,
+        chunk_metadata, chunk_order, chunk_project_id, chunk_asset_id).
 
+        Each batch is one multi-row INSERT ... RETURNING data_chunk_id, without
+        ORM objects or a unit-of-work flush. Returns the new ids in input order.
+        """
+        chunk_ids = []
         async with self.db_client() as session:
             async with session.begin():
                 for i in range(0, len(chunks), batch_size):
                     batch = chunks[i:i+batch_size]
-                    session.add_all(batch)
-            await session.commit()
-        return len(chunks)
+                    result = await session.execute(
+                        insert(DataChunk).returning(DataChunk.data_chunk_id, sort_by_parameter_order=True),
+                        batch
+                    )
+                    chunk_ids.extend(result.scalars().all())
+        return chunk_ids
 
     async def delete_chunks_by_project_id(self, project_id: ObjectId):
         async with self.db_client() as session:
@@ -52,15 +62,101 @@ class ChunkModel(BaseDataModel):
     
     async def get_poject_chunks(self, project_id: ObjectId, page_no: int=1, page_size: int=50):
         async with self.db_client() as session:
-            stmt = select(DataChunk).where(DataChunk.chunk_project_id == project_id).offset((page_no - 1) * page_size).limit(page_size)
+            stmt = select(DataChunk).where(DataChunk.chunk_project_id == project_id).order_by(DataChunk.data_chunk_id).offset((page_no - 1) * page_size).limit(page_size)
             result = await session.execute(stmt)
             records = result.scalars().all()
         return records
+
+    async def iter_project_chunks(self, project_id: ObjectId, page_size: int=50,
+                                  after_chunk_id: int=None):
+        """
+        Stream a project's chunks in data_chunk_id order, one page at a time.
+
+        Uses keyset pagination (data_chunk_id > last seen id), so every page costs
+        the same regardless of its position. Yields lists of rows carrying only
+        data_chunk_id, chunk_text and chunk_metadata. Pass after_chunk_id to
+        resume after an already processed chunk.
+        """
+        last_chunk_id = after_chunk_id or 0
+
+        while True:
+            async with self.db_client() as session:
+                stmt = (
+                    select(DataChunk.data_chunk_id, DataChunk.chunk_text, DataChunk.chunk_metadata)
+                    .where(DataChunk.chunk_project_id == project_id)
+                    .where(DataChunk.data_chunk_id > last_chunk_id)
+                    .order_by(DataChunk.data_chunk_id)
+                    .limit(page_size)
+                )
+                result = await session.execute(stmt)
+                records = result.all()
+
+            if not records:
+                break
+
+            last_chunk_id = records[-1].data_chunk_id
+            yield records
+
+            if len(records) < page_size:
+                break
     
-    async def get_total_chunks_count(self, project_id: ObjectId):
+    async def get_chunks_by_ids(self, project_id: ObjectId, chunk_ids: list):
+        """Rows (data_chunk_id, chunk_text, chunk_metadata) of the given chunks, in id order."""
+        async with self.db_client() as session:
+            stmt = (
+                select(DataChunk.data_chunk_id, DataChunk.chunk_text, DataChunk.chunk_metadata)
+                .where(DataChunk.chunk_project_id == project_id)
+                .where(DataChunk.data_chunk_id.in_(chunk_ids))
+                .order_by(DataChunk.data_chunk_id)
+            )
+            result = await session.execute(stmt)
+            records = result.all()
+        return records
+
+    async def get_existing_chunk_ids(self, project_id: ObjectId, chunk_ids: list) -> set:
+        """The ids among `chunk_ids` that are still chunks of the project."""
+        async with self.db_client() as session:
+            stmt = (
+                select(DataChunk.data_chunk_id)
+                .where(DataChunk.chunk_project_id == project_id)
+                .where(DataChunk.data_chunk_id.in_(chunk_ids))
+            )
+            result = await session.execute(stmt)
+            return set(result.scalars().all())
+
+    async def get_last_chunk_id(self, project_id: ObjectId) -> int:
+        """The highest chunk id of the project, 0 when it has none."""
+        async with self.db_client() as session:
+            stmt = select(func.max(DataChunk.data_chunk_id)).where(DataChunk.chunk_project_id == project_id)
+            result = await session.execute(stmt)
+            return result.scalar() or 0
+
+    async def get_asset_chunk_ids(self, project_id: ObjectId, asset_ids: list, after_chunk_id: int=0) -> list:
+        """Ids of the chunks of the given assets above `after_chunk_id`, in id order."""
+        async with self.db_client() as session:
+            stmt = (
+                select(DataChunk.data_chunk_id)
+                .where(DataChunk.chunk_project_id == project_id)
+                .where(DataChunk.chunk_asset_id.in_(asset_ids))
+                .where(DataChunk.data_chunk_id > after_chunk_id)
+                .order_by(DataChunk.data_chunk_id)
+            )
+            result = await session.execute(stmt)
+            return result.scalars().all()
+
+    async def delete_chunks_by_ids(self, chunk_ids: list) -> int:
+        async with self.db_client() as session:
+            stmt = delete(DataChunk).where(DataChunk.data_chunk_id.in_(chunk_ids))
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
+    async def get_total_chunks_count(self, project_id: ObjectId, after_chunk_id: int=None):
         total_count = 0
         async with self.db_client() as session:
             count_sql = select(func.count(DataChunk.data_chunk_id)).where(DataChunk.chunk_project_id == project_id)
+            if after_chunk_id:
+                count_sql = count_sql.where(DataChunk.data_chunk_id > after_chunk_id)
             records_count = await session.execute(count_sql)
             total_count = records_count.scalar()
         
@@ -0,0 +1,24 @@
+"""Add (chunk_project_id, data_chunk_id) index for keyset pagination
+
+Revision ID: 3f9c2a7d41e8
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2a7d41e8'
+down_revision = 'a1b2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # serves "WHERE chunk_project_id = ? AND data_chunk_id > ? ORDER BY data_chunk_id LIMIT ?"
+    op.create_index('ix_chunk_project_id_chunk_id', 'data_chunks', ['chunk_project_id', 'data_chunk_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_chunk_project_id_chunk_id', table_name='data_chunks')
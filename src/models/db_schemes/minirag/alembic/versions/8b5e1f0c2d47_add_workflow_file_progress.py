@@ -0,0 +1,25 @@
+"""Add per-file progress to workflow_progress
+
+Revision ID: 8b5e1f0c2d47
+Revises: 3f9c2a7d41e8
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '8b5e1f0c2d47'
+down_revision = '3f9c2a7d41e8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # {file_id: {"status": ..., "chunks_created": ...}} for workflows fanned out per file
+    op.add_column('workflow_progress', sa.Column('file_progress', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade():
+    op.drop_column('workflow_progress', 'file_progress')
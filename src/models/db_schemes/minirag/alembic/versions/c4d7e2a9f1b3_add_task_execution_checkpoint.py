@@ -0,0 +1,25 @@
+"""Add resume checkpoint to celery_task_executions
+
+Revision ID: c4d7e2a9f1b3
+Revises: 8b5e1f0c2d47
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'c4d7e2a9f1b3'
+down_revision = '8b5e1f0c2d47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # {"last_chunk_id": ..., "indexed_chunks": ...} saved by indexing tasks, read back on retry
+    op.add_column('celery_task_executions', sa.Column('checkpoint', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade():
+    op.drop_column('celery_task_executions', 'checkpoint')
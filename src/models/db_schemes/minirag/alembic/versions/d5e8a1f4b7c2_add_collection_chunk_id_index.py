@@ -0,0 +1,40 @@
+"""Add unique chunk_id index to existing pgvector collections
+
+Revision ID: d5e8a1f4b7c2
+Revises: c4d7e2a9f1b3
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd5e8a1f4b7c2'
+down_revision = 'c4d7e2a9f1b3'
+branch_labels = None
+depends_on = None
+
+
+def collection_tables():
+    # tables created by PGVectorProvider.create_collection ("collection_<size>_<project_id>")
+    result = op.get_bind().execute(sa.text(
+        "SELECT table_name FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND column_name = 'chunk_id' "
+        "AND table_name LIKE 'collection\\_%'"
+    ))
+    return [ row[0] for row in result ]
+
+
+def upgrade():
+    for table_name in collection_tables():
+        # collections written before the index may hold a chunk twice, keep its first vector
+        op.execute(
+            f'DELETE FROM {table_name} a USING {table_name} b '
+            f'WHERE a.chunk_id = b.chunk_id AND a.id > b.id'
+        )
+        op.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS {table_name}_chunk_id_idx ON {table_name} (chunk_id)')
+
+
+def downgrade():
+    for table_name in collection_tables():
+        op.execute(f'DROP INDEX IF EXISTS {table_name}_chunk_id_idx')
@@ -18,6 +18,7 @@ class CeleryTaskExecution(SQLAlchemyBase):
 
     task_args = Column(JSONB, nullable=True)
     result = Column(JSONB, nullable=True)
+    checkpoint = Column(JSONB, nullable=True)  # how far a retryable task got, e.g. last indexed chunk id
 
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -18,11 +18,11 @@ class WorkflowProgress(SQLAlchemyBase):
     workflow_id = Column(String(64), nullable=False, unique=True)  # The Celery workflow task ID
     project_id = Column(Integer, nullable=False)
     
-    # Overall status: PENDING, STARTED, CHUNKING, EMBEDDING, SUCCESS, FAILURE
+    # Overall status: PENDING, STARTED, CHUNKING, EMBEDDING, INDEXING, SUCCESS, FAILURE
     status = Column(String(32), nullable=False, default='PENDING')
     
     # Current step information
-    current_step = Column(String(64), nullable=True)  # e.g., "chunking", "embedding"
+    current_step = Column(String(64), nullable=True)  # e.g., "chunking", "embedding", "indexing"
     current_step_number = Column(Integer, nullable=False, default=0)
     total_steps = Column(Integer, nullable=False, default=2)  # chunking + embedding = 2 steps
     
@@ -35,6 +35,10 @@ class WorkflowProgress(SQLAlchemyBase):
     # Human-readable message for the UI
     message = Column(Text, nullable=True)
     
+    # Per-file chunking progress when the workflow fans out one task per file:
+    # {file_id: {"status": "PENDING" | "CHUNKING" | "SUCCESS", "chunks_created": int}}
+    file_progress = Column(JSONB, nullable=True)
+    
     # Detailed result or error information
     result = Column(JSONB, nullable=True)
     error_message = Column(Text, nullable=True)
@@ -4,11 +4,13 @@ class ProgressStatusEnum(Enum):
     # Step definitions
     STEP_CHUNKING = "chunking"
     STEP_EMBEDDING = "embedding"
+    STEP_INDEXING = "indexing"
     
     # Status definitions
     STATUS_PENDING = "PENDING"
     STATUS_STARTED = "STARTED"
     STATUS_CHUNKING = "CHUNKING"
     STATUS_EMBEDDING = "EMBEDDING"
+    STATUS_INDEXING = "INDEXING"
     STATUS_SUCCESS = "SUCCESS"
     STATUS_FAILURE = "FAILURE"
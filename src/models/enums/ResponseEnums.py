@@ -7,6 +7,9 @@ class ResponseSignal(Enum):
     FILE_SIZE_EXCEEDED = "file_size_exceeded"
     FILE_UPLOAD_SUCCESS = "file_upload_success"
     FILE_UPLOAD_FAILED = "file_upload_failed"
+    FILE_APPEND_SUCCESS = "file_append_success"
+    FILE_TAIL_MISMATCH = "file_tail_does_not_match_last_run"
+    CHUNK_RAW_LINES_UNAVAILABLE = "chunk_has_no_raw_lines_in_a_file"
     PROCESSING_SUCCESS = "processing_success"
     PROCESSING_FAILED = "processing_failed"
     NO_FILES_ERROR = "not_found_files"
@@ -17,8 +20,10 @@ class ResponseSignal(Enum):
     VECTORDB_COLLECTION_RETRIEVED = "vectordb_collection_retrieved"
     VECTORDB_SEARCH_ERROR = "vectordb_search_error"
     VECTORDB_SEARCH_SUCCESS = "vectordb_search_success"
+    VECTORDB_SEARCH_PLAN_RETRIEVED = "vectordb_search_plan_retrieved"
     RAG_ANSWER_ERROR = "rag_answer_error"
     RAG_ANSWER_SUCCESS = "rag_answer_success"
     DATA_PUSH_TASK_READY="data_push_task_ready"
     PROCESS_AND_PUSH_WORKFLOW_READY="process_and_push_workflow_ready"
+    EDA_TASK_STARTED="eda_task_started"
     
\ No newline at end of file
@@ -1,6 +1,6 @@
 from fastapi import FastAPI, APIRouter, Depends, UploadFile, status, Request
 from fastapi.concurrency import run_in_threadpool
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import os
 from helpers.config import get_settings, Settings
 from controllers import DataController, ProjectController, ProcessController, EDAController
@@ -13,9 +13,11 @@ from models.ChunkModel import ChunkModel
 from models.AssetModel import AssetModel
 from models.db_schemes import DataChunk, Asset
 from models.enums.AssetTypeEnum import AssetTypeEnum
+from stores.logparser.LogSummary import LogSummaryStream
 from controllers import NLPController
-from tasks.file_processing import process_project_files
+from tasks.file_processing import process_project_files, append_file_tail
 from tasks.process_workflow import process_and_push_workflow
+from tasks.eda import analyze_log_file
 from celery_app import celery_app
 from utils.progress_manager import ProgressManager
 
@@ -40,7 +42,8 @@ async def get_chunking_methods():
         "log_time_window": "3. log_time_window TEMPORAL SPECIALIST",
         "log_error_block": "4. log_error_block ERROR SPECIALIST",
         "log_hybrid_intelligent": "5. log_hybrid_intelligent ADVANCED CONTEXT",
-        "log_component_based": "6. log_component_based USER BEHAVIOR SPECIALIST"
+        "log_component_based": "6. log_component_based USER BEHAVIOR SPECIALIST",
+        "log_template_compressed": "7. log_template_compressed REPETITIVE TRAFFIC COMPRESSION"
     }
     
     return JSONResponse(
@@ -109,13 +112,14 @@ async def get_workflow_progress(request: Request, workflow_id: str):
     
     Returns:
         - workflow_id: The workflow identifier
-        - status: Current status (PENDING, CHUNKING, EMBEDDING, SUCCESS, FAILURE)
-        - current_step: Current processing step (chunking, embedding)
-        - current_step_number: Step number (1 for chunking, 2 for embedding)
-        - total_steps: Total number of steps (2)
+        - status: Current status (PENDING, CHUNKING, EMBEDDING, INDEXING, SUCCESS, FAILURE)
+        - current_step: Current processing step (chunking, embedding, indexing)
+        - current_step_number: Step number (1 for chunking, 2 for embedding, 3 for indexing)
+        - total_steps: Total number of steps (2, or 3 when the vector index build is deferred)
         - step_progress: Progress within current step (0-100)
         - overall_progress: Overall workflow progress (0-100)
         - message: Human-readable progress message
+        - file_progress: Per-file chunking progress (when chunking fans out per file)
         - result: Result data (on success)
         - error_message: Error details (on failure)
     """
@@ -142,6 +146,7 @@ async def get_workflow_progress(request: Request, workflow_id: str):
             "step_progress": progress.step_progress,
             "overall_progress": progress.overall_progress,
             "message": progress.message,
+            "file_progress": progress.file_progress,
             "result": progress.result,
             "error_message": progress.error_message,
             "started_at": progress.started_at.isoformat() if progress.started_at else None,
@@ -191,10 +196,19 @@ async def upload_data(request: Request, project_id: int, file: UploadFile,
         project_id=project_id
     )
 
+    # summarize the upload as it is written, instead of scanning the file again for the EDA
+    eda_stream = LogSummaryStream(
+        block_size=app_settings.EDA_BLOCK_SIZE,
+        sample_lines=app_settings.LOG_FORMAT_DETECTION_LINES,
+        line_index_interval=app_settings.EDA_LINE_INDEX_INTERVAL,
+    ) if app_settings.EDA_STREAM_ON_UPLOAD else None
+
     try:
         async with aiofiles.open(file_path, "wb") as f:
             while chunk := await file.read(app_settings.FILE_DEFAULT_CHUNK_SIZE):
                 await f.write(chunk)
+                if eda_stream is not None:
+                    await run_in_threadpool(eda_stream.feed, chunk)
     except Exception as e:
 
         logger.error(f"Error while uploading file: {e}")
@@ -211,22 +225,146 @@ async def upload_data(request: Request, project_id: int, file: UploadFile,
         db_client=request.app.db_client
     )
 
+    asset_config = {}
+    if eda_stream is not None:
+        summary = await run_in_threadpool(eda_stream.finish)
+
+        # the stream sampled the same first lines as the file detection would
+        log_format = eda_stream.log_format
+
+        eda_controller = EDAController(project_id=project_id, file_id=file_id, log_format=log_format)
+        stats = eda_controller.render(summary)
+        stat = os.stat(file_path)
+        fingerprint = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "hash": eda_stream.content_hash,
+        }
+
+        asset_config["line_index"] = eda_stream.line_index
+        if "error" not in stats:
+            asset_config["eda"] = eda_controller.cache_entry(fingerprint, stats)
+    else:
+        # sample the first lines once, every chunker and the EDA parse with this format
+        log_format = ProcessController(project_id=project_id).detect_log_format(
+            file_id=file_id,
+            sample_lines=app_settings.LOG_FORMAT_DETECTION_LINES
+        )
+
+    if log_format:
+        asset_config["log_format"] = log_format
+
     asset_resource = Asset(
         asset_project_id=project.project_id,
         asset_type=AssetTypeEnum.FILE.value,
         asset_name=file_id,
-        asset_size=os.path.getsize(file_path)
+        asset_size=os.path.getsize(file_path),
+        asset_config=asset_config or None
     )
 
     asset_record = await asset_model.create_asset(asset=asset_resource)
 
+    if app_settings.EDA_PRECOMPUTE_ON_UPLOAD and "eda" not in asset_config:
+        # the dashboard then reads the persisted result instead of scanning
+        analyze_log_file.delay(
+            project_id=str(project_id),
+            file_id=file_id,
+            log_format=log_format,
+            parallel_workers=app_settings.EDA_PARALLEL_WORKERS,
+        )
+
     return JSONResponse(
             content={
                 "signal": ResponseSignal.FILE_UPLOAD_SUCCESS.value,
                 "file_id": asset_record.asset_name,
+                "log_format": log_format,
+                "eda_ready": "eda" in asset_config,
             }
         )
 
+@data_router.post("/append/{project_id}/{file_id}")
+async def append_data(request: Request, project_id: int, file_id: str, file: UploadFile = None,
+                      chunk_size: int = None, overlap_size: int = None, chunking_method: str = None,
+                      app_settings: Settings = Depends(get_settings)):
+    """
+    Ingest what was appended to a log file since its last run.
+
+    With a `file` upload its bytes are appended to the stored file first;
+    without one, the stored file is expected to have grown in place. Only the
+    new tail is chunked and embedded (chunking parameters default to the
+    ones of the previous run).
+    """
+    asset_model = await AssetModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    asset_record = await asset_model.get_asset_record(
+        asset_project_id=project_id,
+        asset_name=file_id
+    )
+    if asset_record is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.FILE_ID_ERROR.value
+            }
+        )
+
+    if file is not None:
+        data_controller = DataController()
+        is_valid, result_signal = data_controller.validate_uploaded_file(file=file)
+        if not is_valid:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": result_signal
+                }
+            )
+
+        file_path = os.path.join(ProjectController().get_project_path(project_id=project_id), file_id)
+        try:
+            async with aiofiles.open(file_path, "ab") as f:
+                while chunk := await file.read(app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                    await f.write(chunk)
+        except Exception as e:
+
+            logger.error(f"Error while appending to file: {e}")
+
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.FILE_UPLOAD_FAILED.value
+                }
+            )
+
+    # the line index of the upload only covers the file as it was then
+    if (asset_record.asset_config or {}).get("line_index"):
+        await asset_model.update_asset_config(asset_record.asset_id, line_index=None)
+
+    task = append_file_tail.delay(
+        project_id=project_id,
+        file_id=file_id,
+        chunk_size=chunk_size,
+        overlap_size=overlap_size,
+        chunking_method=chunking_method,
+    )
+
+    if app_settings.EDA_PRECOMPUTE_ON_UPLOAD:
+        analyze_log_file.delay(
+            project_id=str(project_id),
+            file_id=file_id,
+            log_format=(asset_record.asset_config or {}).get("log_format"),
+            parallel_workers=app_settings.EDA_PARALLEL_WORKERS,
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.FILE_APPEND_SUCCESS.value,
+            "file_id": file_id,
+            "task_id": task.id
+        }
+    )
+
 @data_router.post("/process/{project_id}")
 async def process_endpoint(request: Request, project_id: int, process_request: ProcessRequest):
 
@@ -266,6 +404,8 @@ async def process_and_push_endpoint(request: Request, project_id: int, process_r
         overlap_size=overlap_size,
         do_reset=do_reset,
         chunking_method=chunking_method,
+        fan_out=process_request.fan_out,
+        streaming=process_request.streaming,
     )
 
     return JSONResponse(
@@ -275,15 +415,135 @@ async def process_and_push_endpoint(request: Request, project_id: int, process_r
         }
     )
 
+@data_router.get("/chunk-raw/{project_id}/{chunk_id}")
+async def get_chunk_raw_lines(request: Request, project_id: int, chunk_id: int,
+                              max_bytes: int = 1024 * 1024):
+    """
+    Get the raw log lines behind a chunk, e.g. a log_template_compressed chunk
+    that only renders template runs. Returns at most `max_bytes` of them.
+    Only chunks read from a .txt/.log file carry the byte range of their lines;
+    chunks of loader text (e.g. a PDF) are answered with 422.
+    """
+    chunk_model = await ChunkModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    chunk = await chunk_model.get_chunk(chunk_id=chunk_id)
+    if chunk is None or chunk.chunk_project_id != project_id:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "error": "No raw lines for this chunk",
+                "chunk_id": chunk_id
+            }
+        )
+
+    raw_range = (chunk.chunk_metadata or {}).get("raw_range")
+    if not raw_range:
+        return JSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content={
+                "signal": ResponseSignal.CHUNK_RAW_LINES_UNAVAILABLE.value,
+                "chunk_id": chunk_id
+            }
+        )
+
+    asset_model = await AssetModel.create_instance(
+        db_client=request.app.db_client
+    )
+    asset = await asset_model.get_asset_by_id(asset_id=chunk.chunk_asset_id)
+
+    process_controller = ProcessController(project_id=project_id)
+    start, end = raw_range
+    raw_text = await run_in_threadpool(process_controller.read_file_range,
+                                       asset.asset_name, start, end, max_bytes)
+    if raw_text is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.FILE_ID_ERROR.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "chunk_id": chunk_id,
+            "file_id": asset.asset_name,
+            "raw_range": raw_range,
+            "truncated": end - start > max_bytes,
+            "lines": raw_text.splitlines()
+        }
+    )
+
 @data_router.get("/eda/{project_id}/{file_id}")
-async def get_eda_stats(project_id: str, file_id: str):
+async def get_eda_stats(request: Request, project_id: str, file_id: str,
+                        parallel_workers: int = None, background: bool = False,
+                        app_settings: Settings = Depends(get_settings)):
     """
     Get Exploratory Data Analysis statistics for a specific log file.
+
+    Results are persisted in the asset config with the size, mtime and
+    content hash of the file they describe, and served from there (with an
+    ETag, honoring If-None-Match) as long as the file still matches; uploads
+    precompute them.
+
+    Otherwise the file is scanned: `parallel_workers` (default
+    EDA_PARALLEL_WORKERS) > 1 scans newline-aligned byte ranges of the file
+    in parallel and merges their aggregates. With `background`, the scan runs
+    as a Celery task instead, its id is returned and /task-status/{task_id}
+    reports its progress and then the statistics.
     """
     try:
         logger.info(f"Starting EDA for project {project_id}, file {file_id}")
-        eda_controller = EDAController(project_id=project_id, file_id=file_id)
-        stats = await run_in_threadpool(eda_controller.analyze_log)
+
+        asset_model = await AssetModel.create_instance(
+            db_client=request.app.db_client
+        )
+        asset_record = await asset_model.get_asset_record(
+            asset_project_id=int(project_id),
+            asset_name=file_id
+        ) if project_id.isdigit() else None
+        asset_config = (asset_record.asset_config or {}) if asset_record else {}
+        log_format = asset_config.get("log_format")
+
+        eda_controller = EDAController(project_id=project_id, file_id=file_id, log_format=log_format)
+
+        cache = asset_config.get("eda")
+        fingerprint = await run_in_threadpool(eda_controller.validate_cache, cache) if cache else None
+        if fingerprint is not None:
+            if fingerprint != cache["fingerprint"]:
+                await asset_model.update_asset_config(asset_record.asset_id,
+                                                      eda={ **cache, "fingerprint": fingerprint })
+
+            etag = cache["etag"]
+            if_none_match = request.headers.get("if-none-match", "")
+            if if_none_match.strip() == "*" or etag in [
+                tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+            ]:
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+            return JSONResponse(content=cache["result"], headers={"ETag": etag})
+
+        if parallel_workers is None:
+            parallel_workers = app_settings.EDA_PARALLEL_WORKERS
+
+        if background:
+            task = analyze_log_file.delay(
+                project_id=project_id,
+                file_id=file_id,
+                log_format=log_format,
+                parallel_workers=parallel_workers,
+            )
+            return JSONResponse(
+                content={
+                    "signal": ResponseSignal.EDA_TASK_STARTED.value,
+                    "file_id": file_id,
+                    "task_id": task.id
+                }
+            )
+
+        fingerprint = await run_in_threadpool(eda_controller.fingerprint) if asset_record else None
+        stats = await run_in_threadpool(eda_controller.analyze_log, parallel_workers)
         
         if "error" in stats:
             logger.error(f"EDA failed: {stats['error']}")
@@ -291,8 +551,14 @@ async def get_eda_stats(project_id: str, file_id: str):
                 status_code=400,
                 content=stats
             )
-            
-        return JSONResponse(content=stats)
+
+        if fingerprint is None:
+            return JSONResponse(content=stats)
+
+        cache = eda_controller.cache_entry(fingerprint, stats)
+        await asset_model.update_asset_config(asset_record.asset_id, eda=cache)
+
+        return JSONResponse(content=stats, headers={"ETag": cache["etag"]})
     except Exception as e:
         logger.error(f"Error in EDA endpoint: {e}")
         return JSONResponse(
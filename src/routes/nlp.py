@@ -49,6 +49,8 @@ async def get_project_index_info(request: Request, project_id: int):
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        query_embedding_cache=request.app.query_embedding_cache,
+        retrieval_cache=request.app.retrieval_cache,
     )
 
     collection_info = await nlp_controller.get_vector_db_collection_info(project=project)
@@ -76,10 +78,13 @@ async def search_index(request: Request, project_id: int, search_request: Search
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        query_embedding_cache=request.app.query_embedding_cache,
+        retrieval_cache=request.app.retrieval_cache,
     )
 
     results = await nlp_controller.search_vector_db_collection(
-        project=project, text=search_request.text, limit=search_request.limit
+        project=project, text=search_request.text, limit=search_request.limit,
+        ef_search=search_request.ef_search, probes=search_request.probes,
     )
 
     if not results:
@@ -97,6 +102,46 @@ async def search_index(request: Request, project_id: int, search_request: Search
         }
     )
 
+@nlp_router.post("/index/search/explain/{project_id}")
+async def explain_search_index(request: Request, project_id: int, search_request: SearchRequest):
+    
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        query_embedding_cache=request.app.query_embedding_cache,
+        retrieval_cache=request.app.retrieval_cache,
+    )
+
+    search_plan = await nlp_controller.explain_vector_db_search(
+        project=project, text=search_request.text, limit=search_request.limit,
+        ef_search=search_request.ef_search, probes=search_request.probes,
+    )
+
+    if not search_plan:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value
+                }
+            )
+    
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_PLAN_RETRIEVED.value,
+            "search_plan": search_plan
+        }
+    )
+
 @nlp_router.post("/index/answer/{project_id}")
 async def answer_rag(request: Request, project_id: int, search_request: SearchRequest):
     
@@ -113,6 +158,8 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        query_embedding_cache=request.app.query_embedding_cache,
+        retrieval_cache=request.app.retrieval_cache,
     )
 
     answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
@@ -120,6 +167,8 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
         query=search_request.text,
         limit=search_request.limit,
         chat_history=search_request.chat_history,
+        ef_search=search_request.ef_search,
+        probes=search_request.probes,
     )
 
     if not answer:
@@ -6,4 +6,6 @@ class ProcessRequest(BaseModel):
     chunk_size: Optional[int] = 100
     overlap_size: Optional[int] = 20
     do_reset: Optional[int] = 0
-    chunking_method: Optional[str] = "simple"
\ No newline at end of file
+    chunking_method: Optional[str] = "simple"
+    fan_out: Optional[bool] = None
+    streaming: Optional[bool] = None
\ No newline at end of file
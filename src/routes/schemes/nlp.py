@@ -7,4 +7,6 @@ class PushRequest(BaseModel):
 class SearchRequest(BaseModel):
     text: str
     limit: Optional[int] = 5
-    chat_history: Optional[list] = []
\ No newline at end of file
+    chat_history: Optional[list] = []
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
\ No newline at end of file
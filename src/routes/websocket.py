@@ -33,8 +33,8 @@ async def websocket_progress_endpoint(
         "type": "progress_update",
         "workflow_id": "...",
         "project_id": 123,
-        "status": "CHUNKING|EMBEDDING|SUCCESS|FAILURE",
-        "current_step": "chunking|embedding",
+        "status": "CHUNKING|EMBEDDING|INDEXING|SUCCESS|FAILURE",
+        "current_step": "chunking|embedding|indexing",
         "current_step_number": 1,
         "total_steps": 2,
         "step_progress": 0-100,
@@ -104,6 +104,7 @@ async def websocket_progress_endpoint(
                             "step_progress": progress.step_progress,
                             "overall_progress": progress.overall_progress,
                             "message": progress.message,
+                            "file_progress": progress.file_progress,
                             "result": progress.result,
                             "error_message": progress.error_message
                         }
@@ -0,0 +1,108 @@
+from array import array
+from typing import Callable, List, Optional
+from utils.metrics import EMBEDDING_CACHE_HITS, EMBEDDING_CACHE_MISSES
+import diskcache
+import hashlib
+import logging
+
+
+class EmbeddingCache:
+    """
+    Content-addressed, on-disk embedding store shared by every process on the host.
+
+    Entries are keyed by (model id, embedding size, document type, sha256 of the
+    text actually sent to the provider), so re-indexing unchanged chunks or
+    embedding the same text twice never calls the provider again. The store is
+    size-bounded and evicts least-recently-used vectors.
+    """
+
+    def __init__(self, directory: str, size_limit_mb: int = 2048):
+        self.cache = diskcache.Cache(
+            directory=directory,
+            size_limit=size_limit_mb * 1024 * 1024,
+            eviction_policy="least-recently-used",
+        )
+
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(__name__)
+
+    def make_key(self, text: str, model_id: str, embedding_size: int, document_type: str = None) -> str:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model_id}:{embedding_size}:{document_type}:{text_hash}"
+
+    def get_many(self, texts: List[str], model_id: str, embedding_size: int,
+                 document_type: str = None) -> List[Optional[List[float]]]:
+        """Return the cached vector for each text, None where it is missing."""
+        keys = [ self.make_key(t, model_id, embedding_size, document_type) for t in texts ]
+
+        vectors = []
+        with self.cache.transact():
+            for key in keys:
+                vectors.append(self.decode(self.cache.get(key)))
+
+        hits = sum(1 for v in vectors if v is not None)
+        self.hits += hits
+        self.misses += len(vectors) - hits
+        EMBEDDING_CACHE_HITS.labels(model=model_id).inc(hits)
+        EMBEDDING_CACHE_MISSES.labels(model=model_id).inc(len(vectors) - hits)
+
+        return vectors
+
+    def put_many(self, texts: List[str], vectors: List[List[float]], model_id: str,
+                 embedding_size: int, document_type: str = None):
+        with self.cache.transact():
+            for text, vector in zip(texts, vectors):
+                key = self.make_key(text, model_id, embedding_size, document_type)
+                self.cache.set(key, self.encode(vector))
+
+    def embed(self, texts: List[str], embed_func: Callable[[List[str]], List[List[float]]],
+              model_id: str, embedding_size: int, document_type: str = None):
+        """
+        Serve texts from the cache and call `embed_func` only for the misses,
+        in one request, preserving the input order. Returns None if it fails.
+        """
+        vectors = self.get_many(texts, model_id, embedding_size, document_type)
+
+        missing_idx = [ i for i, v in enumerate(vectors) if v is None ]
+        if missing_idx:
+            # identical texts in one batch are embedded once
+            missing_texts = list(dict.fromkeys(texts[i] for i in missing_idx))
+
+            new_vectors = embed_func(missing_texts)
+            if not new_vectors or len(new_vectors) != len(missing_texts):
+                return None
+
+            self.put_many(missing_texts, new_vectors, model_id, embedding_size, document_type)
+
+            embedded = dict(zip(missing_texts, new_vectors))
+            for i in missing_idx:
+                vectors[i] = embedded[texts[i]]
+
+        return vectors
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "size_bytes": self.cache.volume(),
+        }
+
+    def close(self):
+        self.cache.close()
+
+    @staticmethod
+    def encode(vector: List[float]) -> bytes:
+        # float32 is what the vector stores keep anyway, half the size of pickled floats
+        return array("f", vector).tobytes()
+
+    @staticmethod
+    def decode(data: bytes) -> Optional[List[float]]:
+        if data is None:
+            return None
+
+        vector = array("f")
+        vector.frombytes(data)
+        return vector.tolist()
@@ -1,10 +1,26 @@
 
 from .LLMEnums import LLMEnums
 from .providers import OpenAIProvider, CoHereProvider
+from .EmbeddingCache import EmbeddingCache
+from controllers.BaseController import BaseController
 
 class LLMProviderFactory:
     def __init__(self, config: dict):
         self.config = config
+        self.embedding_cache = None
+
+    def get_embedding_cache(self):
+        if not self.config.EMBEDDING_CACHE_ENABLED:
+            return None
+
+        # one store per factory, shared by the providers it creates
+        if self.embedding_cache is None:
+            self.embedding_cache = EmbeddingCache(
+                directory=BaseController().get_database_path(db_name=self.config.EMBEDDING_CACHE_PATH),
+                size_limit_mb=self.config.EMBEDDING_CACHE_SIZE_LIMIT_MB,
+            )
+
+        return self.embedding_cache
 
     def create(self, provider: str):
         if provider == LLMEnums.OPENAI.value:
@@ -13,7 +29,10 @@ class LLMProviderFactory:
                 api_url = self.config.OPENAI_API_URL,
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                embedding_concurrency=self.config.OPENAI_EMBEDDING_CONCURRENCY,
+                embedding_batch_size=self.config.OPENAI_EMBEDDING_BATCH_SIZE,
+                embedding_cache=self.get_embedding_cache(),
             )
 
         if provider == LLMEnums.COHERE.value:
@@ -21,7 +40,10 @@ class LLMProviderFactory:
                 api_key = self.config.COHERE_API_KEY,
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                embedding_concurrency=self.config.COHERE_EMBEDDING_CONCURRENCY,
+                embedding_batch_size=self.config.COHERE_EMBEDDING_BATCH_SIZE,
+                embedding_cache=self.get_embedding_cache(),
             )
 
         return None
\ No newline at end of file
@@ -1,4 +1,5 @@
 from ..LLMInterface import LLMInterface
+from ..EmbeddingCache import EmbeddingCache
 from ..LLMEnums import CoHereEnums, DocumentTypeEnum
 import cohere
 import logging
@@ -9,7 +10,10 @@ class CoHereProvider(LLMInterface):
     def __init__(self, api_key: str,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       embedding_concurrency: int=4,
+                       embedding_batch_size: int=96,
+                       embedding_cache: EmbeddingCache=None):
         
         self.api_key = api_key
 
@@ -22,6 +26,11 @@ class CoHereProvider(LLMInterface):
         self.embedding_model_id = None
         self.embedding_size = None
 
+        # used by the indexing pipeline: in-flight embedding requests and texts per request
+        self.embedding_concurrency = embedding_concurrency
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_cache = embedding_cache
+
         self.client = cohere.Client(api_key=self.api_key)
 
         self.enums = CoHereEnums
@@ -80,9 +89,23 @@ class CoHereProvider(LLMInterface):
         if document_type == DocumentTypeEnum.QUERY:
             input_type = CoHereEnums.QUERY
 
+        text = [self.process_text(t) for t in text]
+
+        if self.embedding_cache:
+            return self.embedding_cache.embed(
+                texts=text,
+                embed_func=lambda texts: self.request_embeddings(texts, input_type=input_type),
+                model_id=self.embedding_model_id,
+                embedding_size=self.embedding_size,
+                document_type=input_type.value,
+            )
+
+        return self.request_embeddings(text, input_type=input_type)
+
+    def request_embeddings(self, text: List[str], input_type: CoHereEnums):
         response = self.client.embed(
             model = self.embedding_model_id,
-            texts = [self.process_text(t) for t in text],
+            texts = text,
             input_type = input_type,
             embedding_types=['float'],
         )
@@ -1,4 +1,5 @@
 from ..LLMInterface import LLMInterface
+from ..EmbeddingCache import EmbeddingCache
 from ..LLMEnums import OpenAIEnums
 from openai import OpenAI
 import logging
@@ -9,7 +10,10 @@ class OpenAIProvider(LLMInterface):
     def __init__(self, api_key: str, api_url: str=None,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       embedding_concurrency: int=4,
+                       embedding_batch_size: int=256,
+                       embedding_cache: EmbeddingCache=None):
         
         self.api_key = api_key
         self.api_url = api_url
@@ -23,6 +27,11 @@ class OpenAIProvider(LLMInterface):
         self.embedding_model_id = None
         self.embedding_size = None
 
+        # used by the indexing pipeline: in-flight embedding requests and texts per request
+        self.embedding_concurrency = embedding_concurrency
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_cache = embedding_cache
+
         self.client = OpenAI(
             api_key = self.api_key,
             base_url = self.api_url if self.api_url and len(self.api_url) else None
@@ -85,7 +94,19 @@ class OpenAIProvider(LLMInterface):
         if not self.embedding_model_id:
             self.logger.error("Embedding model for OpenAI was not set")
             return None
-        
+
+        if self.embedding_cache:
+            return self.embedding_cache.embed(
+                texts=text,
+                embed_func=self.request_embeddings,
+                model_id=self.embedding_model_id,
+                embedding_size=self.embedding_size,
+                document_type=getattr(document_type, "value", document_type),
+            )
+
+        return self.request_embeddings(text)
+
+    def request_embeddings(self, text: List[str]):
         response = self.client.embeddings.create(
             model = self.embedding_model_id,
             input = text,
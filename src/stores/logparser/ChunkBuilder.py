@@ -0,0 +1,137 @@
+from .ColumnarLog import ColumnarLog, MISSING
+from collections import deque
+from typing import Callable
+
+
+class ChunkBuilder:
+    """
+    The chunk a chunker is building: a run of consecutive rows [start, stop)
+    of a ColumnarLog, with running aggregates.
+
+    add() appends the row right after the chunk and evict() drops its first
+    row, both in O(1) (amortized for the time bounds, kept in monotonic
+    queues), so a chunker never rescans its chunk to measure it: size as
+    joined text, error count, rows per IP, status histogram and first/last
+    timestamp are always current. carry_over() keeps the last rows as the
+    overlap of the next chunk; reset() starts an empty one after the chunk.
+
+    Rows are read from the log when they are added and evicted, so a chunker
+    releases the log up to `start` only after evicting.
+    """
+
+    def __init__(self, log: ColumnarLog, is_error: Callable[[int], bool] = None):
+        self.log = log
+        self.is_error = is_error or log.is_error
+        self.start = self.stop = log.first_row
+        self.clear()
+
+    def clear(self):
+        self.size = 0
+        self.error_count = 0
+        self.ip_counts = {}         # ip id -> rows, IP-less rows are not counted
+        self.status_counts = {}     # status -> rows, status-less rows are not counted
+        self._min_ts = deque()      # (row, timestamp), timestamps increasing
+        self._max_ts = deque()      # (row, timestamp), timestamps decreasing
+
+    def __len__(self):
+        return self.stop - self.start
+
+    @property
+    def unique_ips(self) -> int:
+        return len(self.ip_counts)
+
+    @property
+    def first_timestamp(self) -> int:
+        """Earliest timestamp of the chunk, MISSING when no row has one."""
+        return self._min_ts[0][1] if self._min_ts else MISSING
+
+    @property
+    def last_timestamp(self) -> int:
+        return self._max_ts[0][1] if self._max_ts else MISSING
+
+    def add(self, idx: int):
+        """Append row idx, which must be `stop` unless the chunk is empty."""
+        if self.start == self.stop:
+            self.start = idx
+        elif idx != self.stop:
+            raise ValueError(f"Row {idx} does not follow the chunk ending at {self.stop}")
+
+        log = self.log
+        self.size += log.line_size(idx)
+        if self.is_error(idx):
+            self.error_count += 1
+
+        ip_id = log.ip_key(idx)
+        if ip_id != MISSING:
+            self.ip_counts[ip_id] = self.ip_counts.get(ip_id, 0) + 1
+
+        status = log.status_code(idx)
+        if status:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+        ts = log.timestamp[idx - log.first_row]
+        if ts != MISSING:
+            while self._min_ts and self._min_ts[-1][1] >= ts:
+                self._min_ts.pop()
+            self._min_ts.append((idx, ts))
+            while self._max_ts and self._max_ts[-1][1] <= ts:
+                self._max_ts.pop()
+            self._max_ts.append((idx, ts))
+
+        self.stop = idx + 1
+
+    def evict(self):
+        """Drop the first row of the chunk."""
+        idx = self.start
+        log = self.log
+        self.size -= log.line_size(idx)
+        if self.is_error(idx):
+            self.error_count -= 1
+
+        ip_id = log.ip_key(idx)
+        if ip_id != MISSING:
+            self._decrement(self.ip_counts, ip_id)
+
+        status = log.status_code(idx)
+        if status:
+            self._decrement(self.status_counts, status)
+
+        if self._min_ts and self._min_ts[0][0] == idx:
+            self._min_ts.popleft()
+        if self._max_ts and self._max_ts[0][0] == idx:
+            self._max_ts.popleft()
+
+        self.start += 1
+
+    def carry_over(self, count: int):
+        """Keep only the last `count` rows, the overlap the next chunk starts with."""
+        keep_from = max(self.start, self.stop - count)
+
+        # evict the dropped rows, or re-add the kept ones when they are fewer
+        if keep_from - self.start <= self.stop - keep_from:
+            while self.start < keep_from:
+                self.evict()
+        else:
+            stop = self.stop
+            self.reset()
+            for idx in range(keep_from, stop):
+                self.add(idx)
+
+    def reset(self):
+        """Start an empty chunk right after this one."""
+        self.start = self.stop
+        self.clear()
+
+    def text(self) -> str:
+        return self.log.join_lines(self.start, self.stop)
+
+    def file_range(self):
+        return list(self.log.file_range(self.start, self.stop))
+
+    @staticmethod
+    def _decrement(counts: dict, key):
+        count = counts[key] - 1
+        if count:
+            counts[key] = count
+        else:
+            del counts[key]
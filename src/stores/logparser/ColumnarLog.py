@@ -0,0 +1,154 @@
+from array import array
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional
+
+# sentinel for absent values in the integer columns
+MISSING = -1
+
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+               "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+ERROR_STATUSES = frozenset([400, 401, 403, 404, 405, 500, 501, 502, 503, 504])
+
+COLUMNS = ("line_start", "line_end", "line_chars", "timestamp", "tz_offset",
+           "status", "ip_id", "method_id", "url_id", "size")
+
+
+class ColumnarLog:
+    """
+    A parsed log file: the original bytes plus one array-backed column per field.
+
+    Row i is the i-th non-blank line. Its stripped text is
+    buffer[line_start[i]:line_end[i]], and every other field is a plain integer:
+    epoch seconds, UTC offset, status code, and ids into the ips/methods/urls
+    vocabularies. Chunkers read the columns instead of re-running regexes.
+
+    Rows are addressed by their absolute index in the file. A log may only
+    hold a window of them (see StreamingColumnarLog), starting at first_row.
+    """
+
+    def __init__(self, buffer: bytes, encoding: str = "utf-8"):
+        self.buffer = buffer
+        self.encoding = encoding
+        self.first_row = 0
+
+        self.from_file = False          # buffer holds the bytes of a file, not joined loader text
+        self.base_offset = 0            # file offset of buffer[0]
+
+        self.line_start = array("q")
+        self.line_end = array("q")
+        self.line_chars = array("i")    # stripped length in characters, as the chunk text counts it
+        self.timestamp = array("q")     # epoch seconds (UTC), MISSING when the line has none
+        self.tz_offset = array("i")     # seconds east of UTC as written in the line
+        self.status = array("h")        # 0 when the line has no status code
+        self.ip_id = array("i")
+        self.method_id = array("i")
+        self.url_id = array("i")
+        self.size = array("q")          # response bytes, MISSING when the line has none
+
+        self.ips: List[str] = []
+        self.methods: List[str] = []
+        self.urls: List[str] = []
+        self.vocab_index = None         # filled by the parser
+
+    def __len__(self):
+        # rows seen so far, including the ones released from a window
+        return self.first_row + len(self.line_start)
+
+    def rows(self) -> Iterator[int]:
+        """Iterate over the row indices; a row is always followed by the next one when it exists."""
+        return iter(range(self.first_row, len(self)))
+
+    def release(self, row: int):
+        """Tell the log rows before `row` are no longer needed. Nothing to free when fully loaded."""
+        pass
+
+    def line(self, idx: int) -> str:
+        idx -= self.first_row
+        return self.buffer[self.line_start[idx]:self.line_end[idx]].decode(self.encoding, errors="replace")
+
+    def join_lines(self, start: int, stop: int) -> str:
+        return "\n".join(self.line(i) for i in range(start, stop))
+
+    def line_size(self, idx: int) -> int:
+        # stripped length in characters plus the newline it is joined with
+        return self.line_chars[idx - self.first_row] + 1
+
+    def range_size(self, start: int, stop: int) -> int:
+        return sum(self.line_size(i) for i in range(start, stop))
+
+    def file_offset(self, idx: int) -> int:
+        """File offset where row idx starts."""
+        return self.base_offset + self.line_start[idx - self.first_row]
+
+    def file_range(self, start: int, stop: int):
+        """(first byte, end byte) in the file of rows start..stop-1."""
+        return self.file_offset(start), self.base_offset + self.line_end[stop - 1 - self.first_row]
+
+    def local_hour(self, idx: int) -> int:
+        """Hours since epoch in the line's own timezone, MISSING without a timestamp."""
+        idx -= self.first_row
+        ts = self.timestamp[idx]
+        if ts == MISSING:
+            return MISSING
+        return (ts + self.tz_offset[idx]) // 3600
+
+    @staticmethod
+    def format_time_window(local_hour: int) -> Optional[str]:
+        """Render an hour bucket the way the chunk metadata names it: 2019-Jan-23_03:00."""
+        if local_hour == MISSING:
+            return None
+
+        dt = datetime.fromtimestamp(local_hour * 3600, tz=timezone.utc)
+        return f"{dt.year}-{MONTH_NAMES[dt.month - 1]}-{dt.day:02d}_{dt.hour:02d}:00"
+
+    def format_timestamp(self, idx: int) -> Optional[str]:
+        """The row's timestamp in its own timezone: 2019-01-23 03:56:14, None without one."""
+        ts = self.timestamp[idx - self.first_row]
+        if ts == MISSING:
+            return None
+
+        dt = datetime.fromtimestamp(ts + self.tz_offset[idx - self.first_row], tz=timezone.utc)
+        return dt.strftime("%Y-%m-%d %H:%M:%S")
+
+    def status_code(self, idx: int) -> int:
+        return self.status[idx - self.first_row]
+
+    def status_class(self, idx: int) -> int:
+        """2..5 for 2xx..5xx, 0 for anything else."""
+        status_class = self.status_code(idx) // 100
+        return status_class if 2 <= status_class <= 5 else 0
+
+    def is_error(self, idx: int) -> bool:
+        # the parsed status only: searching the line for " 501 " also matched
+        # response sizes and other numbers as error statuses
+        return self.status_code(idx) in ERROR_STATUSES
+
+    def response_size(self, idx: int) -> int:
+        return self.size[idx - self.first_row]
+
+    def ip_key(self, idx: int) -> int:
+        return self.ip_id[idx - self.first_row]
+
+    def method_key(self, idx: int) -> int:
+        return self.method_id[idx - self.first_row]
+
+    def url_key(self, idx: int) -> int:
+        return self.url_id[idx - self.first_row]
+
+    def ip(self, idx: int) -> Optional[str]:
+        ip_id = self.ip_key(idx)
+        return self.ips[ip_id] if ip_id != MISSING else None
+
+    def method(self, idx: int) -> Optional[str]:
+        method_id = self.method_key(idx)
+        return self.methods[method_id] if method_id != MISSING else None
+
+    def url(self, idx: int) -> Optional[str]:
+        url_id = self.url_key(idx)
+        return self.urls[url_id] if url_id != MISSING else None
+
+    def search(self, pattern, idx: int):
+        """Run a compiled bytes pattern over one line without copying it."""
+        idx -= self.first_row
+        return pattern.search(self.buffer, self.line_start[idx], self.line_end[idx])
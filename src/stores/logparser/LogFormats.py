@@ -0,0 +1,254 @@
+from .ColumnarLog import MISSING
+from dataclasses import dataclass
+from datetime import datetime, date
+from typing import Callable, Dict, Iterable, Optional, Tuple
+import json
+import re
+
+HTTP_METHODS = rb'GET|POST|PUT|DELETE|PATCH|HEAD|OPTIONS|CONNECT|TRACE'
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# A parsed line, whatever the format it was written in:
+# (epoch seconds UTC or MISSING, UTC offset in seconds, status or 0,
+#  ip, method, url as bytes or None, response size in bytes or MISSING)
+Record = Tuple[int, int, int, Optional[bytes], Optional[bytes], Optional[bytes], int]
+
+
+@dataclass(frozen=True)
+class LogFormat:
+    """
+    A log layout the parser knows how to read in one pass.
+
+    `parse_line(parser, line)` gets a stripped, non-blank line as bytes and
+    returns its normalized Record, or None when the line is not in this
+    format (the parser then falls back to field by field searches). The
+    parser is passed for its cached date conversions.
+    """
+    name: str
+    description: str
+    parse_line: Callable[..., Optional[Record]]
+
+
+LOG_FORMATS: Dict[str, LogFormat] = {}
+
+DEFAULT_LOG_FORMAT = "combined"
+
+
+def register_log_format(log_format: LogFormat) -> LogFormat:
+    LOG_FORMATS[log_format.name] = log_format
+    return log_format
+
+
+def get_log_format(name: str = None) -> LogFormat:
+    """The registered format called `name`, the default one for None or an unknown name."""
+    return LOG_FORMATS.get(name) or LOG_FORMATS[DEFAULT_LOG_FORMAT]
+
+
+def detect_log_format(lines: Iterable[bytes], parser) -> str:
+    """
+    Name of the format reading the most of `lines` with a timestamp.
+
+    Ties go to the format registered first; the default format is returned
+    when none of them reads a single line.
+    """
+    lines = [ line.strip() for line in lines ]
+    lines = [ line for line in lines if line ]
+
+    best_name, best_score = DEFAULT_LOG_FORMAT, 0
+    for name, log_format in LOG_FORMATS.items():
+        score = 0
+        for line in lines:
+            try:
+                record = log_format.parse_line(parser, line)
+            except ValueError:
+                record = None
+            if record is not None and record[0] != MISSING:
+                score += 1
+
+        if score > best_score:
+            best_name, best_score = name, score
+
+    return best_name
+
+
+def detect_file_log_format(file_path: str, parser, sample_lines: int = 200,
+                           max_bytes: int = 1024 * 1024) -> str:
+    """Detect the format of a log file from its first `sample_lines` lines."""
+    with open(file_path, "rb") as file:
+        data = file.read(max_bytes)
+
+    lines = data.split(b"\n", sample_lines)[:sample_lines]
+    return detect_log_format(lines, parser)
+
+
+def _size(value: Optional[bytes]) -> int:
+    return int(value) if value and value.isdigit() else MISSING
+
+
+# Apache / nginx common and combined, nginx variants with trailing fields
+# (request_time, upstream times...) included since only the prefix is matched
+COMBINED_PATTERN = re.compile(
+    rb'(\d+\.\d+\.\d+\.\d+) \S+ \S+ '
+    rb'\[(\d{2})/(\w{3})/(\d{4}):(\d{2}):(\d{2}):(\d{2})(?: ([+-])(\d{2})(\d{2}))?\] '
+    rb'"(' + HTTP_METHODS + rb') ([^ ]+)[^"]*" (\d{3}) (\d+|-)?'
+)
+
+
+def parse_combined_line(parser, line: bytes) -> Optional[Record]:
+    match = COMBINED_PATTERN.match(line)
+    if match is None:
+        return None
+
+    (ip, day, month, year, hour, minute, second,
+     tz_sign, tz_hours, tz_minutes, method, url, code, size) = match.groups()
+
+    ts, offset = parser.to_epoch(day, month, year, hour, minute, second,
+                                 tz_sign, tz_hours, tz_minutes)
+    return ts, offset, int(code), ip, method, url, _size(size)
+
+
+# AWS classic ELB and ALB access logs (ALB lines start with the request type)
+ELB_PATTERN = re.compile(
+    rb'(?:[a-z0-9]+ )?(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.\d+)?Z '
+    rb'\S+ (\d+\.\d+\.\d+\.\d+):\d+ \S+ \S+ \S+ \S+ (\d{3}|-) \S+ \d+ (\d+) '
+    rb'"(' + HTTP_METHODS + rb') (?:[a-z]+://[^/ ]+)?([^ ]*)'
+)
+
+
+def parse_elb_line(parser, line: bytes) -> Optional[Record]:
+    match = ELB_PATTERN.match(line)
+    if match is None:
+        return None
+
+    year, month, day, hour, minute, second, ip, code, size, method, url = match.groups()
+
+    ts = parser.to_utc_epoch(year, month, day, hour, minute, second)
+    return ts, 0, int(code) if code != b"-" else 0, ip, method, url or b"/", _size(size)
+
+
+# JSON lines, the usual key names of nginx/Apache JSON log_format setups and shippers
+JSON_TIME_KEYS = ("time", "timestamp", "@timestamp", "time_local", "time_iso8601", "ts", "date")
+JSON_IP_KEYS = ("remote_addr", "client_ip", "clientip", "ip", "client", "remote_ip")
+JSON_METHOD_KEYS = ("method", "request_method", "verb", "http_method")
+JSON_URL_KEYS = ("uri", "request_uri", "url", "path")
+JSON_STATUS_KEYS = ("status", "status_code", "response", "response_code")
+JSON_SIZE_KEYS = ("body_bytes_sent", "bytes_sent", "bytes", "size", "response_size")
+
+APACHE_TIME_PATTERN = re.compile(
+    rb'\[?(\d{2})/(\w{3})/(\d{4}):(\d{2}):(\d{2}):(\d{2})(?: ([+-])(\d{2})(\d{2}))?'
+)
+
+
+def _first(record: dict, keys):
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, "", "-"):
+            return value
+    return None
+
+
+def _to_bytes(value) -> Optional[bytes]:
+    return str(value).encode() if value is not None else None
+
+
+def _json_time(parser, value):
+    if isinstance(value, (int, float)):
+        # epoch seconds, or milliseconds from most shippers
+        return int(value / 1000 if value > 1e11 else value), 0
+
+    value = str(value)
+    match = APACHE_TIME_PATTERN.match(value.encode())
+    if match:
+        return parser.to_epoch(*match.groups())
+
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return MISSING, 0
+
+    offset = dt.utcoffset()
+    offset = int(offset.total_seconds()) if offset is not None else 0
+    naive = dt.replace(tzinfo=None)
+    local_seconds = (naive.date().toordinal() - EPOCH_ORDINAL) * 86400 \
+        + naive.hour * 3600 + naive.minute * 60 + naive.second
+    return local_seconds - offset, offset
+
+
+def parse_json_line(parser, line: bytes) -> Optional[Record]:
+    if not line.startswith(b"{"):
+        return None
+
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict):
+        return None
+
+    time_value = _first(record, JSON_TIME_KEYS)
+    ts, offset = _json_time(parser, time_value) if time_value is not None else (MISSING, 0)
+
+    method, url = _first(record, JSON_METHOD_KEYS), _first(record, JSON_URL_KEYS)
+    request = record.get("request")
+    if isinstance(request, str) and (method is None or url is None):
+        # "GET /index.html HTTP/1.1"
+        parts = request.split(" ")
+        if len(parts) >= 2:
+            method, url = method or parts[0], url or parts[1]
+
+    code = _first(record, JSON_STATUS_KEYS)
+    size = _first(record, JSON_SIZE_KEYS)
+
+    return (
+        ts, offset,
+        int(code) if str(code).isdigit() else 0,
+        _to_bytes(_first(record, JSON_IP_KEYS)),
+        _to_bytes(method),
+        _to_bytes(url),
+        int(size) if str(size).isdigit() else MISSING,
+    )
+
+
+# RFC 3164 syslog: "Jan 23 03:56:14 host program[pid]: message", no year and no
+# timezone in the stamp, so the current year and UTC are assumed
+SYSLOG_PATTERN = re.compile(
+    rb'(\w{3}) ([ \d]\d) (\d{2}):(\d{2}):(\d{2}) \S+ [^:\[\s]+(?:\[\d+\])?: '
+)
+SYSLOG_IP_PATTERN = re.compile(rb'\b(\d+\.\d+\.\d+\.\d+)\b')
+
+
+def parse_syslog_line(parser, line: bytes) -> Optional[Record]:
+    match = SYSLOG_PATTERN.match(line)
+    if match is None:
+        return None
+
+    month, day, hour, minute, second = match.groups()
+    ts, offset = parser.to_epoch(day.strip().zfill(2), month, parser.current_year,
+                                 hour, minute, second)
+
+    # the peer of sshd/postfix/... messages, if the message names one
+    ip = SYSLOG_IP_PATTERN.search(line, match.end())
+    return ts, offset, 0, ip.group(1) if ip else None, None, None, MISSING
+
+
+register_log_format(LogFormat(
+    name="combined",
+    description="Apache/nginx common and combined access logs",
+    parse_line=parse_combined_line,
+))
+register_log_format(LogFormat(
+    name="elb",
+    description="AWS classic ELB and ALB access logs",
+    parse_line=parse_elb_line,
+))
+register_log_format(LogFormat(
+    name="json",
+    description="JSON lines access logs (nginx/Apache JSON log_format, log shippers)",
+    parse_line=parse_json_line,
+))
+register_log_format(LogFormat(
+    name="syslog",
+    description="RFC 3164 syslog lines",
+    parse_line=parse_syslog_line,
+))
@@ -0,0 +1,173 @@
+from .ColumnarLog import ColumnarLog, MISSING, MONTH_NAMES
+from .LogFormats import HTTP_METHODS, EPOCH_ORDINAL, get_log_format
+from datetime import date
+import re
+
+# field by field fallback for lines the log format does not read
+TIMESTAMP_PATTERN = re.compile(rb'\[(\d{2})/(\w{3})/(\d{4}):(\d{2}):(\d{2}):(\d{2})(?: ([+-])(\d{2})(\d{2}))?')
+STATUS_PATTERN = re.compile(rb'" (\d{3}) ')
+IP_PATTERN = re.compile(rb'(\d+\.\d+\.\d+\.\d+)')
+METHOD_PATTERN = re.compile(rb'"(' + HTTP_METHODS + rb') ')
+URL_PATTERN = re.compile(rb'"[A-Z]+ ([^ ]+)')
+
+MONTHS = { name.encode(): i + 1 for i, name in enumerate(MONTH_NAMES) }
+
+_UNSEEN = object()
+
+
+class LogParser:
+    """
+    Compiled, single-pass parser turning raw log bytes into a ColumnarLog.
+
+    Each non-blank line is read once by the fast parser of the log format
+    (see LogFormats, Apache combined by default); only lines it does not
+    read fall back to per-field searches. Repeated strings (IPs, methods,
+    URLs) are interned into per-log vocabularies.
+    """
+
+    def __init__(self, encoding: str = "utf-8", log_format: str = None):
+        self.encoding = encoding
+        self.log_format = get_log_format(log_format)
+        self.current_year = str(date.today().year).encode()
+        self._day_cache = {}
+        self._utc_day_cache = {}
+
+    def parse_text(self, text: str) -> ColumnarLog:
+        return self.parse(text.encode(self.encoding))
+
+    def parse(self, buffer: bytes) -> ColumnarLog:
+        log = ColumnarLog(buffer=buffer, encoding=self.encoding)
+        self.parse_range(log, 0, len(buffer))
+        return log
+
+    def parse_range(self, log: ColumnarLog, start: int, stop: int):
+        """Append the lines of buffer[start:stop] (newline-aligned) to the log columns."""
+        buffer = log.buffer
+
+        ip_ids, method_ids, url_ids = self.vocab_index(log)
+
+        def intern(value: bytes, ids: dict, vocab: list) -> int:
+            value_id = ids.get(value)
+            if value_id is None:
+                value_id = len(vocab)
+                ids[value] = value_id
+                vocab.append(value.decode(self.encoding, errors="replace"))
+            return value_id
+
+        line_start, line_end, line_chars = log.line_start.append, log.line_end.append, log.line_chars.append
+        # chunk sizes count characters: bytes only differ for non-ASCII lines of multi-byte encodings
+        single_byte = self.encoding.lower().replace("_", "-") in ("latin-1", "latin1", "iso-8859-1", "ascii")
+        timestamp, tz_offset, status = log.timestamp.append, log.tz_offset.append, log.status.append
+        ip_id, method_id, url_id = log.ip_id.append, log.method_id.append, log.url_id.append
+        size = log.size.append
+        parse_line = self.log_format.parse_line
+
+        pos = start
+        while pos < stop:
+            end = buffer.find(b"\n", pos, stop)
+            if end == -1:
+                end = stop
+
+            line = buffer[pos:end]
+            stripped = line.strip()
+            if not stripped:
+                pos = end + 1
+                continue
+
+            begin = pos + (len(line) - len(line.lstrip()))
+            line_start(begin)
+            line_end(begin + len(stripped))
+            if single_byte or stripped.isascii():
+                line_chars(len(stripped))
+            else:
+                line_chars(len(stripped.decode(self.encoding, errors="replace")))
+
+            record = parse_line(self, stripped)
+            if record is not None:
+                ts, offset, code, ip, method, url, response_size = record
+
+                timestamp(ts)
+                tz_offset(offset)
+                status(code)
+                ip_id(intern(ip, ip_ids, log.ips) if ip is not None else MISSING)
+                method_id(intern(method, method_ids, log.methods) if method is not None else MISSING)
+                url_id(intern(url, url_ids, log.urls) if url is not None else MISSING)
+                size(response_size)
+            else:
+                match = TIMESTAMP_PATTERN.search(stripped)
+                ts, offset = self.to_epoch(*match.groups()) if match else (MISSING, 0)
+                timestamp(ts)
+                tz_offset(offset)
+
+                match = STATUS_PATTERN.search(stripped)
+                status(int(match.group(1)) if match else 0)
+
+                match = IP_PATTERN.match(stripped)
+                ip_id(intern(match.group(1), ip_ids, log.ips) if match else MISSING)
+
+                match = METHOD_PATTERN.search(stripped)
+                method_id(intern(match.group(1), method_ids, log.methods) if match else MISSING)
+
+                match = URL_PATTERN.search(stripped)
+                url_id(intern(match.group(1), url_ids, log.urls) if match else MISSING)
+
+                size(MISSING)
+
+            pos = end + 1
+
+        return log
+
+    def vocab_index(self, log: ColumnarLog):
+        """value -> id maps for the log vocabularies, kept on the log between ranges."""
+        vocabs = (log.ips, log.methods, log.urls)
+        index = log.vocab_index
+        if index is None or any(len(ids) != len(vocab) for ids, vocab in zip(index, vocabs)):
+            index = tuple(
+                { value.encode(self.encoding): i for i, value in enumerate(vocab) }
+                for vocab in vocabs
+            )
+            log.vocab_index = index
+
+        return index
+
+    def to_epoch(self, day: bytes, month: bytes, year: bytes, hour: bytes, minute: bytes,
+                 second: bytes, tz_sign: bytes = None, tz_hours: bytes = None,
+                 tz_minutes: bytes = None):
+        """Return (epoch seconds in UTC, offset in seconds) for a [dd/Mon/yyyy:HH:MM:SS +zzzz] stamp."""
+        day_key = (day, month, year)
+        days = self._day_cache.get(day_key, _UNSEEN)
+        if days is _UNSEEN:
+            try:
+                days = date(int(year), MONTHS[month], int(day)).toordinal() - EPOCH_ORDINAL
+            except (KeyError, ValueError):
+                days = None
+            self._day_cache[day_key] = days
+
+        if days is None:
+            return MISSING, 0
+
+        offset = 0
+        if tz_sign:
+            offset = int(tz_hours) * 3600 + int(tz_minutes) * 60
+            if tz_sign == b"-":
+                offset = -offset
+
+        local_seconds = days * 86400 + int(hour) * 3600 + int(minute) * 60 + int(second)
+        return local_seconds - offset, offset
+
+    def to_utc_epoch(self, year: bytes, month: bytes, day: bytes, hour: bytes,
+                     minute: bytes, second: bytes) -> int:
+        """Epoch seconds for a numeric yyyy-mm-ddTHH:MM:SS stamp in UTC, MISSING if invalid."""
+        day_key = (year, month, day)
+        days = self._utc_day_cache.get(day_key, _UNSEEN)
+        if days is _UNSEEN:
+            try:
+                days = date(int(year), int(month), int(day)).toordinal() - EPOCH_ORDINAL
+            except ValueError:
+                days = None
+            self._utc_day_cache[day_key] = days
+
+        if days is None:
+            return MISSING
+
+        return days * 86400 + int(hour) * 3600 + int(minute) * 60 + int(second)
@@ -0,0 +1,349 @@
+from .ColumnarLog import ColumnarLog, MISSING
+from .LogFormats import detect_log_format
+from .LogParser import LogParser
+from utils.sketches import HyperLogLog, CountMinSketch, SpaceSaving, TDigest, hash64
+from typing import BinaryIO, Callable, Iterator
+import hashlib
+
+
+def iter_file_blocks(file: BinaryIO, start: int, stop: int, block_size: int) -> Iterator[bytes]:
+    """Bytes start..stop of a file in blocks of about block_size, each ending on a line end."""
+    file.seek(start)
+    pending = b""
+    position = start
+    while position < stop:
+        data = file.read(min(block_size, stop - position))
+        if not data:
+            break
+        position += len(data)
+
+        data = pending + data
+        cut = data.rfind(b"\n") + 1
+        if cut:
+            data, pending = data[:cut], data[cut:]
+            yield data
+        else:
+            pending = data
+
+    if pending:
+        yield pending
+
+
+def summarize_file_range(file_path: str, start: int, stop: int, log_format: str = None,
+                         block_size: int = 4 * 1024 * 1024,
+                         on_block: Callable[[int], None] = None) -> "LogSummary":
+    """
+    Summarize bytes start..stop (newline-aligned) of a log file. Each block
+    is parsed into its own small ColumnarLog, so memory does not grow with the
+    range or its vocabulary. `on_block` gets the bytes read so far. Also the
+    process pool entry point of a parallel scan.
+    """
+    # latin-1 is safer for logs as it never fails on weird bytes
+    parser = LogParser(encoding="latin-1", log_format=log_format)
+    summary = LogSummary()
+
+    done = 0
+    with open(file_path, "rb") as file:
+        for block in iter_file_blocks(file, start, stop, block_size):
+            summary.add_log(parser.parse(block))
+            done += len(block)
+            if on_block is not None:
+                on_block(done)
+
+    return summary
+
+
+class LogSummaryStream:
+    """
+    Summarize a log file from its bytes as they are written (e.g. an upload
+    streamed to disk), in pieces of any size.
+
+    Pieces are buffered up to about block_size, lines split across pieces
+    are carried over, and every block of complete lines is parsed into the
+    summary. Unless given, the log format is detected from the first
+    `sample_lines` lines within the first `sample_bytes`, exactly as
+    detect_file_log_format() would on the stored file. Along the way it keeps
+    the content hash (as EDAController.file_hash) and a sparse line index:
+    [line number, byte offset] of the first line starting at or after every
+    `line_index_interval` bytes, enough to seek near any line or byte without
+    scanning.
+    """
+
+    def __init__(self, log_format: str = None, block_size: int = 4 * 1024 * 1024,
+                 sample_lines: int = 200, sample_bytes: int = 1024 * 1024,
+                 line_index_interval: int = 1024 * 1024):
+        # latin-1 is safer for logs as it never fails on weird bytes
+        self.parser = LogParser(encoding="latin-1", log_format=log_format)
+        self.log_format = log_format
+        self.block_size = block_size
+        self.sample_lines = sample_lines
+        self.sample_bytes = max(sample_bytes, 1)
+        self.line_index_interval = line_index_interval
+
+        self.summary = LogSummary()
+        self.hasher = hashlib.blake2b(digest_size=16)
+        self.size = 0
+        self.lines = 0                  # lines parsed so far
+        self.line_checkpoints = []      # [line number, byte offset]
+        self.next_checkpoint = 0        # byte offset the next checkpoint is at or after
+
+        self.pieces = []                # bytes not parsed yet, from offset `parsed`
+        self.buffered = 0
+        self.parsed = 0
+        self.newline_buffered = False   # whether the pieces hold a complete line
+
+    @property
+    def content_hash(self) -> str:
+        return self.hasher.hexdigest()
+
+    @property
+    def line_index(self) -> dict:
+        return {
+            "interval": self.line_index_interval,
+            "lines": self.lines,
+            "checkpoints": self.line_checkpoints,
+        }
+
+    def feed(self, data: bytes):
+        self.hasher.update(data)
+        self.size += len(data)
+        self.pieces.append(data)
+        self.buffered += len(data)
+        # only the new bytes are searched: an overlong line is never rescanned
+        self.newline_buffered = self.newline_buffered or b"\n" in data
+
+        if self.log_format is None and self.size < self.sample_bytes:
+            return
+
+        if self.buffered >= self.block_size and self.newline_buffered:
+            self._parse_buffered(final=False)
+
+    def finish(self) -> "LogSummary":
+        """Parse what is left, a last line without its newline included."""
+        self._parse_buffered(final=True)
+        return self.summary
+
+    def _parse_buffered(self, final: bool):
+        data = b"".join(self.pieces)
+
+        if self.log_format is None:
+            sample = data[:self.sample_bytes].split(b"\n", self.sample_lines)[:self.sample_lines]
+            self.log_format = detect_log_format(sample, self.parser)
+            self.parser = LogParser(encoding="latin-1", log_format=self.log_format)
+
+        cut = len(data) if final else data.rfind(b"\n") + 1
+        if cut:
+            block = data[:cut]
+            self._index_lines(block)
+            self.summary.add_log(self.parser.parse(block))
+            self.lines += block.count(b"\n") + (0 if block.endswith(b"\n") else 1)
+            self.parsed += cut
+
+        rest = data[cut:]
+        self.pieces = [rest] if rest else []
+        self.buffered = len(rest)
+        self.newline_buffered = False
+
+    def _index_lines(self, block: bytes):
+        interval = self.line_index_interval
+        if not interval:
+            return
+
+        # blocks start on a line start, other lines start after a newline
+        base = self.parsed
+        while self.next_checkpoint < base + len(block):
+            position = max(self.next_checkpoint - base, 0)
+            if position > 0 and block[position - 1] != 0x0A:
+                position = block.find(b"\n", position) + 1
+                if position == 0 or position == len(block):
+                    # the line starts in the next block
+                    return
+
+            offset = base + position
+            self.line_checkpoints.append([self.lines + block.count(b"\n", 0, position), offset])
+            self.next_checkpoint = (offset // interval + 1) * interval
+
+
+class LogSummary:
+    """
+    EDA aggregates of parsed log rows, in fixed memory and mergeable.
+
+    Totals, the status histogram and the hourly traffic (one counter per hour
+    of the time span) are exact. Distinct IPs and URLs are HyperLogLog
+    estimates, the top IPs and URLs come from Space-Saving with counts
+    tightened by a Count-Min sketch, and response size percentiles from a
+    t-digest. Summaries of different blocks, byte ranges or files merge into
+    the summary of their union; to_dict()/from_dict() make them JSON.
+    """
+
+    def __init__(self, top_capacity: int = 1000):
+        self.lines = 0
+        self.total_requests = 0
+        self.total_size = 0
+        self.error_count = 0
+        self.status_counts = {}
+        self.hourly_traffic = {}    # hours since epoch, in the lines' own timezone -> requests
+
+        self.unique_ips = HyperLogLog()
+        self.unique_urls = HyperLogLog()
+        self.top_ips = SpaceSaving(capacity=top_capacity)
+        self.top_urls = SpaceSaving(capacity=top_capacity)
+        self.ip_frequencies = CountMinSketch()
+        self.url_frequencies = CountMinSketch()
+        self.response_sizes = TDigest()
+
+    def add_log(self, log: ColumnarLog):
+        """
+        Aggregate the rows a log holds. Rows without a timestamp are not
+        requests. Vocabulary values are sketched once per log, with their
+        count, so a log should be a block of many lines.
+        """
+        timestamp, tz_offset, status = log.timestamp, log.tz_offset, log.status
+        ip_id, url_id, size = log.ip_id, log.url_id, log.size
+
+        ip_counts, url_counts, sizes = {}, {}, []
+        status_counts, hourly_traffic = self.status_counts, self.hourly_traffic
+        requests = errors = total_size = 0
+
+        rows = len(log.line_start)
+        for i in range(rows):
+            ts = timestamp[i]
+            if ts == MISSING:
+                continue
+            requests += 1
+
+            ip = ip_id[i]
+            if ip != MISSING:
+                ip_counts[ip] = ip_counts.get(ip, 0) + 1
+
+            url = url_id[i]
+            if url != MISSING:
+                url_counts[url] = url_counts.get(url, 0) + 1
+
+            # formats without a status (syslog) leave it at 0
+            code = status[i]
+            if code:
+                status_counts[code] = status_counts.get(code, 0) + 1
+                if code >= 400:
+                    errors += 1
+
+            response_size = size[i]
+            if response_size != MISSING:
+                total_size += response_size
+                sizes.append(response_size)
+
+            hour = (ts + tz_offset[i]) // 3600
+            hourly_traffic[hour] = hourly_traffic.get(hour, 0) + 1
+
+        self.lines += rows
+        self.total_requests += requests
+        self.error_count += errors
+        self.total_size += total_size
+        self.response_sizes.add_many(sizes)
+
+        for counts, vocab, distinct, frequencies, top in (
+            (ip_counts, log.ips, self.unique_ips, self.ip_frequencies, self.top_ips),
+            (url_counts, log.urls, self.unique_urls, self.url_frequencies, self.top_urls),
+        ):
+            values = {}
+            for value_id, count in counts.items():
+                value = vocab[value_id]
+                values[value] = count
+                # one hash feeds both sketches
+                hashed = hash64(value)
+                distinct.add_hash(hashed)
+                frequencies.add_hash(hashed, count)
+            top.update(values)
+
+        return self
+
+    def merge(self, other: "LogSummary") -> "LogSummary":
+        self.lines += other.lines
+        self.total_requests += other.total_requests
+        self.total_size += other.total_size
+        self.error_count += other.error_count
+        for counts, other_counts in ((self.status_counts, other.status_counts),
+                                     (self.hourly_traffic, other.hourly_traffic)):
+            for key, count in other_counts.items():
+                counts[key] = counts.get(key, 0) + count
+
+        self.unique_ips.merge(other.unique_ips)
+        self.unique_urls.merge(other.unique_urls)
+        self.top_ips.merge(other.top_ips)
+        self.top_urls.merge(other.top_urls)
+        self.ip_frequencies.merge(other.ip_frequencies)
+        self.url_frequencies.merge(other.url_frequencies)
+        self.response_sizes.merge(other.response_sizes)
+        return self
+
+    def top_values(self, top: SpaceSaving, frequencies: CountMinSketch, k: int = 10) -> dict:
+        # both sketches only overestimate, the smaller count is the tighter one
+        return { value: min(count, frequencies.estimate(value)) for value, count in top.top(k) }
+
+    def render(self, top_k: int = 10) -> dict:
+        """The EDA payload: metrics and chart data."""
+        total_requests = self.total_requests
+        sorted_hours = sorted(self.hourly_traffic.keys())
+        percentiles = {
+            f"p{int(q * 100)}": round(value, 2) if value is not None else None
+            for q, value in ((q, self.response_sizes.quantile(q)) for q in (0.5, 0.9, 0.99))
+        }
+
+        metrics = {
+            "total_requests": total_requests,
+            "unique_visitors": self.unique_ips.count(),
+            "unique_urls": self.unique_urls.count(),
+            "total_bandwidth_mb": round(self.total_size / (1024 * 1024), 2),
+            "error_rate": round((self.error_count / total_requests * 100), 2) if total_requests > 0 else 0,
+            "avg_response_size": round(self.total_size / total_requests, 2) if total_requests > 0 else 0,
+            "response_size_percentiles": percentiles,
+        }
+
+        return {
+            "metrics": metrics,
+            "charts": {
+                "status_counts": dict(sorted(self.status_counts.items())),
+                "top_ips": self.top_values(self.top_ips, self.ip_frequencies, top_k),
+                "top_urls": self.top_values(self.top_urls, self.url_frequencies, top_k),
+                "traffic_over_time": {
+                    "labels": [ColumnarLog.format_time_window(h) for h in sorted_hours],
+                    "values": [self.hourly_traffic[h] for h in sorted_hours]
+                }
+            }
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "lines": self.lines,
+            "total_requests": self.total_requests,
+            "total_size": self.total_size,
+            "error_count": self.error_count,
+            # JSON object keys are strings
+            "status_counts": { str(key): count for key, count in self.status_counts.items() },
+            "hourly_traffic": { str(key): count for key, count in self.hourly_traffic.items() },
+            "unique_ips": self.unique_ips.to_dict(),
+            "unique_urls": self.unique_urls.to_dict(),
+            "top_ips": self.top_ips.to_dict(),
+            "top_urls": self.top_urls.to_dict(),
+            "ip_frequencies": self.ip_frequencies.to_dict(),
+            "url_frequencies": self.url_frequencies.to_dict(),
+            "response_sizes": self.response_sizes.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LogSummary":
+        summary = cls()
+        summary.lines = data["lines"]
+        summary.total_requests = data["total_requests"]
+        summary.total_size = data["total_size"]
+        summary.error_count = data["error_count"]
+        summary.status_counts = { int(key): count for key, count in data["status_counts"].items() }
+        summary.hourly_traffic = { int(key): count for key, count in data["hourly_traffic"].items() }
+        summary.unique_ips = HyperLogLog.from_dict(data["unique_ips"])
+        summary.unique_urls = HyperLogLog.from_dict(data["unique_urls"])
+        summary.top_ips = SpaceSaving.from_dict(data["top_ips"])
+        summary.top_urls = SpaceSaving.from_dict(data["top_urls"])
+        summary.ip_frequencies = CountMinSketch.from_dict(data["ip_frequencies"])
+        summary.url_frequencies = CountMinSketch.from_dict(data["url_frequencies"])
+        summary.response_sizes = TDigest.from_dict(data["response_sizes"])
+        return summary
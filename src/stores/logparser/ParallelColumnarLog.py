@@ -0,0 +1,179 @@
+from .ColumnarLog import MISSING, COLUMNS
+from .LogParser import LogParser
+from .StreamingColumnarLog import StreamingColumnarLog
+from array import array
+from collections import deque
+from concurrent.futures import Executor
+from typing import List, Tuple
+import mmap
+
+try:
+    import billiard
+except ImportError:     # installed along with Celery, only needed inside its workers
+    billiard = None
+
+
+def split_file_ranges(buffer, range_size: int) -> List[Tuple[int, int]]:
+    """Cut a buffer into [start, stop) byte ranges of about range_size, each ending on a newline."""
+    ranges = []
+    size = len(buffer)
+
+    start = 0
+    while start < size:
+        stop = start + range_size
+        if stop >= size:
+            stop = size
+        else:
+            newline = buffer.find(b"\n", stop - 1)
+            stop = size if newline == -1 else newline + 1
+
+        ranges.append((start, stop))
+        start = stop
+
+    return ranges
+
+
+def parse_file_range(file_path: str, start: int, stop: int, encoding: str = "utf-8",
+                     log_format: str = None):
+    """Process pool entry point: parse one byte range, offsets relative to `start`."""
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        buffer = file.read(stop - start)
+
+    log = LogParser(encoding=encoding, log_format=log_format).parse(buffer)
+    columns = { name: getattr(log, name) for name in COLUMNS }
+    return columns, log.ips, log.methods, log.urls
+
+
+class BilliardFuture:
+    __slots__ = ("async_result",)
+
+    def __init__(self, async_result):
+        self.async_result = async_result
+
+    def result(self):
+        return self.async_result.get()
+
+    def cancel(self):
+        # the pool is terminated on exit, which drops what is still queued
+        return False
+
+
+class BilliardPoolExecutor(Executor):
+    """
+    An Executor over a billiard process pool.
+
+    multiprocessing refuses to start processes from a daemonic process, and
+    every Celery prefork child is one; billiard, Celery's own fork of it,
+    does not. Shutting down terminates the pool, dropping queued calls.
+    """
+
+    def __init__(self, max_workers: int, start_method: str = "spawn"):
+        self.pool = billiard.get_context(start_method).Pool(processes=max_workers)
+
+    def submit(self, fn, /, *args, **kwargs):
+        return BilliardFuture(self.pool.apply_async(fn, args, kwargs))
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        self.pool.terminate()
+        if wait:
+            self.pool.join()
+
+
+class ParallelColumnarLog(StreamingColumnarLog):
+    """
+    A ColumnarLog whose byte ranges are parsed ahead in a process pool.
+
+    The file is memory-mapped and cut into newline-aligned ranges. Ranges are
+    parsed concurrently (at most `prefetch` in flight) and stitched back in
+    file order: line offsets are rebased and vocabulary ids are remapped in
+    order of first appearance, so the columns are exactly the ones a
+    sequential parse produces and every chunker gives the sequential result.
+    """
+
+    def __init__(self, file_path: str, parser: LogParser, executor: Executor,
+                 range_size: int = 64 * 1024 * 1024, prefetch: int = 4,
+                 retain_rows: int = 16):
+        super().__init__(file=None, parser=parser, block_size=range_size,
+                         retain_rows=retain_rows)
+        self.file_path = file_path
+        self.executor = executor
+        self.prefetch = prefetch
+
+        self.file = open(file_path, "rb")
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.ranges = deque(split_file_ranges(self.buffer, range_size))
+        self.futures = deque()
+
+    def submit_ranges(self):
+        while self.ranges and len(self.futures) < self.prefetch:
+            start, stop = self.ranges.popleft()
+            self.futures.append((start, self.executor.submit(
+                parse_file_range, self.file_path, start, stop, self.encoding,
+                self.parser.log_format.name
+            )))
+
+    def read_block(self):
+        self.submit_ranges()
+        if not self.futures:
+            self.eof = True
+            return
+
+        start, future = self.futures.popleft()
+        columns, ips, methods, urls = future.result()
+        self.submit_ranges()
+
+        self.append_range(start, columns, (ips, methods, urls))
+
+    def append_range(self, start: int, columns: dict, vocabs: tuple):
+        index = self.parser.vocab_index(self)
+
+        remaps = []
+        for vocab, ids, values in zip((self.ips, self.methods, self.urls), index, vocabs):
+            remap = []
+            for value in values:
+                key = value.encode(self.encoding)
+                value_id = ids.get(key)
+                if value_id is None:
+                    value_id = len(vocab)
+                    ids[key] = value_id
+                    vocab.append(value)
+                remap.append(value_id)
+            remaps.append(remap)
+
+        ip_remap, method_remap, url_remap = remaps
+
+        self.line_start.extend(offset + start for offset in columns["line_start"])
+        self.line_end.extend(offset + start for offset in columns["line_end"])
+        self.line_chars.extend(columns["line_chars"])
+        self.timestamp.extend(columns["timestamp"])
+        self.tz_offset.extend(columns["tz_offset"])
+        self.status.extend(columns["status"])
+        self.ip_id.extend(ip_remap[i] if i != MISSING else MISSING for i in columns["ip_id"])
+        self.method_id.extend(method_remap[i] if i != MISSING else MISSING for i in columns["method_id"])
+        self.url_id.extend(url_remap[i] if i != MISSING else MISSING for i in columns["url_id"])
+        self.size.extend(columns["size"])
+
+    def release(self, row: int):
+        keep_from = max(self.first_row, row - self.retain_rows)
+        drop = keep_from - self.first_row
+
+        # the bytes stay in the page cache, only the columns are compacted,
+        # and only once at least half of them are dead
+        if drop <= 0 or drop < len(self.line_start) - drop:
+            return
+
+        for name in COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, column[drop:]))
+
+        self.first_row = keep_from
+
+    def close(self):
+        for _, future in self.futures:
+            future.cancel()
+        self.futures.clear()
+
+        self.buffer.close()
+        self.file.close()
@@ -0,0 +1,93 @@
+from .ColumnarLog import ColumnarLog, COLUMNS
+from array import array
+from typing import BinaryIO, Iterator
+
+
+class StreamingColumnarLog(ColumnarLog):
+    """
+    A ColumnarLog over a window of a file, read in fixed-size blocks.
+
+    Blocks are parsed as rows are asked for (one row of look-ahead), and the
+    rows a chunker releases are dropped together with their bytes, so memory
+    follows the size of the chunk being built instead of the size of the file.
+    A few rows before the released one are kept for chunkers that look back.
+
+    Reading starts at the file's current position. With `complete_lines_only`,
+    a last line without its newline is left unread (a writer may still be
+    appending to it), which is how growing files are tailed.
+    """
+
+    def __init__(self, file: BinaryIO, parser, block_size: int = 1024 * 1024,
+                 retain_rows: int = 16, complete_lines_only: bool = False):
+        super().__init__(buffer=b"", encoding=parser.encoding)
+        self.file = file
+        self.parser = parser
+        self.block_size = block_size
+        self.retain_rows = retain_rows
+        self.complete_lines_only = complete_lines_only
+
+        self.from_file = True
+        self.base_offset = file.tell() if file is not None else 0
+        self.pending = []       # trailing blocks read since the last newline, not a full line yet
+        self.eof = False
+
+    @property
+    def end_offset(self) -> int:
+        """File offset right after the last byte parsed so far."""
+        return self.base_offset + len(self.buffer)
+
+    def rows(self) -> Iterator[int]:
+        idx = self.first_row
+        while True:
+            while idx + 1 >= len(self) and not self.eof:
+                self.read_block()
+
+            if idx >= len(self):
+                return
+
+            yield idx
+            idx += 1
+
+    def read_block(self):
+        data = self.file.read(self.block_size)
+        if not data:
+            self.eof = True
+            data = b"" if self.complete_lines_only else b"".join(self.pending)
+            self.pending = []
+        else:
+            # only the new block is searched, an overlong line is joined once
+            cut = data.rfind(b"\n") + 1
+            if not cut:
+                self.pending.append(data)
+                return
+
+            self.pending.append(data[:cut])
+            data, self.pending = b"".join(self.pending), [data[cut:]] if cut < len(data) else []
+
+        if data:
+            start = len(self.buffer)
+            self.buffer += data
+            self.parser.parse_range(self, start, len(self.buffer))
+
+    def release(self, row: int):
+        keep_from = max(self.first_row, row - self.retain_rows)
+        drop = keep_from - self.first_row
+        if drop <= 0 or drop > len(self.line_start):
+            return
+
+        # compact only once a block worth of bytes is dead, so copies stay amortized
+        cut = self.line_start[drop] if drop < len(self.line_start) else len(self.buffer)
+        if cut < self.block_size:
+            return
+
+        self.buffer = self.buffer[cut:]
+        self.base_offset += cut
+        for name in COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, column[drop:]))
+
+        for column in (self.line_start, self.line_end):
+            for i in range(len(column)):
+                column[i] -= cut
+
+        self.first_row = keep_from
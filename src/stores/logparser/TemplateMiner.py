@@ -0,0 +1,140 @@
+from typing import Dict, List, Optional, Tuple
+import re
+
+WILDCARD = "<*>"
+
+# variables every access log line has, masked before the tree sees the tokens
+DEFAULT_MASKS = (
+    (re.compile(r'\[\d{2}/\w{3}/\d{4}:\d{2}:\d{2}:\d{2}(?: [+-]\d{4})?\]'), "<TS>"),
+    (re.compile(r'\b\d+\.\d+\.\d+\.\d+\b'), "<IP>"),
+)
+
+_DIGIT = re.compile(r'\d')
+
+
+class LogCluster:
+    __slots__ = ("template_id", "tokens", "size")
+
+    def __init__(self, template_id: int, tokens: List[str]):
+        self.template_id = template_id
+        self.tokens = tokens
+        self.size = 0
+
+    @property
+    def template(self) -> str:
+        return " ".join(self.tokens)
+
+
+class TemplateMiner:
+    """
+    Online log template mining with a Drain-style fixed-depth parse tree.
+
+    A line is masked and tokenized, then routed by its token count and its
+    first `depth - 2` tokens (tokens with digits go under the wildcard) to a
+    leaf holding a few clusters. It joins the most similar cluster when at
+    least `similarity_threshold` of the tokens match, turning the differing
+    positions of the template into wildcards; otherwise it starts a new one.
+    Each line costs a handful of dict lookups and one comparison per cluster
+    of its leaf.
+    """
+
+    def __init__(self, depth: int = 4, similarity_threshold: float = 0.5,
+                 max_children: int = 100, masks=DEFAULT_MASKS):
+        self.max_node_depth = max(depth, 3) - 2
+        self.similarity_threshold = similarity_threshold
+        self.max_children = max_children
+        self.masks = masks
+
+        self.root: Dict[int, dict] = {}
+        self.clusters: List[LogCluster] = []
+
+    def tokenize(self, line: str) -> List[str]:
+        for pattern, name in self.masks:
+            line = pattern.sub(name, line)
+        return line.split()
+
+    def add(self, line: str) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        Mine one line. Returns its template id and the (token index, value)
+        pairs of the template's wildcards. Values are keyed by token index
+        since later lines can turn more positions of the template into
+        wildcards, shifting the wildcard order but never the token indexes.
+        """
+        tokens = self.tokenize(line)
+
+        leaf = self.leaf(tokens)
+        cluster = self.best_match(leaf, tokens)
+        if cluster is None:
+            cluster = LogCluster(len(self.clusters), tokens)
+            self.clusters.append(cluster)
+            leaf.append(cluster)
+        else:
+            template = cluster.tokens
+            for i, token in enumerate(tokens):
+                if template[i] != token and template[i] != WILDCARD:
+                    template[i] = WILDCARD
+
+        cluster.size += 1
+        return cluster.template_id, self.parameters(cluster.tokens, tokens)
+
+    def template(self, template_id: int) -> str:
+        return self.clusters[template_id].template
+
+    def wildcard_positions(self, template_id: int) -> List[int]:
+        """Token indexes of the template's wildcards, as it stands now."""
+        return [ i for i, token in enumerate(self.clusters[template_id].tokens) if token == WILDCARD ]
+
+    def to_dict(self) -> dict:
+        """The mined templates, JSON-serializable, to resume mining later (see from_dict)."""
+        return { "templates": [ [cluster.tokens, cluster.size] for cluster in self.clusters ] }
+
+    @classmethod
+    def from_dict(cls, data: dict, **kwargs) -> "TemplateMiner":
+        """A miner continuing from to_dict(): same template ids, clusters routed by their template."""
+        miner = cls(**kwargs)
+        for tokens, size in data.get("templates", []):
+            cluster = LogCluster(len(miner.clusters), list(tokens))
+            cluster.size = size
+            miner.clusters.append(cluster)
+            miner.leaf(cluster.tokens).append(cluster)
+        return miner
+
+    def leaf(self, tokens: List[str]) -> list:
+        """The cluster list tokens route to, creating the path on the way."""
+        node = self.root.setdefault(len(tokens), {})
+
+        for token in tokens[:self.max_node_depth]:
+            if _DIGIT.search(token):
+                token = WILDCARD
+            elif token not in node:
+                # a crowded level sends new tokens under the wildcard
+                limit = self.max_children if WILDCARD in node else self.max_children - 1
+                if len(node) >= limit:
+                    token = WILDCARD
+
+            node = node.setdefault(token, {})
+
+        return node.setdefault(None, [])
+
+    def best_match(self, leaf: list, tokens: List[str]) -> Optional[LogCluster]:
+        best, best_similarity, best_wildcards = None, -1.0, -1
+        for cluster in leaf:
+            same, wildcards = 0, 0
+            for template_token, token in zip(cluster.tokens, tokens):
+                if template_token == WILDCARD:
+                    wildcards += 1
+                elif template_token == token:
+                    same += 1
+
+            similarity = same / len(tokens) if tokens else 1.0
+            if similarity > best_similarity or (similarity == best_similarity and wildcards > best_wildcards):
+                best, best_similarity, best_wildcards = cluster, similarity, wildcards
+
+        if best is not None and best_similarity >= self.similarity_threshold:
+            return best
+        return None
+
+    @staticmethod
+    def parameters(template: List[str], tokens: List[str]) -> List[Tuple[int, str]]:
+        return [ (i, token) for i, (template_token, token) in enumerate(zip(template, tokens))
+                 if template_token == WILDCARD ]
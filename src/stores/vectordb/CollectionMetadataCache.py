@@ -0,0 +1,148 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger("uvicorn")
+
+
+@dataclass
+class CollectionMetadata:
+    """What the providers know about a collection without asking the database."""
+    existed: Optional[bool] = None
+    dimension: Optional[int] = None
+    has_index: Optional[bool] = None
+    approx_count: Optional[int] = None
+    cached_at: float = field(default_factory=time.monotonic)
+
+
+class CollectionMetadataCache:
+    """
+    Process-local cache of collection metadata shared by the vector DB providers.
+
+    Entries expire after `ttl` seconds. Invalidations can be broadcast to the
+    other API/Celery processes through a Redis pub/sub channel when
+    `redis_url` is configured; each process runs `listen()` to receive them.
+    """
+
+    def __init__(self, ttl: int = 300, redis_url: str = None,
+                 channel: str = "vectordb_collection_invalidations"):
+        self.ttl = ttl
+        self.redis_url = redis_url
+        self.channel = channel
+
+        self.instance_id = uuid.uuid4().hex
+        self.redis_client = None
+
+        self._entries: Dict[str, CollectionMetadata] = {}
+        self.invalidation_listeners: List[Callable[[Optional[str]], None]] = []
+
+    def get(self, collection_name: str) -> Optional[CollectionMetadata]:
+        entry = self._entries.get(collection_name)
+        if entry is None:
+            return None
+
+        if self.ttl and time.monotonic() - entry.cached_at > self.ttl:
+            self._entries.pop(collection_name, None)
+            return None
+
+        return entry
+
+    def set(self, collection_name: str, **fields) -> CollectionMetadata:
+        entry = self.get(collection_name)
+        if entry is None:
+            entry = CollectionMetadata()
+            self._entries[collection_name] = entry
+
+        for key, value in fields.items():
+            setattr(entry, key, value)
+
+        return entry
+
+    def add_rows(self, collection_name: str, rows_count: int):
+        entry = self.get(collection_name)
+        if entry is not None and entry.approx_count is not None:
+            entry.approx_count += rows_count
+
+    def invalidate_local(self, collection_name: str = None):
+        """Drop one collection (or everything when collection_name is None) from this process."""
+        if collection_name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(collection_name, None)
+
+        for listener in self.invalidation_listeners:
+            try:
+                listener(collection_name)
+            except Exception as e:
+                logger.warning(f"Collection invalidation listener failed: {e}")
+
+    def add_invalidation_listener(self, listener: Callable[[Optional[str]], None]):
+        self.invalidation_listeners.append(listener)
+
+    async def invalidate(self, collection_name: str = None):
+        """Invalidate locally and tell the other processes to do the same."""
+        self.invalidate_local(collection_name)
+
+        if not self.redis_url:
+            return
+
+        try:
+            redis_client = self._get_redis_client()
+            await redis_client.publish(self.channel, json.dumps({
+                "collection_name": collection_name,
+                "origin": self.instance_id,
+            }))
+        except Exception as e:
+            # other processes fall back to the TTL
+            logger.warning(f"Failed to broadcast collection invalidation: {e}")
+
+    async def listen(self):
+        """Apply invalidations broadcast by other processes. Runs until cancelled."""
+        if not self.redis_url:
+            return
+
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._get_redis_client().pubsub()
+                await pubsub.subscribe(self.channel)
+
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+
+                    payload = json.loads(message["data"])
+                    if payload.get("origin") == self.instance_id:
+                        continue
+
+                    self.invalidate_local(payload.get("collection_name"))
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Collection invalidation listener disconnected, retrying: {e}")
+                # entries may have missed invalidations while disconnected
+                self.invalidate_local()
+                await asyncio.sleep(5)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    async def close(self):
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+            self.redis_client = None
+
+    def _get_redis_client(self):
+        if self.redis_client is None:
+            import redis.asyncio as aioredis
+            self.redis_client = aioredis.from_url(self.redis_url)
+
+        return self.redis_client
@@ -20,6 +20,30 @@ class PgVectorDistanceMethodEnums(Enum):
     COSINE = "vector_cosine_ops"
     DOT = "vector_l2_ops"
 
+class PgVectorDistanceOperatorEnums(Enum):
+    # operator that an index built with the matching opclass can serve
+    vector_cosine_ops = "<=>"
+    vector_l2_ops = "<->"
+    vector_ip_ops = "<#>"
+
+class PgVectorScoreEnums(Enum):
+    # score of a row from its distance {d} by the operator above, higher is closer
+    vector_cosine_ops = "1 - ({d})"
+    vector_l2_ops = "1 / (1 + ({d}))"
+    vector_ip_ops = "-({d})"
+
+class PgVectorSearchParamEnums(Enum):
+    HNSW_EF_SEARCH = "hnsw.ef_search"
+    IVFFLAT_PROBES = "ivfflat.probes"
+
 class PgVectorIndexTypeEnums(Enum):
     HNSW = "hnsw"
-    IVFFLAT = "ivfflat"
\ No newline at end of file
+    IVFFLAT = "ivfflat"
+
+class PgVectorInsertModeEnums(Enum):
+    INSERT = "insert"
+    COPY = "copy"
+
+class PgVectorIndexBuildModeEnums(Enum):
+    INLINE = "inline"
+    DEFERRED = "deferred"
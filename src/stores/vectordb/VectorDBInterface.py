@@ -47,6 +47,36 @@ class VectorDBInterface(ABC):
         pass
 
     @abstractmethod
-    def search_by_vector(self, collection_name: str, vector: list, limit: int) -> List[RetrievedDocument]:
+    def get_existing_record_ids(self, collection_name: str, record_ids: list) -> set:
+        pass
+
+    @abstractmethod
+    def iter_record_ids(self, collection_name: str, page_size: int = 1000):
+        pass
+
+    @abstractmethod
+    def delete_records(self, collection_name: str, record_ids: list) -> int:
+        pass
+
+    @abstractmethod
+    def begin_bulk_load(self, collection_name: str):
+        pass
+
+    @abstractmethod
+    def finish_bulk_load(self, collection_name: str):
+        pass
+
+    @abstractmethod
+    def release_bulk_load(self, collection_name: str):
+        pass
+
+    @abstractmethod
+    def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                               ef_search: int = None, probes: int = None) -> List[RetrievedDocument]:
+        pass
+
+    @abstractmethod
+    def explain_search(self, collection_name: str, vector: list, limit: int,
+                             ef_search: int = None, probes: int = None) -> dict:
         pass
     
\ No newline at end of file
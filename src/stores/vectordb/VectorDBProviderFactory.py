@@ -1,5 +1,6 @@
 from .providers import QdrantDBProvider, PGVectorProvider
 from .VectorDBEnums import VectorDBEnums
+from .CollectionMetadataCache import CollectionMetadataCache
 from controllers.BaseController import BaseController
 from sqlalchemy.orm import sessionmaker
 
@@ -8,6 +9,25 @@ class VectorDBProviderFactory:
         self.config = config
         self.base_controller = BaseController()
         self.db_client = db_client
+        self.metadata_cache = CollectionMetadataCache(
+            ttl=self.config.VECTOR_DB_COLLECTION_CACHE_TTL,
+            redis_url=self.get_invalidation_url(),
+        )
+
+    def get_invalidation_url(self):
+        """
+        Where collection invalidations are broadcast. Without one, API and
+        Celery processes only learn about re-indexed collections when their
+        entries expire, so the Celery result backend's redis is used by default.
+        """
+        if self.config.VECTOR_DB_CACHE_INVALIDATION_URL:
+            return self.config.VECTOR_DB_CACHE_INVALIDATION_URL
+
+        result_backend = self.config.CELERY_RESULT_BACKEND or ""
+        if result_backend.startswith(("redis://", "rediss://")):
+            return result_backend
+
+        return None
 
     def create(self, provider: str):
         if provider == VectorDBEnums.QDRANT.value:
@@ -18,6 +38,7 @@ class VectorDBProviderFactory:
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                metadata_cache=self.metadata_cache,
             )
         
         if provider == VectorDBEnums.PGVECTOR.value:
@@ -26,6 +47,14 @@ class VectorDBProviderFactory:
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                hnsw_ef_search=self.config.VECTOR_DB_PGVEC_HNSW_EF_SEARCH,
+                ivfflat_probes=self.config.VECTOR_DB_PGVEC_IVFFLAT_PROBES,
+                insert_mode=self.config.VECTOR_DB_PGVEC_INSERT_MODE,
+                copy_flush_size=self.config.VECTOR_DB_PGVEC_COPY_FLUSH_SIZE,
+                index_build_mode=self.config.VECTOR_DB_PGVEC_INDEX_BUILD_MODE,
+                maintenance_work_mem=self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM,
+                maintenance_workers=self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORKERS,
+                metadata_cache=self.metadata_cache,
             )
         
         return None
\ No newline at end of file
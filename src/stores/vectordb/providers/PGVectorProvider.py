@@ -1,22 +1,73 @@
 from ..VectorDBInterface import VectorDBInterface
 from ..VectorDBEnums import (DistanceMethodEnums, PgVectorTableSchemeEnums, 
-                             PgVectorDistanceMethodEnums, PgVectorIndexTypeEnums)
+                             PgVectorDistanceMethodEnums, PgVectorIndexTypeEnums,
+                             PgVectorDistanceOperatorEnums, PgVectorSearchParamEnums,
+                             PgVectorInsertModeEnums, PgVectorIndexBuildModeEnums,
+                             PgVectorScoreEnums)
 import logging
-from typing import List
+from typing import List, Optional
 from models.db_schemes import RetrievedDocument
+from ..CollectionMetadataCache import CollectionMetadataCache
 from sqlalchemy.sql import text as sql_text
+import numpy as np
+import struct
+import weakref
 import json
 
+
+def encode_pgvector_binary(vector) -> bytes:
+    """
+    Encode a vector to pgvector's binary wire format:
+    int16 dim, int16 unused, dim * float32 (big-endian).
+    """
+    if isinstance(vector, str):
+        # text literals ("[0.1,0.2]") still flow through sqlalchemy on the same connection
+        vector = vector.strip("[]").split(",")
+
+    buffer = np.asarray(vector, dtype=">f4")
+    return struct.pack(">HH", buffer.shape[0], 0) + buffer.tobytes()
+
+def decode_pgvector_binary(data: bytes) -> np.ndarray:
+    dim, _ = struct.unpack_from(">HH", data)
+    return np.frombuffer(data, dtype=">f4", count=dim, offset=4).astype(np.float32)
+
 class PGVectorProvider(VectorDBInterface):
 
     def __init__(self, db_client, default_vector_size: int = 786,
-                       distance_method: str = None, index_threshold: int=100):
+                       distance_method: str = None, index_threshold: int=100,
+                       hnsw_ef_search: int = None, ivfflat_probes: int = None,
+                       insert_mode: str = PgVectorInsertModeEnums.COPY.value,
+                       copy_flush_size: int = 1000,
+                       index_build_mode: str = PgVectorIndexBuildModeEnums.INLINE.value,
+                       maintenance_work_mem: str = None, maintenance_workers: int = None,
+                       metadata_cache: CollectionMetadataCache = None):
         
         self.db_client = db_client
         self.default_vector_size = default_vector_size
         
         self.index_threshold = index_threshold
 
+        # default query-time index parameters, overridable per collection and per query
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ivfflat_probes = ivfflat_probes
+        self.collection_search_params = {}
+
+        # bulk ingestion through binary COPY, with the INSERT path as fallback
+        self.insert_mode = insert_mode
+        self.copy_flush_size = copy_flush_size
+        self.vector_type_schema = None
+        self._codec_connections = weakref.WeakSet()
+
+        # index lifecycle for bulk loads: collections listed here skip the
+        # inline index build until finish_bulk_load builds it once
+        self.index_build_mode = index_build_mode
+        self.maintenance_work_mem = maintenance_work_mem
+        self.maintenance_workers = maintenance_workers
+        self.deferred_index_collections = set()
+
+        # existence / dimension / index state / row estimate, shared across processes
+        self.metadata_cache = metadata_cache or CollectionMetadataCache()
+
         if distance_method == DistanceMethodEnums.COSINE.value:
             distance_method = PgVectorDistanceMethodEnums.COSINE.value
         elif distance_method == DistanceMethodEnums.DOT.value:
@@ -24,9 +75,19 @@ class PGVectorProvider(VectorDBInterface):
 
         self.pgvector_table_prefix = PgVectorTableSchemeEnums._PREFIX.value
         self.distance_method = distance_method
+        self.distance_operator = PgVectorDistanceOperatorEnums[
+            distance_method or PgVectorDistanceMethodEnums.COSINE.value
+        ].value
+        self.score_expression = PgVectorScoreEnums[
+            distance_method or PgVectorDistanceMethodEnums.COSINE.value
+        ].value
 
         self.logger = logging.getLogger("uvicorn")
         self.default_index_name = lambda collection_name: f"{collection_name}_vector_idx"
+        self.chunk_id_index_name = lambda collection_name: f"{collection_name}_chunk_id_idx"
+
+        # rows reference data_chunks, a chunk cannot be deleted before its vector
+        self.references_chunks = True
 
 
     async def connect(self):
@@ -46,10 +107,14 @@ class PGVectorProvider(VectorDBInterface):
                         raise e
 
     async def disconnect(self):
-        pass
+        await self.metadata_cache.close()
 
     async def is_collection_existed(self, collection_name: str) -> bool:
 
+        cached = self.metadata_cache.get(collection_name)
+        if cached is not None and cached.existed is not None:
+            return cached.existed
+
         record = None
         async with self.db_client() as session:
             async with session.begin():
@@ -57,7 +122,61 @@ class PGVectorProvider(VectorDBInterface):
                 results = await session.execute(list_tbl, {"collection_name": collection_name})
                 record = results.scalar_one_or_none()
 
-        return record
+        # only existence is cached: another process may create the collection any time
+        if record:
+            self.metadata_cache.set(collection_name, existed=True)
+
+        return bool(record)
+
+    async def get_collection_dimension(self, collection_name: str) -> Optional[int]:
+        cached = self.metadata_cache.get(collection_name)
+        if cached is not None and cached.dimension is not None:
+            return cached.dimension
+
+        async with self.db_client() as session:
+            async with session.begin():
+                # the vector typmod is the declared dimension
+                dimension_sql = sql_text(
+                    'SELECT atttypmod FROM pg_attribute '
+                    'WHERE attrelid = to_regclass(:collection_name) AND attname = :column_name'
+                )
+                result = await session.execute(dimension_sql, {
+                    "collection_name": collection_name,
+                    "column_name": PgVectorTableSchemeEnums.VECTOR.value,
+                })
+                dimension = result.scalar_one_or_none()
+
+        if dimension is None or dimension < 0:
+            return None
+
+        self.metadata_cache.set(collection_name, dimension=dimension)
+        return dimension
+
+    async def get_approx_count(self, collection_name: str, session=None) -> int:
+        """
+        Row count estimate from pg_class.reltuples (kept fresh by ANALYZE/autovacuum),
+        falling back to COUNT(*) for tables that were never analyzed.
+        """
+        cached = self.metadata_cache.get(collection_name)
+        if cached is not None and cached.approx_count is not None:
+            return cached.approx_count
+
+        if session is None:
+            async with self.db_client() as session:
+                async with session.begin():
+                    return await self.get_approx_count(collection_name=collection_name, session=session)
+
+        reltuples_sql = sql_text('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:collection_name)')
+        result = await session.execute(reltuples_sql, {"collection_name": collection_name})
+        records_count = result.scalar_one_or_none()
+
+        if records_count is None or records_count <= 0:
+            count_sql = sql_text(f'SELECT COUNT(*) FROM {collection_name}')
+            result = await session.execute(count_sql)
+            records_count = result.scalar_one()
+
+        self.metadata_cache.set(collection_name, approx_count=int(records_count))
+        return int(records_count)
     
     async def list_all_collections(self) -> List:
         records = []
@@ -108,6 +227,8 @@ class PGVectorProvider(VectorDBInterface):
                 delete_sql = sql_text(f'DROP TABLE IF EXISTS {collection_name}')
                 await session.execute(delete_sql)
                 await session.commit()
+
+        await self.metadata_cache.invalidate(collection_name)
         
         return True
 
@@ -134,13 +255,28 @@ class PGVectorProvider(VectorDBInterface):
                         ')'
                     )
                     await session.execute(create_sql)
+
+                    # lookups and deletes by chunk id, and one vector per chunk
+                    chunk_id_index_sql = sql_text(
+                        f'CREATE UNIQUE INDEX {self.chunk_id_index_name(collection_name)} '
+                        f'ON {collection_name} ({PgVectorTableSchemeEnums.CHUNK_ID.value})'
+                    )
+                    await session.execute(chunk_id_index_sql)
                     await session.commit()
+
+            await self.metadata_cache.invalidate(collection_name)
+            self.metadata_cache.set(collection_name, existed=True, dimension=embedding_size,
+                                    has_index=False, approx_count=0)
             
             return True
 
         return False
     
     async def is_index_existed(self, collection_name: str) -> bool:
+        cached = self.metadata_cache.get(collection_name)
+        if cached is not None and cached.has_index is not None:
+            return cached.has_index
+
         index_name = self.default_index_name(collection_name)
         async with self.db_client() as session:
             async with session.begin():
@@ -151,11 +287,17 @@ class PGVectorProvider(VectorDBInterface):
                                     AND indexname = :index_name
                                     """)
                 results = await session.execute(check_sql, {"index_name": index_name, "collection_name": collection_name})
-                
-                return bool(results.scalar_one_or_none())
+                has_index = bool(results.scalar_one_or_none())
+
+        self.metadata_cache.set(collection_name, has_index=has_index)
+
+        return has_index
             
     async def create_vector_index(self, collection_name: str,
                                         index_type: str = PgVectorIndexTypeEnums.HNSW.value):
+        if collection_name in self.deferred_index_collections:
+            return False
+
         is_index_existed = await self.is_index_existed(collection_name=collection_name)
         if is_index_existed:
             return False
@@ -166,9 +308,7 @@ class PGVectorProvider(VectorDBInterface):
 
         async with self.db_client() as session:
             async with session.begin():
-                count_sql = sql_text(f'SELECT COUNT(*) FROM {collection_name}')
-                result = await session.execute(count_sql)
-                records_count = result.scalar_one()
+                records_count = await self.get_approx_count(collection_name=collection_name, session=session)
 
                 if records_count < self.index_threshold:
                     return False
@@ -177,7 +317,7 @@ class PGVectorProvider(VectorDBInterface):
                 
                 index_name = self.default_index_name(collection_name)
                 create_idx_sql = sql_text(
-                                            f'CREATE INDEX {index_name} ON {collection_name} '
+                                            f'CREATE INDEX IF NOT EXISTS {index_name} ON {collection_name} '
                                             f'USING {index_type} ({PgVectorTableSchemeEnums.VECTOR.value} {self.distance_method})'
                                           )
 
@@ -185,6 +325,8 @@ class PGVectorProvider(VectorDBInterface):
 
                 self.logger.info(f"END: Created vector index for collection: {collection_name}")
 
+        self.metadata_cache.set(collection_name, has_index=True)
+
     async def reset_vector_index(self, collection_name: str, 
                                        index_type: str = PgVectorIndexTypeEnums.HNSW.value) -> bool:
         
@@ -193,9 +335,110 @@ class PGVectorProvider(VectorDBInterface):
             async with session.begin():
                 drop_sql = sql_text(f'DROP INDEX IF EXISTS {index_name}')
                 await session.execute(drop_sql)
+
+        self.metadata_cache.set(collection_name, has_index=False)
         
         return await self.create_vector_index(collection_name=collection_name, index_type=index_type)
 
+    async def drop_vector_index(self, collection_name: str) -> bool:
+        index_name = self.default_index_name(collection_name)
+        async with self.db_client() as session:
+            async with session.begin():
+                drop_sql = sql_text(f'DROP INDEX IF EXISTS {index_name}')
+                await session.execute(drop_sql)
+
+        self.metadata_cache.set(collection_name, has_index=False)
+
+        return True
+
+    async def begin_bulk_load(self, collection_name: str) -> bool:
+        """
+        Drop the vector index and stop maintaining it inline, so a bulk
+        load writes plain heap rows instead of updating the graph per row.
+        """
+        self.deferred_index_collections.add(collection_name)
+        self.logger.info(f"Deferring vector index build for collection: {collection_name}")
+
+        return await self.drop_vector_index(collection_name=collection_name)
+
+    async def finish_bulk_load(self, collection_name: str,
+                               index_type: str = PgVectorIndexTypeEnums.HNSW.value) -> bool:
+        self.deferred_index_collections.discard(collection_name)
+
+        return await self.build_vector_index_concurrently(collection_name=collection_name,
+                                                          index_type=index_type)
+
+    async def release_bulk_load(self, collection_name: str):
+        """
+        Forget this process's deferral without building the index, e.g. after a
+        failed load or in a batch task whose workflow builds the index later.
+        Needed since providers live as long as the worker process.
+        """
+        self.deferred_index_collections.discard(collection_name)
+        return True
+
+    async def build_vector_index_concurrently(self, collection_name: str,
+                                              index_type: str = PgVectorIndexTypeEnums.HNSW.value) -> bool:
+        """
+        Build the vector index once with CREATE INDEX CONCURRENTLY (searches keep
+        working meanwhile), then ANALYZE so the planner sees the new row count.
+        """
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if not is_collection_existed:
+            return False
+
+        is_index_existed = await self.is_index_existed(collection_name=collection_name)
+        if is_index_existed:
+            return False
+
+        records_count = await self.get_approx_count(collection_name=collection_name)
+
+        if records_count < self.index_threshold:
+            return False
+
+        index_name = self.default_index_name(collection_name)
+
+        async with self.db_client() as session:
+            # CONCURRENTLY can not run inside a transaction block
+            connection = await session.connection(
+                execution_options={"isolation_level": "AUTOCOMMIT"}
+            )
+
+            try:
+                # session-scoped settings, reset below before the connection goes back to the pool
+                if self.maintenance_work_mem:
+                    await connection.execute(sql_text("SELECT set_config('maintenance_work_mem', :value, false)"),
+                                             {"value": str(self.maintenance_work_mem)})
+                if self.maintenance_workers is not None:
+                    await connection.execute(sql_text("SELECT set_config('max_parallel_maintenance_workers', :value, false)"),
+                                             {"value": str(int(self.maintenance_workers))})
+
+                self.logger.info(f"START: Building vector index concurrently for collection: {collection_name}")
+
+                create_idx_sql = sql_text(
+                                            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {collection_name} '
+                                            f'USING {index_type} ({PgVectorTableSchemeEnums.VECTOR.value} {self.distance_method})'
+                                          )
+                await connection.execute(create_idx_sql)
+                await connection.execute(sql_text(f'ANALYZE {collection_name}'))
+
+                self.logger.info(f"END: Built vector index for collection: {collection_name}")
+
+                # ANALYZE refreshed reltuples, re-read it next time
+                self.metadata_cache.set(collection_name, has_index=True, approx_count=None)
+
+            except Exception as e:
+                # a failed concurrent build leaves an INVALID index behind
+                self.logger.error(f"Error while building vector index for {collection_name}: {e}")
+                await connection.execute(sql_text(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}'))
+                raise
+
+            finally:
+                await connection.execute(sql_text('RESET maintenance_work_mem'))
+                await connection.execute(sql_text('RESET max_parallel_maintenance_workers'))
+
+        return True
+
     
     async def insert_one(self, collection_name: str, text: str, vector: list,
                             metadata: dict = None,
@@ -226,11 +469,79 @@ class PGVectorProvider(VectorDBInterface):
                 })
                 await session.commit()
 
-                await self.create_vector_index(collection_name=collection_name)
+        self.metadata_cache.add_rows(collection_name, 1)
+        await self.create_vector_index(collection_name=collection_name)
         
         return True
     
 
+    async def get_copy_connection(self, session):
+        """
+        Borrow the raw asyncpg connection behind a session, with the
+        binary pgvector codec registered (once per pooled connection).
+        """
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        if driver_connection not in self._codec_connections:
+            if not self.vector_type_schema:
+                self.vector_type_schema = await driver_connection.fetchval(
+                    "SELECT n.nspname FROM pg_type t "
+                    "JOIN pg_namespace n ON n.oid = t.typnamespace "
+                    "WHERE t.typname = 'vector'"
+                )
+
+            await driver_connection.set_type_codec(
+                "vector", schema=self.vector_type_schema or "public",
+                encoder=encode_pgvector_binary, decoder=decode_pgvector_binary,
+                format="binary",
+            )
+            self._codec_connections.add(driver_connection)
+
+        return driver_connection
+
+    async def copy_many(self, collection_name: str, texts: list,
+                        vectors: list, metadata: list, record_ids: list,
+                        flush_size: int = None) -> int:
+        """
+        Stream rows into the collection table with binary COPY.
+        Vectors are sent as float32 buffers, never formatted as text.
+        """
+        flush_size = flush_size or self.copy_flush_size
+        columns = [
+            PgVectorTableSchemeEnums.TEXT.value,
+            PgVectorTableSchemeEnums.VECTOR.value,
+            PgVectorTableSchemeEnums.METADATA.value,
+            PgVectorTableSchemeEnums.CHUNK_ID.value,
+        ]
+
+        copied_count = 0
+        async with self.db_client() as session:
+            async with session.begin():
+                driver_connection = await self.get_copy_connection(session)
+
+                for i in range(0, len(texts), flush_size):
+                    records = [
+                        (
+                            _text,
+                            np.asarray(_vector, dtype=np.float32),
+                            json.dumps(_metadata, ensure_ascii=False) if _metadata is not None else "{}",
+                            _record_id,
+                        )
+                        for _text, _vector, _metadata, _record_id in zip(
+                            texts[i:i + flush_size], vectors[i:i + flush_size],
+                            metadata[i:i + flush_size], record_ids[i:i + flush_size],
+                        )
+                    ]
+
+                    await driver_connection.copy_records_to_table(
+                        collection_name, records=records, columns=columns
+                    )
+                    copied_count += len(records)
+
+        return copied_count
+
     async def insert_many(self, collection_name: str, texts: list,
                          vectors: list, metadata: list = None,
                          record_ids: list = None, batch_size: int = 50):
@@ -246,6 +557,18 @@ class PGVectorProvider(VectorDBInterface):
         
         if not metadata or len(metadata) == 0:
             metadata = [None] * len(texts)
+
+        if self.insert_mode == PgVectorInsertModeEnums.COPY.value:
+            try:
+                _ = await self.copy_many(collection_name=collection_name, texts=texts,
+                                         vectors=vectors, metadata=metadata,
+                                         record_ids=record_ids)
+                self.metadata_cache.add_rows(collection_name, len(texts))
+                await self.create_vector_index(collection_name=collection_name)
+                return True
+            except Exception as e:
+                # the COPY transaction was rolled back, nothing was written
+                self.logger.warning(f"COPY bulk load failed for {collection_name}, falling back to INSERT: {e}")
         
         async with self.db_client() as session:
             async with session.begin():
@@ -276,11 +599,110 @@ class PGVectorProvider(VectorDBInterface):
                     
                     await session.execute(batch_insert_sql, values)
 
+        self.metadata_cache.add_rows(collection_name, len(texts))
         await self.create_vector_index(collection_name=collection_name)
 
         return True
     
-    async def search_by_vector(self, collection_name: str, vector: list, limit: int):
+    async def get_existing_record_ids(self, collection_name: str, record_ids: list) -> set:
+        """The chunk ids among `record_ids` that already have a row in the collection."""
+        if not record_ids or not await self.is_collection_existed(collection_name):
+            return set()
+
+        async with self.db_client() as session:
+            select_sql = sql_text(f'SELECT {PgVectorTableSchemeEnums.CHUNK_ID.value} FROM {collection_name} '
+                                  f'WHERE {PgVectorTableSchemeEnums.CHUNK_ID.value} = ANY(:record_ids)')
+            result = await session.execute(select_sql, {"record_ids": list(record_ids)})
+            return { row[0] for row in result.fetchall() }
+
+    async def iter_record_ids(self, collection_name: str, page_size: int = 1000):
+        """Yield the collection's chunk ids a page at a time (keyset over the primary key)."""
+        if not await self.is_collection_existed(collection_name):
+            return
+
+        last_id = 0
+        while True:
+            async with self.db_client() as session:
+                select_sql = sql_text(f'SELECT {PgVectorTableSchemeEnums.ID.value}, {PgVectorTableSchemeEnums.CHUNK_ID.value} '
+                                      f'FROM {collection_name} WHERE {PgVectorTableSchemeEnums.ID.value} > :last_id '
+                                      f'ORDER BY {PgVectorTableSchemeEnums.ID.value} LIMIT :page_size')
+                result = await session.execute(select_sql, {"last_id": last_id, "page_size": page_size})
+                rows = result.fetchall()
+
+            if not rows:
+                break
+
+            last_id = rows[-1][0]
+            yield [ row[1] for row in rows ]
+
+            if len(rows) < page_size:
+                break
+
+    async def delete_records(self, collection_name: str, record_ids: list) -> int:
+        if not record_ids or not await self.is_collection_existed(collection_name):
+            return 0
+
+        async with self.db_client() as session:
+            async with session.begin():
+                delete_sql = sql_text(f'DELETE FROM {collection_name} '
+                                      f'WHERE {PgVectorTableSchemeEnums.CHUNK_ID.value} = ANY(:record_ids)')
+                result = await session.execute(delete_sql, {"record_ids": list(record_ids)})
+
+        self.metadata_cache.add_rows(collection_name, -result.rowcount)
+        return result.rowcount
+
+    def set_collection_search_params(self, collection_name: str,
+                                     ef_search: int = None, probes: int = None):
+        """Pin query-time index parameters for one collection."""
+        self.collection_search_params[collection_name] = {
+            PgVectorSearchParamEnums.HNSW_EF_SEARCH.value: ef_search,
+            PgVectorSearchParamEnums.IVFFLAT_PROBES.value: probes,
+        }
+
+    def get_search_params(self, collection_name: str, limit: int,
+                          ef_search: int = None, probes: int = None) -> dict:
+        """
+        Resolve the effective index parameters for a query.
+        Priority: per-query > per-collection > provider default.
+        """
+        collection_params = self.collection_search_params.get(collection_name, {})
+
+        ef_search = ef_search or collection_params.get(PgVectorSearchParamEnums.HNSW_EF_SEARCH.value) \
+                        or self.hnsw_ef_search
+        probes = probes or collection_params.get(PgVectorSearchParamEnums.IVFFLAT_PROBES.value) \
+                        or self.ivfflat_probes
+
+        # hnsw never returns more than ef_search rows, keep it above the limit
+        if ef_search:
+            ef_search = max(int(ef_search), int(limit))
+
+        return {
+            PgVectorSearchParamEnums.HNSW_EF_SEARCH.value: ef_search,
+            PgVectorSearchParamEnums.IVFFLAT_PROBES.value: int(probes) if probes else None,
+        }
+
+    async def apply_search_params(self, session, search_params: dict):
+        # SET LOCAL only lives until the end of the current transaction,
+        # so pooled connections never leak the setting to other queries
+        for param_name, param_value in search_params.items():
+            if param_value:
+                await session.execute(sql_text(f'SET LOCAL {param_name} = {int(param_value)}'))
+
+    def build_search_sql(self, collection_name: str, limit: int):
+        # ORDER BY the raw distance expression (not the score alias) so the
+        # planner can serve it from the index built with the same opclass;
+        # the score is derived from that same distance so both agree
+        distance = f'{PgVectorTableSchemeEnums.VECTOR.value} {self.distance_operator} :vector'
+        score = self.score_expression.format(d=distance)
+        return sql_text(f'SELECT {PgVectorTableSchemeEnums.TEXT.value} as text, '
+                        f'{score} as score'
+                        f' FROM {collection_name}'
+                        f' ORDER BY {distance}'
+                        f' LIMIT {int(limit)}'
+                        )
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                               ef_search: int = None, probes: int = None):
 
         is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
         if not is_collection_existed:
@@ -288,14 +710,13 @@ class PGVectorProvider(VectorDBInterface):
             return False
         
         vector = "[" + ",".join([ str(v) for v in vector ]) + "]"
+        search_params = self.get_search_params(collection_name=collection_name, limit=limit,
+                                               ef_search=ef_search, probes=probes)
         async with self.db_client() as session:
             async with session.begin():
-                search_sql = sql_text(f'SELECT {PgVectorTableSchemeEnums.TEXT.value} as text, 1 - ({PgVectorTableSchemeEnums.VECTOR.value} <=> :vector) as score'
-                                      f' FROM {collection_name}'
-                                      ' ORDER BY score DESC '
-                                      f'LIMIT {limit}'
-                                      )
-                
+                await self.apply_search_params(session, search_params)
+
+                search_sql = self.build_search_sql(collection_name=collection_name, limit=limit)
                 result = await session.execute(search_sql, {"vector": vector})
 
                 records = result.fetchall()
@@ -306,4 +727,56 @@ class PGVectorProvider(VectorDBInterface):
                         score=record.score
                     )
                     for record in records
-                ]
\ No newline at end of file
+                ]
+
+    async def explain_search(self, collection_name: str, vector: list, limit: int,
+                             ef_search: int = None, probes: int = None) -> Optional[dict]:
+        """
+        Run EXPLAIN on the search query and report whether the planner picked the vector index.
+        """
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if not is_collection_existed:
+            self.logger.error(f"Can not explain search for a non-existed collection: {collection_name}")
+            return None
+
+        vector = "[" + ",".join([ str(v) for v in vector ]) + "]"
+        search_params = self.get_search_params(collection_name=collection_name, limit=limit,
+                                               ef_search=ef_search, probes=probes)
+        index_name = self.default_index_name(collection_name)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await self.apply_search_params(session, search_params)
+
+                search_sql = self.build_search_sql(collection_name=collection_name, limit=limit)
+                explain_sql = sql_text(f'EXPLAIN (FORMAT JSON) {search_sql.text}')
+                result = await session.execute(explain_sql, {"vector": vector})
+                plan = result.scalar_one()
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        plan_root = plan[0]["Plan"] if isinstance(plan, list) else plan["Plan"]
+
+        scanned_nodes = []
+        pending_nodes = [plan_root]
+        while pending_nodes:
+            node = pending_nodes.pop()
+            if "Scan" in node.get("Node Type", ""):
+                scanned_nodes.append({
+                    "node_type": node.get("Node Type"),
+                    "index_name": node.get("Index Name"),
+                    "relation_name": node.get("Relation Name"),
+                })
+            pending_nodes.extend(node.get("Plans", []))
+
+        uses_index = any(n["index_name"] == index_name for n in scanned_nodes)
+
+        return {
+            "collection_name": collection_name,
+            "index_name": index_name,
+            "uses_index": uses_index,
+            "scans": scanned_nodes,
+            "search_params": search_params,
+            "total_cost": plan_root.get("Total Cost"),
+        }
@@ -1,6 +1,7 @@
 from qdrant_client import models, QdrantClient
 from ..VectorDBInterface import VectorDBInterface
 from ..VectorDBEnums import DistanceMethodEnums
+from ..CollectionMetadataCache import CollectionMetadataCache
 import logging
 from typing import List
 from models.db_schemes import RetrievedDocument
@@ -8,12 +9,18 @@ from models.db_schemes import RetrievedDocument
 class QdrantDBProvider(VectorDBInterface):
 
     def __init__(self, db_client: str, default_vector_size: int = 786,
-                                     distance_method: str = None, index_threshold: int=100):
+                                     distance_method: str = None, index_threshold: int=100,
+                                     metadata_cache: CollectionMetadataCache = None):
 
         self.client = None
         self.db_client = db_client
         self.distance_method = None
         self.default_vector_size = default_vector_size
+        self.indexing_threshold = 20000 # qdrant default, restored after bulk loads
+        self.metadata_cache = metadata_cache or CollectionMetadataCache()
+
+        # points only carry chunk ids, deleted chunks leave stale points behind
+        self.references_chunks = False
 
         if distance_method == DistanceMethodEnums.COSINE.value:
             self.distance_method = models.Distance.COSINE
@@ -27,9 +34,19 @@ class QdrantDBProvider(VectorDBInterface):
 
     async def disconnect(self):
         self.client = None
+        await self.metadata_cache.close()
 
     async def is_collection_existed(self, collection_name: str) -> bool:
-        return self.client.collection_exists(collection_name=collection_name)
+        cached = self.metadata_cache.get(collection_name)
+        if cached is not None and cached.existed is not None:
+            return cached.existed
+
+        existed = self.client.collection_exists(collection_name=collection_name)
+        # only existence is cached: another process may create the collection any time
+        if existed:
+            self.metadata_cache.set(collection_name, existed=True)
+
+        return existed
     
     async def list_all_collections(self) -> List:
         return self.client.get_collections()
@@ -38,17 +55,19 @@ class QdrantDBProvider(VectorDBInterface):
         return self.client.get_collection(collection_name=collection_name)
     
     async def delete_collection(self, collection_name: str):
-        if self.is_collection_existed(collection_name):
+        if await self.is_collection_existed(collection_name):
             self.logger.info(f"Deleting collection: {collection_name}")
-            return self.client.delete_collection(collection_name=collection_name)
+            result = self.client.delete_collection(collection_name=collection_name)
+            await self.metadata_cache.invalidate(collection_name)
+            return result
         
     async def create_collection(self, collection_name: str, 
                                 embedding_size: int,
                                 do_reset: bool = False):
         if do_reset:
-            _ = self.delete_collection(collection_name=collection_name)
+            _ = await self.delete_collection(collection_name=collection_name)
         
-        if not self.is_collection_existed(collection_name):
+        if not await self.is_collection_existed(collection_name):
             self.logger.info(f"Creating new Qdrant collection: {collection_name}")
             
             _ = self.client.create_collection(
@@ -59,6 +78,10 @@ class QdrantDBProvider(VectorDBInterface):
                 )
             )
 
+            await self.metadata_cache.invalidate(collection_name)
+            self.metadata_cache.set(collection_name, existed=True, dimension=embedding_size,
+                                    approx_count=0)
+
             return True
         
         return False
@@ -67,7 +90,7 @@ class QdrantDBProvider(VectorDBInterface):
                          metadata: dict = None, 
                          record_id: str = None):
         
-        if not self.is_collection_existed(collection_name):
+        if not await self.is_collection_existed(collection_name):
             self.logger.error(f"Can not insert new record to non-existed collection: {collection_name}")
             return False
         
@@ -88,6 +111,7 @@ class QdrantDBProvider(VectorDBInterface):
             self.logger.error(f"Error while inserting batch: {e}")
             return False
 
+        self.metadata_cache.add_rows(collection_name, 1)
         return True
     
     async def insert_many(self, collection_name: str, texts: list, 
@@ -129,14 +153,90 @@ class QdrantDBProvider(VectorDBInterface):
                 self.logger.error(f"Error while inserting batch: {e}")
                 return False
 
+        self.metadata_cache.add_rows(collection_name, len(texts))
         return True
+
+    async def get_existing_record_ids(self, collection_name: str, record_ids: list) -> set:
+        """The point ids among `record_ids` already stored in the collection."""
+        if not record_ids or not await self.is_collection_existed(collection_name):
+            return set()
+
+        records = self.client.retrieve(
+            collection_name=collection_name,
+            ids=list(record_ids),
+            with_payload=False,
+            with_vectors=False,
+        )
+        return { record.id for record in records }
+
+    async def iter_record_ids(self, collection_name: str, page_size: int = 1000):
+        """Yield the collection's point ids a page at a time."""
+        if not await self.is_collection_existed(collection_name):
+            return
+
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=collection_name,
+                limit=page_size,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            if points:
+                yield [ point.id for point in points ]
+
+            if offset is None:
+                break
+
+    async def delete_records(self, collection_name: str, record_ids: list) -> int:
+        if not record_ids or not await self.is_collection_existed(collection_name):
+            return 0
+
+        _ = self.client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=list(record_ids)),
+        )
+
+        self.metadata_cache.add_rows(collection_name, -len(record_ids))
+        return len(record_ids)
         
-    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5):
+    async def begin_bulk_load(self, collection_name: str):
+        # qdrant equivalent of a deferred index: no hnsw build while uploading
+        if not await self.is_collection_existed(collection_name):
+            return False
+
+        self.client.update_collection(
+            collection_name=collection_name,
+            optimizer_config=models.OptimizersConfigDiff(indexing_threshold=0),
+        )
+        return True
+
+    async def finish_bulk_load(self, collection_name: str):
+        if not await self.is_collection_existed(collection_name):
+            return False
+
+        self.client.update_collection(
+            collection_name=collection_name,
+            optimizer_config=models.OptimizersConfigDiff(indexing_threshold=self.indexing_threshold),
+        )
+        return True
+
+    async def release_bulk_load(self, collection_name: str):
+        # the indexing threshold is collection state, nothing is kept per process
+        return True
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               ef_search: int = None, probes: int = None):
+
+        # probes has no qdrant equivalent, ef_search maps to hnsw_ef
+        search_params = models.SearchParams(hnsw_ef=max(ef_search, limit)) if ef_search else None
 
         results = self.client.search(
             collection_name=collection_name,
             query_vector=vector,
-            limit=limit
+            limit=limit,
+            search_params=search_params,
         )
 
         if not results or len(results) == 0:
@@ -149,3 +249,21 @@ class QdrantDBProvider(VectorDBInterface):
             })
             for result in results
         ]
+
+    async def explain_search(self, collection_name: str, vector: list, limit: int = 5,
+                             ef_search: int = None, probes: int = None):
+
+        if not await self.is_collection_existed(collection_name):
+            return None
+
+        # qdrant serves searches from its hnsw graph once segments are indexed
+        collection_info = self.client.get_collection(collection_name=collection_name)
+        indexed_vectors_count = collection_info.indexed_vectors_count or 0
+
+        return {
+            "collection_name": collection_name,
+            "uses_index": indexed_vectors_count > 0,
+            "indexed_vectors_count": indexed_vectors_count,
+            "points_count": collection_info.points_count,
+            "search_params": {"hnsw_ef": max(ef_search, limit) if ef_search else None},
+        }
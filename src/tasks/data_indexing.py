@@ -1,14 +1,17 @@
-from celery_app import celery_app, get_setup_utils
+from celery import uuid
+from celery_app import celery_app, get_setup_utils, release_setup_utils, run_async
 from helpers.config import get_settings
-import asyncio
 from fastapi.responses import JSONResponse
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
 from controllers import NLPController
 from models import ResponseSignal
 from utils.progress_broadcaster import ProgressBroadcaster
+from utils.idempotency_manager import IdempotencyManager
+from stores.vectordb.VectorDBEnums import PgVectorIndexBuildModeEnums
 from tqdm.auto import tqdm
 
+import json
 import logging
 logger = logging.getLogger(__name__)
 
@@ -20,7 +23,7 @@ logger = logging.getLogger(__name__)
 def index_data_content(self, project_id: int, do_reset: int):
 
     logger.warning("index_data_content started")
-    return asyncio.run(
+    return run_async(
         _index_data_content(self, project_id, do_reset)
     )
 
@@ -29,6 +32,7 @@ async def _index_data_content(task_instance, project_id: int, do_reset: int, wor
 
     db_engine, vectordb_client = None, None
     broadcaster = None
+    collection_name, bulk_load_pending = None, False
 
     try:
 
@@ -77,19 +81,39 @@ async def _index_data_content(task_instance, project_id: int, do_reset: int, wor
             template_parser=template_parser,
         )
 
-        has_records = True
-        page_no = 1
         inserted_items_count = 0
-        idx = 0
+
+        # a retry of this task (same celery task id) resumes after the last checkpoint
+        idempotency_manager = IdempotencyManager(db_client, db_engine)
+        task_id = task_instance.request.id
+        task_args = { "project_id": project_id, "do_reset": do_reset }
+
+        checkpoint = None
+        if task_id:
+            checkpoint = await idempotency_manager.get_checkpoint(task_instance.name, task_args, task_id)
+
+        after_chunk_id = checkpoint.get("last_chunk_id") if checkpoint else None
+        resumed_count = checkpoint.get("indexed_chunks", 0) if checkpoint else 0
+        if after_chunk_id:
+            logger.warning(f"Resuming indexing of project {project_id} after chunk {after_chunk_id}")
 
         # create collection if not exists
         collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
 
+        # never drop what the previous attempt already indexed
         _ = await vectordb_client.create_collection(
             collection_name=collection_name,
             embedding_size=embedding_client.embedding_size,
-            do_reset=do_reset,
+            do_reset=do_reset and not after_chunk_id,
+        )
+
+        # full re-index: load every row first, build the vector index once at the end
+        defer_index_build = bool(do_reset) and (
+            get_settings().VECTOR_DB_PGVEC_INDEX_BUILD_MODE == PgVectorIndexBuildModeEnums.DEFERRED.value
         )
+        if defer_index_build:
+            bulk_load_pending = True
+            _ = await vectordb_client.begin_bulk_load(collection_name=collection_name)
 
         # setup batching
         total_chunks_count = await chunk_model.get_total_chunks_count(project_id=project.project_id)
@@ -99,51 +123,100 @@ async def _index_data_content(task_instance, project_id: int, do_reset: int, wor
         if workflow_id and broadcaster:
             await broadcaster.start_embedding(workflow_id, project_id, total_chunks_count)
 
-        while has_records:
-            page_chunks = await chunk_model.get_poject_chunks(project_id=project.project_id, page_no=page_no)
-            if len(page_chunks):
-                page_no += 1
-            
-            if not page_chunks or len(page_chunks) == 0:
-                has_records = False
-                break
-
-            chunks_ids =  [ c.data_chunk_id for c in page_chunks ]
-            idx += len(page_chunks)
-            
-            is_inserted = await nlp_controller.index_into_vector_db(
-                project=project,
-                chunks=page_chunks,
-                chunks_ids=chunks_ids
-            )
+        # chunks found already indexed count as done
+        skipped_count = 0
 
-            if not is_inserted:
-                
+        async def on_progress(chunks_embedded: int):
+            chunks_embedded = min(chunks_embedded + resumed_count + skipped_count, total_chunks_count)
+            pbar.update(chunks_embedded - pbar.n)
 
-                task_instance.update_state(
-                    state="FAILURE",
-                    meta={
-                        "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
-                    }
-                )
-                
-                # Update workflow progress to failure
-                if workflow_id and broadcaster:
-                    await broadcaster.fail_workflow(workflow_id, project_id, "Failed to insert into vector database")
-
-                raise Exception(f"can not insert into vectorDB | project_id: {project_id}")
-
-            pbar.update(len(page_chunks))
-            inserted_items_count += len(page_chunks)
-            
             # Update embedding progress
             if workflow_id and broadcaster:
                 await broadcaster.update_embedding(
                     workflow_id=workflow_id,
                     project_id=project_id,
-                    chunks_embedded=inserted_items_count,
+                    chunks_embedded=chunks_embedded,
                     total_chunks=total_chunks_count
                 )
+
+        checkpoint_interval = get_settings().VECTOR_DB_INDEXING_CHECKPOINT_INTERVAL
+        last_checkpoint_count = 0
+
+        async def on_checkpoint(last_chunk_id: int, indexed_chunks: int):
+            nonlocal last_checkpoint_count
+            if not task_id or indexed_chunks - last_checkpoint_count < checkpoint_interval:
+                return
+
+            last_checkpoint_count = indexed_chunks
+            await idempotency_manager.save_checkpoint(task_instance.name, task_args, task_id, {
+                "last_chunk_id": last_chunk_id,
+                "indexed_chunks": resumed_count + indexed_chunks,
+            })
+
+        page_size = get_settings().VECTOR_DB_INDEXING_PAGE_SIZE
+        chunk_pages = chunk_model.iter_project_chunks(project_id=project.project_id,
+                                                      page_size=page_size,
+                                                      after_chunk_id=after_chunk_id)
+
+        async def unindexed_chunk_pages():
+            # incremental runs embed only what the collection lacks; after a resume,
+            # batches past the checkpoint may have been written before the failure
+            nonlocal skipped_count
+            async for page_chunks in chunk_pages:
+                existing_ids = await vectordb_client.get_existing_record_ids(
+                    collection_name=collection_name,
+                    record_ids=[ c.data_chunk_id for c in page_chunks ],
+                )
+                skipped_count += len(existing_ids)
+                page_chunks = [ c for c in page_chunks if c.data_chunk_id not in existing_ids ]
+                if page_chunks:
+                    yield page_chunks
+
+        incremental = not do_reset or bool(after_chunk_id)
+
+        # read -> embed -> write run concurrently, connected by bounded queues
+        deleted_items_count = 0
+        try:
+            inserted_items_count = await nlp_controller.index_chunks_pipelined(
+                project=project,
+                chunk_pages=unindexed_chunk_pages() if incremental else chunk_pages,
+                on_progress=on_progress,
+                on_checkpoint=on_checkpoint,
+            )
+            inserted_items_count += resumed_count
+
+            # pgvector rows reference their chunk, only other backends can go stale
+            if not do_reset and not vectordb_client.references_chunks:
+                deleted_items_count = await _delete_stale_vectors(vectordb_client, chunk_model,
+                                                                  project.project_id, collection_name,
+                                                                  page_size=page_size)
+        except Exception as e:
+
+            task_instance.update_state(
+                state="FAILURE",
+                meta={
+                    "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
+                }
+            )
+            
+            # Update workflow progress to failure
+            if workflow_id and broadcaster:
+                await broadcaster.fail_workflow(workflow_id, project_id, "Failed to insert into vector database")
+
+            raise Exception(f"can not insert into vectorDB | project_id: {project_id} | {e}")
+
+        if defer_index_build:
+            if workflow_id and broadcaster:
+                await broadcaster.start_indexing(workflow_id, project_id, collection_name)
+
+            bulk_load_pending = False
+            _ = await vectordb_client.finish_bulk_load(collection_name=collection_name)
+
+            if workflow_id and broadcaster:
+                await broadcaster.complete_indexing(workflow_id, project_id, collection_name)
+
+        # new vectors: let the API drop cached metadata and search results for this collection
+        await vectordb_client.metadata_cache.invalidate(collection_name)
         
 
         task_instance.update_state(
@@ -155,7 +228,8 @@ async def _index_data_content(task_instance, project_id: int, do_reset: int, wor
 
         result = {
                 "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
-                "inserted_items_count": inserted_items_count
+                "inserted_items_count": inserted_items_count,
+                "deleted_items_count": deleted_items_count,
         }
         
         # Note: The workflow completion is handled by push_after_process_task
@@ -167,11 +241,288 @@ async def _index_data_content(task_instance, project_id: int, do_reset: int, wor
         logger.error(f"Task failed: {str(e)}")
         raise
     finally:
+        if bulk_load_pending:
+            await abort_bulk_load(vectordb_client, collection_name)
+
         try:
-            if db_engine:
-                await db_engine.dispose()
-            
-            if vectordb_client:
-                await vectordb_client.disconnect()
+            await release_setup_utils(db_engine, vectordb_client)
         except Exception as e:
-            logger.error(f"Task failed while cleaning: {str(e)}")
\ No newline at end of file
+            logger.error(f"Task failed while cleaning: {str(e)}")
+
+
+async def abort_bulk_load(vectordb_client, collection_name: str):
+    """
+    After a failed deferred load: stop deferring and build the vector index
+    over the rows loaded so far, so searches do not go without one until a
+    retry finishes the load.
+    """
+    try:
+        _ = await vectordb_client.finish_bulk_load(collection_name=collection_name)
+    except Exception as e:
+        logger.error(f"Could not restore the vector index of {collection_name}: {str(e)}")
+    finally:
+        _ = await vectordb_client.release_bulk_load(collection_name=collection_name)
+
+
+async def _delete_stale_vectors(vectordb_client, chunk_model, project_id: int,
+                                collection_name: str, page_size: int = 500) -> int:
+    """Delete the vectors whose chunk no longer exists in data_chunks. Returns how many."""
+    deleted_count = 0
+    stale_ids = []
+
+    async for record_ids in vectordb_client.iter_record_ids(collection_name=collection_name,
+                                                            page_size=page_size):
+        existing_ids = await chunk_model.get_existing_chunk_ids(project_id=project_id,
+                                                                chunk_ids=record_ids)
+        stale_ids.extend(i for i in record_ids if i not in existing_ids)
+
+    # deleted after the scan, so paging never skips over removed rows
+    for i in range(0, len(stale_ids), page_size):
+        deleted_count += await vectordb_client.delete_records(collection_name=collection_name,
+                                                              record_ids=stale_ids[i:i + page_size])
+
+    if deleted_count:
+        logger.warning(f"Deleted {deleted_count} stale vectors from {collection_name}")
+
+    return deleted_count
+
+
+@celery_app.task(
+                 bind=True, name="tasks.data_indexing.index_chunk_batch",
+                 autoretry_for=(Exception,),
+                 retry_kwargs={'max_retries': 3, 'countdown': 60}
+                )
+def index_chunk_batch(self, project_id: int, chunk_ids: list, defer_index_build: bool = False,
+                      run_id: str = None):
+
+    result = run_async(
+        _index_chunk_batch(self, project_id, chunk_ids, defer_index_build=defer_index_build)
+    )
+
+    # free this batch's slot for the next queued batch of its run
+    StreamedIndexing.pump(run_id, released=1)
+
+    return result
+
+
+async def _index_chunk_batch(task_instance, project_id: int, chunk_ids: list,
+                             defer_index_build: bool = False):
+    """Embed and insert one batch of already committed chunks (streaming workflows)."""
+
+    db_engine, vectordb_client = None, None
+
+    try:
+
+        (db_engine, db_client, llm_provider_factory, 
+        vectordb_provider_factory,
+        generation_client, embedding_client,
+        vectordb_client, template_parser) = await get_setup_utils()
+
+        project_model = await ProjectModel.create_instance(
+            db_client=db_client
+        )
+
+        chunk_model = await ChunkModel.create_instance(
+            db_client=db_client
+        )
+
+        project = await project_model.get_project_or_create_one(
+            project_id=project_id
+        )
+
+        nlp_controller = NLPController(
+            vectordb_client=vectordb_client,
+            generation_client=generation_client,
+            embedding_client=embedding_client,
+            template_parser=template_parser,
+        )
+
+        collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
+
+        # the chunking task created the collection, this only makes sure it exists
+        _ = await vectordb_client.create_collection(
+            collection_name=collection_name,
+            embedding_size=embedding_client.embedding_size,
+            do_reset=False,
+        )
+
+        # the index is built once by the final workflow step
+        if defer_index_build:
+            _ = await vectordb_client.begin_bulk_load(collection_name=collection_name)
+
+        # a retried batch skips the chunks its failed attempt already wrote
+        existing_ids = await vectordb_client.get_existing_record_ids(
+            collection_name=collection_name, record_ids=chunk_ids
+        )
+        records = await chunk_model.get_chunks_by_ids(
+            project_id=project.project_id,
+            chunk_ids=[ i for i in chunk_ids if i not in existing_ids ]
+        )
+
+        async def chunk_pages():
+            if records:
+                yield records
+
+        try:
+            inserted_items_count = await nlp_controller.index_chunks_pipelined(
+                project=project,
+                chunk_pages=chunk_pages(),
+            )
+        finally:
+            # the provider outlives this task, leave the deferral to the final step
+            if defer_index_build:
+                _ = await vectordb_client.release_bulk_load(collection_name=collection_name)
+
+        return {
+            "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
+            "inserted_items_count": inserted_items_count
+        }
+
+    except Exception as e:
+        logger.error(f"Batch indexing failed: {str(e)}")
+        raise
+    finally:
+        try:
+            await release_setup_utils(db_engine, vectordb_client)
+        except Exception as e:
+            logger.error(f"Task failed while cleaning: {str(e)}")
+
+
+class StreamedIndexing:
+    """
+    Hands committed chunk ids over to index_chunk_batch tasks while chunking
+    goes on.
+
+    The chunking task never waits for its batches: a task must not block on
+    another task's result, polling included (with every worker slot running
+    a chunking task, the batches could never be scheduled). The ids of the
+    batches travel with the chunking result instead, and the final workflow
+    step joins them with join() without holding a slot meanwhile.
+
+    At most FILE_PROCESSING_STREAM_MAX_IN_FLIGHT batches of a run are queued
+    or running at once. The others wait in a redis list of the result backend
+    and are sent by whoever frees a slot: the chunking task after adding one,
+    or a batch when it completes. Their task ids are assigned upfront so
+    join() knows them before they are sent. Without a redis result backend,
+    every batch is sent right away.
+    """
+
+    key_ttl = 86400
+
+    # pop batches while the run has free slots, a completed batch frees its own first
+    pump_script = """
+        local released = tonumber(ARGV[2])
+        if released > 0 and tonumber(redis.call('GET', KEYS[2]) or '0') > 0 then
+            redis.call('DECRBY', KEYS[2], released)
+        end
+        local started = {}
+        while tonumber(redis.call('GET', KEYS[2]) or '0') < tonumber(ARGV[1]) do
+            local batch = redis.call('LPOP', KEYS[1])
+            if not batch then break end
+            redis.call('INCR', KEYS[2])
+            table.insert(started, batch)
+        end
+        redis.call('EXPIRE', KEYS[1], ARGV[3])
+        redis.call('EXPIRE', KEYS[2], ARGV[3])
+        return started
+    """
+
+    def __init__(self, project_id: int, defer_index_build: bool = False):
+        self.project_id = project_id
+        self.defer_index_build = defer_index_build
+        self.run_id = uuid()
+
+        self.batch_ids = []
+        self.dispatched_chunks = 0
+
+    def dispatch(self, chunk_ids: list):
+        if not chunk_ids:
+            return
+
+        batch = {
+            "task_id": uuid(),
+            "project_id": self.project_id,
+            "chunk_ids": chunk_ids,
+            "defer_index_build": self.defer_index_build,
+            "run_id": self.run_id,
+        }
+        self.batch_ids.append(batch["task_id"])
+        self.dispatched_chunks += len(chunk_ids)
+
+        redis_client = StreamedIndexing.get_redis_client()
+        if redis_client is None:
+            StreamedIndexing.send(batch)
+            return
+
+        redis_client.rpush(StreamedIndexing.queue_key(self.run_id), json.dumps(batch))
+        StreamedIndexing.pump(self.run_id)
+
+    @staticmethod
+    def pump(run_id: str, released: int = 0):
+        """Free `released` slots of the run, then send queued batches into the free ones."""
+        redis_client = StreamedIndexing.get_redis_client()
+        if redis_client is None or not run_id:
+            return
+
+        queue_key = StreamedIndexing.queue_key(run_id)
+        in_flight_key = f"{queue_key}:in_flight"
+        started = redis_client.eval(
+            StreamedIndexing.pump_script, 2, queue_key, in_flight_key,
+            max(1, get_settings().FILE_PROCESSING_STREAM_MAX_IN_FLIGHT), released,
+            StreamedIndexing.key_ttl,
+        )
+
+        for i, raw_batch in enumerate(started):
+            try:
+                StreamedIndexing.send(json.loads(raw_batch))
+            except Exception:
+                # hand the unsent batches and their slots back
+                unsent = started[i:]
+                redis_client.lpush(queue_key, *reversed(unsent))
+                redis_client.decrby(in_flight_key, len(unsent))
+                raise
+
+    @staticmethod
+    def send(batch: dict):
+        index_chunk_batch.apply_async(
+            args=(batch["project_id"], batch["chunk_ids"]),
+            kwargs={
+                "defer_index_build": batch["defer_index_build"],
+                "run_id": batch.get("run_id"),
+            },
+            task_id=batch["task_id"],
+        )
+
+    @staticmethod
+    def queue_key(run_id: str) -> str:
+        return f"streamed_indexing:{run_id}"
+
+    @staticmethod
+    def get_redis_client():
+        result_backend = get_settings().CELERY_RESULT_BACKEND or ""
+        if not result_backend.startswith(("redis://", "rediss://")):
+            return None
+
+        return celery_app.backend.client
+
+    @staticmethod
+    def join(batch_ids: list):
+        """
+        Check the batches without waiting: (ids still unfinished, chunks
+        inserted by the finished ones, error of a failed batch or None).
+        Batches still queued in redis count as unfinished.
+        """
+        pending_ids = []
+        inserted_items_count = 0
+        for batch_id in batch_ids:
+            result = celery_app.AsyncResult(batch_id)
+            if not result.ready():
+                pending_ids.append(batch_id)
+                continue
+
+            if result.failed():
+                return pending_ids, inserted_items_count, f"Indexing batch {batch_id} failed: {result.result}"
+
+            inserted_items_count += (result.result or {}).get("inserted_items_count", 0)
+
+        return pending_ids, inserted_items_count, None
@@ -0,0 +1,174 @@
+from celery import chord, group, uuid
+from celery_app import celery_app, get_setup_utils, release_setup_utils, run_async
+from controllers import EDAController
+from models.AssetModel import AssetModel
+from stores.logparser.LogSummary import LogSummary, summarize_file_range
+import os
+
+import logging
+logger = logging.getLogger(__name__)
+
+@celery_app.task(
+                 bind=True, name="tasks.eda.analyze_log_file",
+                 autoretry_for=(Exception,),
+                 retry_kwargs={'max_retries': 3, 'countdown': 60}
+                )
+def analyze_log_file(self, project_id: str, file_id: str, log_format: str = None,
+                     parallel_workers: int = 0):
+    """
+    EDA of a log file in the background, the result is the payload of the
+    /eda endpoint. Progress goes to the task state (PROGRESS, current/total).
+    The result is persisted in the asset config (see EDAController.cache_entry),
+    and a persisted result still matching the file is returned without a scan.
+
+    With `parallel_workers` > 1 the file is cut into that many newline-aligned
+    ranges, scanned by one scan_log_range task each (on any worker process),
+    and this task is replaced by the chord merging them: its id ends up
+    holding the merged result, and progress counts the ranges done.
+    Otherwise the file is scanned here and progress counts bytes.
+    """
+    eda_controller = EDAController(project_id=project_id, file_id=file_id, log_format=log_format)
+    if not os.path.exists(eda_controller.file_path):
+        return {"error": f"File not found: {eda_controller.file_path}"}
+
+    cache = run_async(_asset_eda_cache(project_id, file_id))
+    fingerprint = eda_controller.validate_cache(cache)
+    if fingerprint is not None:
+        logger.info(f"EDA of {file_id} is up to date")
+        if fingerprint != cache["fingerprint"]:
+            run_async(_asset_eda_cache(project_id, file_id, { **cache, "fingerprint": fingerprint }))
+        return cache["result"]
+
+    log_format = eda_controller.resolve_log_format()
+    # taken before the scan, a file growing meanwhile only looks stale
+    fingerprint = eda_controller.fingerprint()
+
+    ranges = eda_controller.split_ranges(parallel_workers) if parallel_workers > 1 else []
+    if len(ranges) > 1:
+        range_task_ids = [ uuid() for _ in ranges ]
+
+        self.update_state(
+            state="PROGRESS",
+            meta={
+                "current": 0,
+                "total": len(ranges),
+                "status": f"Scanning {len(ranges)} byte ranges",
+            }
+        )
+
+        raise self.replace(chord(
+            group(
+                scan_log_range.s(project_id, file_id, start, stop, log_format,
+                                 self.request.id, range_task_ids).set(task_id=task_id)
+                for (start, stop), task_id in zip(ranges, range_task_ids)
+            ),
+            merge_log_ranges.s(project_id, file_id, log_format, fingerprint)
+        ))
+
+    def on_progress(done: int, total: int):
+        self.update_state(
+            state="PROGRESS",
+            meta={
+                "current": done,
+                "total": total,
+                "status": "Scanning log file",
+            }
+        )
+
+    summary = eda_controller.summarize(on_progress=on_progress)
+    logger.info(f"EDA of {file_id} finished: {summary.lines} lines, {summary.total_requests} requests")
+
+    return _save_result(eda_controller, fingerprint, summary)
+
+@celery_app.task(
+                 bind=True, name="tasks.eda.scan_log_range",
+                 autoretry_for=(Exception,),
+                 retry_kwargs={'max_retries': 3, 'countdown': 60}
+                )
+def scan_log_range(self, project_id: str, file_id: str, start: int, stop: int, log_format: str,
+                   parent_task_id: str, range_task_ids: list):
+    """Summarize one byte range of a log file, returned as LogSummary.to_dict()."""
+    eda_controller = EDAController(project_id=project_id, file_id=file_id, log_format=log_format)
+
+    summary = summarize_file_range(eda_controller.file_path, start, stop, log_format,
+                                   block_size=eda_controller.block_size)
+
+    # report on the replaced task's id, the one the client polls; this range
+    # is done although its own result is only stored once it returns
+    done = 1 + sum(
+        1 for task_id in range_task_ids
+        if task_id != self.request.id and celery_app.AsyncResult(task_id).ready()
+    )
+    celery_app.backend.store_result(
+        parent_task_id,
+        {
+            "current": done,
+            "total": len(range_task_ids),
+            "status": f"Scanned {done} of {len(range_task_ids)} byte ranges",
+        },
+        "PROGRESS"
+    )
+
+    return summary.to_dict()
+
+@celery_app.task(
+                 bind=True, name="tasks.eda.merge_log_ranges",
+                 autoretry_for=(Exception,),
+                 retry_kwargs={'max_retries': 3, 'countdown': 60}
+                )
+def merge_log_ranges(self, range_summaries: list, project_id: str, file_id: str, log_format: str,
+                     fingerprint: dict = None):
+    """Chord callback: merge the range summaries into the EDA payload."""
+    summary = LogSummary()
+    for range_summary in range_summaries:
+        summary.merge(LogSummary.from_dict(range_summary))
+
+    logger.info(f"EDA of {file_id} merged from {len(range_summaries)} ranges: "
+                f"{summary.lines} lines, {summary.total_requests} requests")
+
+    eda_controller = EDAController(project_id=project_id, file_id=file_id, log_format=log_format)
+    return _save_result(eda_controller, fingerprint, summary)
+
+def _save_result(eda_controller: EDAController, fingerprint: dict, summary: LogSummary) -> dict:
+    result = eda_controller.render(summary)
+    if fingerprint is not None and "error" not in result:
+        run_async(_asset_eda_cache(eda_controller.project_id, eda_controller.file_id,
+                                   eda_controller.cache_entry(fingerprint, result)))
+    return result
+
+async def _asset_eda_cache(project_id: str, file_id: str, entry: dict = None):
+    """The EDA entry persisted in the file's asset config, replaced by `entry` when given."""
+    if not str(project_id).isdigit():
+        return None
+
+    db_engine, vectordb_client = None, None
+
+    try:
+
+        (db_engine, db_client, llm_provider_factory,
+        vectordb_provider_factory,
+        generation_client, embedding_client,
+        vectordb_client, template_parser) = await get_setup_utils()
+
+        asset_model = await AssetModel.create_instance(
+            db_client=db_client
+        )
+
+        asset_record = await asset_model.get_asset_record(
+            asset_project_id=int(project_id),
+            asset_name=file_id
+        )
+        if asset_record is None:
+            return None
+
+        if entry is not None:
+            await asset_model.update_asset_config(asset_record.asset_id, eda=entry)
+            return entry
+
+        return (asset_record.asset_config or {}).get("eda")
+
+    finally:
+        try:
+            await release_setup_utils(db_engine, vectordb_client)
+        except Exception as e:
+            logger.error(f"Task failed while cleaning: {str(e)}")
@@ -1,16 +1,16 @@
-from celery_app import celery_app, get_setup_utils
+from celery_app import celery_app, get_setup_utils, release_setup_utils, run_async
 from helpers.config import get_settings
-import asyncio
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
 from models.AssetModel import AssetModel
-from models.db_schemes import DataChunk
 from models import ResponseSignal
 from models.enums.AssetTypeEnum import AssetTypeEnum
 from controllers import ProcessController
 from controllers import NLPController
 from utils.idempotency_manager import IdempotencyManager
 from utils.progress_broadcaster import ProgressBroadcaster, get_parent_workflow_id
+from stores.vectordb.VectorDBEnums import PgVectorIndexBuildModeEnums
+from tasks.data_indexing import StreamedIndexing, abort_bulk_load
 
 import logging
 logger = logging.getLogger(__name__)
@@ -23,22 +23,43 @@ logger = logging.getLogger(__name__)
 def process_project_files(self, project_id: int, 
                           file_id: int, chunk_size: int,
                           overlap_size: int, do_reset: int, chunking_method:str,
-                          workflow_id: str = None):
+                          workflow_id: str = None, per_file_progress: bool = False,
+                          stream_to_index: bool = False, defer_index_build: bool = None):
 
-    return asyncio.run(
+    return run_async(
         _process_project_files(self, project_id, file_id, chunk_size,
                                overlap_size, do_reset, chunking_method,
-                               workflow_id=workflow_id)
+                               workflow_id=workflow_id,
+                               per_file_progress=per_file_progress,
+                               stream_to_index=stream_to_index,
+                               defer_index_build=defer_index_build)
     )
 
 
 async def _process_project_files(task_instance, project_id: int, 
                                  file_id: int, chunk_size: int,
                                  overlap_size: int, do_reset: int, chunking_method: str,
-                                 workflow_id: str = None):
+                                 workflow_id: str = None, per_file_progress: bool = False,
+                                 stream_to_index: bool = False, defer_index_build: bool = None):
+    """
+    Chunk the project files (or only `file_id`) into data_chunks.
+
+    With `per_file_progress`, this task is one file of a workflow fanned out
+    per file: it reports into the workflow's per-file progress instead of
+    driving the whole chunking step.
+
+    With `stream_to_index`, every committed batch of chunks is handed to an
+    index_chunk_batch task, at most FILE_PROCESSING_STREAM_MAX_IN_FLIGHT of
+    them at once. The task does not wait for them, their ids are returned
+    (index_batch_ids) for finish_streamed_workflow to join.
+
+    A retry of this task first deletes the chunks (and their vectors) its
+    failed attempt inserted, so files are not chunked twice.
+    """
 
     
     db_engine, vectordb_client = None, None
+    collection_name, bulk_load_pending = None, False
     broadcaster = None
     
     try:
@@ -156,6 +177,9 @@ async def _process_project_files(task_instance, project_id: int,
             project_files_ids = {
                 asset_record.asset_id: asset_record.asset_name
             }
+            project_files_formats = {
+                asset_record.asset_id: (asset_record.asset_config or {}).get("log_format")
+            }
         
         else:
             
@@ -169,6 +193,10 @@ async def _process_project_files(task_instance, project_id: int,
                 record.asset_id: record.asset_name
                 for record in project_files
             }
+            project_files_formats = {
+                record.asset_id: (record.asset_config or {}).get("log_format")
+                for record in project_files
+            }
 
         if len(project_files_ids) == 0:
 
@@ -211,48 +239,145 @@ async def _process_project_files(task_instance, project_id: int,
             _ = await chunk_model.delete_chunks_by_project_id(
                 project_id=project.project_id
             )
+        elif task_instance.request.id:
+            # the first attempt notes the last chunk id before it, a retry
+            # drops the chunks its failed attempts inserted for these files
+            attempt = await idempotency_manager.get_checkpoint(task_name, task_args, task_instance.request.id)
+            if attempt and attempt.get("after_chunk_id") is not None:
+                collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
+                _ = await delete_attempt_chunks(vectordb_client, chunk_model, project.project_id,
+                                                list(project_files_ids.keys()), collection_name,
+                                                after_chunk_id=attempt["after_chunk_id"])
+            else:
+                await idempotency_manager.save_checkpoint(task_name, task_args, task_instance.request.id, {
+                    "after_chunk_id": await chunk_model.get_last_chunk_id(project_id=project.project_id),
+                })
         
+        streamed_indexing = None
+        if stream_to_index:
+            if defer_index_build is None:
+                defer_index_build = bool(do_reset) and (
+                    settings.VECTOR_DB_PGVEC_INDEX_BUILD_MODE == PgVectorIndexBuildModeEnums.DEFERRED.value
+                )
+
+            # batches are inserted while chunking goes on, the collection has to exist first
+            collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
+            _ = await vectordb_client.create_collection(
+                collection_name=collection_name,
+                embedding_size=embedding_client.embedding_size,
+                do_reset=False,
+            )
+            if defer_index_build:
+                bulk_load_pending = True
+                _ = await vectordb_client.begin_bulk_load(collection_name=collection_name)
+
+            streamed_indexing = StreamedIndexing(
+                project_id=project.project_id,
+                defer_index_build=defer_index_build,
+            )
+
+        async def insert_records(records: list) -> list:
+            chunk_ids = await chunk_model.insert_many_chunks(chunks=records)
+            if streamed_indexing:
+                streamed_indexing.dispatch(chunk_ids)
+            return chunk_ids
+
         # Start chunking phase - update progress
-        if workflow_id and broadcaster:
+        if workflow_id and broadcaster and not per_file_progress:
             await broadcaster.start_chunking(workflow_id, project_id, total_files)
 
         for asset_id, file_id in project_files_ids.items():
 
-            file_content = process_controller.get_file_content(file_id=file_id)
-
-            if file_content is None:
-                logger.error(f"Error while processing file: {file_id}")
-                continue
+            # files uploaded before format detection get theirs detected once here
+            log_format = project_files_formats.get(asset_id)
+            if log_format is None:
+                log_format = process_controller.detect_log_format(
+                    file_id=file_id,
+                    sample_lines=settings.LOG_FORMAT_DETECTION_LINES
+                )
+                if log_format is not None:
+                    await asset_model.update_asset_config(asset_id, log_format=log_format)
 
-            file_chunks = process_controller.process_file_content(
-                file_content=file_content,
+            # chunks are produced while the file is read, never held all at once
+            tail_state = {}
+            file_chunks = process_controller.iter_file_chunks(
                 file_id=file_id,
                 chunk_size=chunk_size,
                 overlap_size=overlap_size,
-                chunking_method=chunking_method
+                chunking_method=chunking_method,
+                block_size=settings.FILE_PROCESSING_BLOCK_SIZE,
+                parallel_workers=settings.FILE_PROCESSING_PARALLEL_WORKERS,
+                range_size=settings.FILE_PROCESSING_RANGE_SIZE,
+                tail_state=tail_state,
+                log_format=log_format
             )
 
-            if file_chunks is None or len(file_chunks) == 0:
-                
+            if file_chunks is None:
+                logger.error(f"Error while processing file: {file_id}")
+                continue
+
+            file_records = 0
+            file_chunk_ids = []
+            file_chunks_records = []
+            for chunk in file_chunks:
+                file_chunks_records.append({
+                    "chunk_text": chunk.page_content,
+                    "chunk_metadata": chunk.metadata,
+                    "chunk_order": file_records + len(file_chunks_records) + 1,
+                    "chunk_project_id": project.project_id,
+                    "chunk_asset_id": asset_id,
+                })
+
+                if len(file_chunks_records) >= settings.FILE_PROCESSING_INSERT_BATCH_SIZE:
+                    file_chunk_ids = await insert_records(file_chunks_records)
+                    file_records += len(file_chunk_ids)
+                    file_chunks_records = []
+
+                    if workflow_id and broadcaster and per_file_progress:
+                        await broadcaster.update_file_chunking(
+                            workflow_id=workflow_id,
+                            project_id=project_id,
+                            file_id=file_id,
+                            chunks_created=file_records
+                        )
+
+            if file_chunks_records:
+                file_chunk_ids = await insert_records(file_chunks_records)
+                file_records += len(file_chunk_ids)
+
+            if file_records == 0:
                 logger.error(f"No chunks for file_id: {file_id}")
-                pass
-
-            file_chunks_records = [
-                DataChunk(
-                    chunk_text=chunk.page_content,
-                    chunk_metadata=chunk.metadata,
-                    chunk_order=i+1,
-                    chunk_project_id=project.project_id,
-                    chunk_asset_id=asset_id
-                )
-                for i, chunk in enumerate(file_chunks)
-            ]
 
-            no_records += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
+            # where append_file_tail picks the file up when it grows: it
+            # re-chunks the last chunk, still open, together with the new lines
+            if "end_offset" in tail_state:
+                end_offset = tail_state["end_offset"]
+                has_open_chunk = tail_state.get("open_offset") is not None and bool(file_chunk_ids)
+                await asset_model.update_asset_config(asset_id, tail={
+                    "offset": tail_state["open_offset"] if has_open_chunk else end_offset,
+                    "end_offset": end_offset,
+                    "last_line_hash": process_controller.get_last_line_hash(file_id, end_offset),
+                    "open_chunk_id": file_chunk_ids[-1] if has_open_chunk else None,
+                    "closed_chunks": file_records - (1 if has_open_chunk else 0),
+                    "seed": tail_state.get("seed"),
+                    "chunk_size": chunk_size,
+                    "overlap_size": overlap_size,
+                    "chunking_method": chunking_method,
+                })
+
+            no_records += file_records
             no_files += 1
             
             # Update chunking progress
-            if workflow_id and broadcaster:
+            if workflow_id and broadcaster and per_file_progress:
+                await broadcaster.update_file_chunking(
+                    workflow_id=workflow_id,
+                    project_id=project_id,
+                    file_id=file_id,
+                    chunks_created=file_records,
+                    completed=True
+                )
+            elif workflow_id and broadcaster:
                 await broadcaster.update_chunking(
                     workflow_id=workflow_id,
                     project_id=project_id,
@@ -260,7 +385,11 @@ async def _process_project_files(task_instance, project_id: int,
                     total_files=total_files,
                     chunks_created=no_records
                 )
-                
+
+        # Mark chunking as complete
+        if workflow_id and broadcaster and not per_file_progress:
+            await broadcaster.complete_chunking(workflow_id, project_id, no_records)
+
         task_instance.update_state(
             state="SUCCESS",
             meta={
@@ -274,15 +403,10 @@ async def _process_project_files(task_instance, project_id: int,
             result={"signal": ResponseSignal.PROCESSING_SUCCESS.value}
         )
         
-        # Mark chunking as complete
-        if workflow_id and broadcaster:
-            await broadcaster.complete_chunking(workflow_id, project_id, no_records)
-
-
-
         return {
                     "signal": ResponseSignal.PROCESSING_SUCCESS.value,
                     "inserted_chunks": no_records,
+                    "index_batch_ids": streamed_indexing.batch_ids if streamed_indexing else [],
                     "processed_files": no_files,
                     "project_id": project_id,
                     "do_reset": do_reset,
@@ -291,6 +415,11 @@ async def _process_project_files(task_instance, project_id: int,
     
     except Exception as e:
         logger.error(f"Task failed: {str(e)}")
+
+        # the index was dropped for this load and the final step will not run
+        if bulk_load_pending:
+            bulk_load_pending = False
+            await abort_bulk_load(vectordb_client, collection_name)
         
         # Update workflow progress to failure
         if workflow_id and broadcaster:
@@ -302,10 +431,231 @@ async def _process_project_files(task_instance, project_id: int,
         raise
     finally:
         try:
-            if db_engine:
-                await db_engine.dispose()
-            
-            if vectordb_client:
-                await vectordb_client.disconnect()
+            # the provider outlives this task, leave the deferral to the final step
+            if bulk_load_pending:
+                _ = await vectordb_client.release_bulk_load(collection_name=collection_name)
+            await release_setup_utils(db_engine, vectordb_client)
+        except Exception as e:
+            logger.error(f"Task failed while cleaning: {str(e)}")
+
+async def delete_attempt_chunks(vectordb_client, chunk_model, project_id: int, asset_ids: list,
+                                collection_name: str, after_chunk_id: int, batch_size: int = 1000) -> int:
+    """
+    Delete the chunks of `asset_ids` above `after_chunk_id`, vectors first
+    (pgvector rows reference their chunk). Returns how many chunks.
+    """
+    chunk_ids = await chunk_model.get_asset_chunk_ids(project_id=project_id, asset_ids=asset_ids,
+                                                      after_chunk_id=after_chunk_id)
+
+    deleted_count = 0
+    for i in range(0, len(chunk_ids), batch_size):
+        batch = chunk_ids[i:i + batch_size]
+        _ = await vectordb_client.delete_records(collection_name=collection_name, record_ids=batch)
+        deleted_count += await chunk_model.delete_chunks_by_ids(chunk_ids=batch)
+
+    if deleted_count:
+        logger.warning(f"Deleted {deleted_count} chunks left by a failed attempt in project {project_id}")
+
+    return deleted_count
+
+@celery_app.task(
+                 bind=True, name="tasks.file_processing.append_file_tail",
+                 autoretry_for=(Exception,),
+                 retry_kwargs={'max_retries': 3, 'countdown': 60}
+                )
+def append_file_tail(self, project_id: int, file_id: str, chunk_size: int = None,
+                     overlap_size: int = None, chunking_method: str = None):
+
+    return run_async(
+        _append_file_tail(self, project_id, file_id, chunk_size=chunk_size,
+                          overlap_size=overlap_size, chunking_method=chunking_method)
+    )
+
+
+async def _append_file_tail(task_instance, project_id: int, file_id: str, chunk_size: int = None,
+                            overlap_size: int = None, chunking_method: str = None):
+    """
+    Chunk and embed only what a growing log file gained since its last run.
+
+    The asset's config keeps the tail state: the offset to read from, the end
+    of the last line read with its hash (to detect a rotated or rewritten
+    file), the open chunk and the chunking parameters. The open chunk is
+    replaced by the re-chunked tail. The tail state also lists the chunks not
+    indexed yet and the replaced open chunks not deleted yet, so a run that
+    failed after committing its chunks is finished by the next one, even
+    when the file has not grown since.
+    """
+    db_engine, vectordb_client = None, None
+
+    try:
+
+        (db_engine, db_client, llm_provider_factory, 
+        vectordb_provider_factory,
+        generation_client, embedding_client,
+        vectordb_client, template_parser) = await get_setup_utils()
+
+        settings = get_settings()
+
+        project_model = await ProjectModel.create_instance(
+            db_client=db_client
+        )
+
+        asset_model = await AssetModel.create_instance(
+            db_client=db_client
+        )
+
+        project = await project_model.get_project_or_create_one(
+            project_id=project_id
+        )
+
+        asset_record = await asset_model.get_asset_record(
+            asset_project_id=project.project_id,
+            asset_name=file_id
+        )
+        if asset_record is None:
+            return { "signal": ResponseSignal.FILE_ID_ERROR.value, "file_id": file_id }
+
+        tail = (asset_record.asset_config or {}).get("tail") or {}
+        chunk_size = chunk_size or tail.get("chunk_size", 100)
+        overlap_size = overlap_size if overlap_size is not None else tail.get("overlap_size", 20)
+        chunking_method = chunking_method or tail.get("chunking_method", "log_time_window")
+
+        process_controller = ProcessController(project_id=project_id)
+
+        # the bytes read last time must still be there, unchanged
+        end_offset = tail.get("end_offset", 0)
+        if end_offset and process_controller.get_last_line_hash(file_id, end_offset) != tail.get("last_line_hash"):
+            logger.error(f"File {file_id} was rotated or rewritten since offset {end_offset}")
+            return { "signal": ResponseSignal.FILE_TAIL_MISMATCH.value, "file_id": file_id }
+
+        offset = tail.get("offset", 0)
+        tail_state = { "seed": tail.get("seed") }
+        file_chunks = process_controller.tail_file_chunks(
+            file_id=file_id,
+            offset=offset,
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            chunking_method=chunking_method,
+            block_size=settings.FILE_PROCESSING_BLOCK_SIZE,
+            tail_state=tail_state,
+            log_format=(asset_record.asset_config or {}).get("log_format")
+        )
+        if file_chunks is None:
+            return { "signal": ResponseSignal.FILE_ID_ERROR.value, "file_id": file_id }
+
+        # a tail is what arrived since the last run, small enough to commit at once
+        closed_chunks = tail.get("closed_chunks", 0)
+        records = [
+            {
+                "chunk_text": chunk.page_content,
+                "chunk_metadata": chunk.metadata,
+                "chunk_order": closed_chunks + i + 1,
+                "chunk_project_id": project.project_id,
+                "chunk_asset_id": asset_record.asset_id,
+            }
+            for i, chunk in enumerate(file_chunks)
+        ]
+
+        # no new complete line since the last run, nor chunks a failed run left behind
+        has_new_lines = tail_state["end_offset"] != end_offset
+        if not has_new_lines and not (tail.get("unindexed_chunk_ids") or tail.get("stale_chunk_ids")):
+            return { "signal": ResponseSignal.PROCESSING_SUCCESS.value, "inserted_chunks": 0,
+                     "indexed_chunks": 0, "project_id": project_id }
+
+        has_open_chunk = tail_state["open_offset"] is not None
+        new_end_offset = tail_state["end_offset"]
+
+        nlp_controller = NLPController(
+            vectordb_client=vectordb_client,
+            generation_client=generation_client,
+            embedding_client=embedding_client,
+            template_parser=template_parser,
+        )
+        collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
+
+        _ = await vectordb_client.create_collection(
+            collection_name=collection_name,
+            embedding_size=embedding_client.embedding_size,
+            do_reset=False,
+        )
+
+        if has_new_lines:
+            chunk_ids = await asset_model.append_asset_chunks(
+                asset_id=asset_record.asset_id,
+                chunks=records,
+                tail={
+                    "offset": tail_state["open_offset"] if has_open_chunk else new_end_offset,
+                    "end_offset": new_end_offset,
+                    "last_line_hash": process_controller.get_last_line_hash(file_id, new_end_offset),
+                    "closed_chunks": closed_chunks + len(records) - (1 if has_open_chunk else 0),
+                    "seed": tail_state["seed"],
+                    "chunk_size": chunk_size,
+                    "overlap_size": overlap_size,
+                    "chunking_method": chunking_method,
+                },
+                expected_offset=offset,
+                asset_size=new_end_offset,
+                replaced_chunk_id=tail.get("open_chunk_id"),
+                has_open_chunk=has_open_chunk,
+            )
+            if chunk_ids is None:
+                raise Exception(f"Tail of {file_id} was moved by another run, retrying from its state")
+
+            asset_record = await asset_model.get_asset_by_id(asset_id=asset_record.asset_id)
+            tail = asset_record.asset_config["tail"]
+        else:
+            records = []
+
+        chunk_model = await ChunkModel.create_instance(
+            db_client=db_client
+        )
+
+        # replaced open chunks: the vector references the chunk, it goes first
+        stale_chunk_ids = tail.get("stale_chunk_ids", [])
+        if stale_chunk_ids:
+            _ = await vectordb_client.delete_records(collection_name=collection_name,
+                                                     record_ids=stale_chunk_ids)
+            _ = await chunk_model.delete_chunks_by_ids(chunk_ids=stale_chunk_ids)
+
+        # this run's chunks and those an earlier run committed but failed to embed
+        unindexed_chunk_ids = tail.get("unindexed_chunk_ids", [])
+        existing_ids = await vectordb_client.get_existing_record_ids(
+            collection_name=collection_name, record_ids=unindexed_chunk_ids
+        )
+        missing_ids = [ i for i in unindexed_chunk_ids if i not in existing_ids ]
+
+        async def chunk_pages():
+            if missing_ids:
+                yield await chunk_model.get_chunks_by_ids(project_id=project.project_id,
+                                                          chunk_ids=missing_ids)
+
+        indexed_chunks = await nlp_controller.index_chunks_pipelined(
+            project=project,
+            chunk_pages=chunk_pages(),
+        )
+
+        _ = await asset_model.settle_asset_tail(
+            asset_id=asset_record.asset_id,
+            indexed_chunk_ids=unindexed_chunk_ids,
+            deleted_chunk_ids=stale_chunk_ids,
+        )
+
+        # new vectors: let the API drop cached metadata and search results for this collection
+        await vectordb_client.metadata_cache.invalidate(collection_name)
+
+        return {
+            "signal": ResponseSignal.PROCESSING_SUCCESS.value,
+            "inserted_chunks": len(records),
+            "indexed_chunks": indexed_chunks,
+            "end_offset": new_end_offset,
+            "project_id": project_id,
+        }
+
+    except Exception as e:
+        logger.error(f"Tail processing failed: {str(e)}")
+        raise
+    finally:
+        try:
+            await release_setup_utils(db_engine, vectordb_client)
         except Exception as e:
-            logger.error(f"Task failed while cleaning: {str(e)}")
\ No newline at end of file
+            logger.error(f"Task failed while cleaning: {str(e)}")
@@ -1,6 +1,5 @@
-from celery_app import celery_app, get_setup_utils
+from celery_app import celery_app, get_setup_utils, release_setup_utils, run_async
 from helpers.config import get_settings
-import asyncio
 from utils.idempotency_manager import IdempotencyManager
 
 import logging
@@ -13,7 +12,7 @@ logger = logging.getLogger(__name__)
                 )
 def clean_celery_executions_table(self):
 
-    return asyncio.run(
+    return run_async(
         _clean_celery_executions_table(self)
     )
 
@@ -41,10 +40,6 @@ async def _clean_celery_executions_table(task_instance):
         raise
     finally:
         try:
-            if db_engine:
-                await db_engine.dispose()
-            
-            if vectordb_client:
-                await vectordb_client.disconnect()
+            await release_setup_utils(db_engine, vectordb_client)
         except Exception as e:
             logger.error(f"Task failed while cleaning: {str(e)}")
\ No newline at end of file
@@ -1,10 +1,18 @@
-from celery import chain
-from celery_app import celery_app, get_setup_utils
+from celery import chain, chord, group
+from celery.exceptions import Ignore
+from celery_app import celery_app, get_setup_utils, release_setup_utils, run_async
 from helpers.config import get_settings
-import asyncio
 from tasks.file_processing import process_project_files
-from tasks.data_indexing import _index_data_content
+from tasks.data_indexing import _index_data_content, StreamedIndexing, abort_bulk_load
 from utils.progress_manager import ProgressManager
+from utils.progress_broadcaster import ProgressBroadcaster
+from stores.vectordb.VectorDBEnums import PgVectorIndexBuildModeEnums
+from models.ProjectModel import ProjectModel
+from models.AssetModel import AssetModel
+from models.ChunkModel import ChunkModel
+from models.enums.AssetTypeEnum import AssetTypeEnum
+from controllers import NLPController
+from models import ResponseSignal
 
 import logging
 import traceback
@@ -15,15 +23,19 @@ logger = logging.getLogger(__name__)
                  autoretry_for=(Exception,),
                  retry_kwargs={'max_retries': 3, 'countdown': 60}
                 )
-def push_after_process_task(self, prev_task_result):
+def push_after_process_task(self, prev_task_result, do_reset: int = None, workflow_id: str = None):
+
+    # a workflow fanned out per file joins here with one result per file
+    if isinstance(prev_task_result, list):
+        prev_task_result = merge_file_results(prev_task_result)
 
     project_id = prev_task_result.get("project_id")
-    do_reset = prev_task_result.get("do_reset")
-    workflow_id = prev_task_result.get("workflow_id")
+    do_reset = prev_task_result.get("do_reset") if do_reset is None else do_reset
+    workflow_id = workflow_id or prev_task_result.get("workflow_id")
     total_chunks = prev_task_result.get("inserted_chunks", 0)
 
     # Run all async operations in a single event loop
-    task_results = asyncio.run(
+    task_results = run_async(
         _run_embedding_phase(self, project_id, do_reset, workflow_id, total_chunks)
     )
 
@@ -35,9 +47,197 @@ def push_after_process_task(self, prev_task_result):
     }
 
 
+def merge_file_results(file_results: list) -> dict:
+    """Combine the results of the per-file chunking tasks of a chord."""
+    return {
+        "project_id": file_results[0].get("project_id"),
+        "workflow_id": file_results[0].get("workflow_id"),
+        "inserted_chunks": sum(r.get("inserted_chunks", 0) for r in file_results),
+        "index_batch_ids": [ i for r in file_results for i in r.get("index_batch_ids", []) ],
+        "processed_files": sum(r.get("processed_files", 0) for r in file_results),
+    }
+
+
+@celery_app.task(
+                 bind=True, name="tasks.process_workflow.finish_streamed_workflow",
+                 autoretry_for=(Exception,),
+                 retry_kwargs={'max_retries': 3, 'countdown': 60}
+                )
+def finish_streamed_workflow(self, prev_task_result, defer_index_build: bool = False,
+                             workflow_id: str = None, pending_batch_ids: list = None,
+                             indexed_chunks: int = 0, polls: int = 0):
+    """
+    Join the index_chunk_batch tasks the chunking tasks dispatched, then
+    wrap up. Unfinished batches are polled by re-sending this task (same id,
+    same retry count) every FILE_PROCESSING_STREAM_JOIN_INTERVAL seconds,
+    never by waiting in it, so a worker slot stays free for them and polls
+    do not use up the retries kept for errors. A failed batch ends the
+    workflow without retrying.
+    """
+    if isinstance(prev_task_result, list):
+        prev_task_result = merge_file_results(prev_task_result)
+
+    project_id = prev_task_result.get("project_id")
+    workflow_id = workflow_id or prev_task_result.get("workflow_id")
+    total_chunks = prev_task_result.get("inserted_chunks", 0)
+
+    if pending_batch_ids is None:
+        pending_batch_ids = prev_task_result.get("index_batch_ids", [])
+
+    pending_batch_ids, finished_chunks, error = StreamedIndexing.join(pending_batch_ids)
+
+    if error:
+        run_async(_fail_streamed_indexing(project_id, workflow_id, defer_index_build, error))
+        return {
+            "project_id": project_id,
+            "workflow_id": workflow_id,
+            "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value,
+            "error": error
+        }
+
+    indexed_chunks += finished_chunks
+    run_async(_report_streamed_indexing(project_id, workflow_id, polls == 0, indexed_chunks, total_chunks))
+
+    if pending_batch_ids:
+        self.signature_from_request(
+            args=(prev_task_result,),
+            kwargs={
+                "defer_index_build": defer_index_build,
+                "workflow_id": workflow_id,
+                "pending_batch_ids": pending_batch_ids,
+                "indexed_chunks": indexed_chunks,
+                "polls": polls + 1,
+            },
+            countdown=get_settings().FILE_PROCESSING_STREAM_JOIN_INTERVAL,
+            retries=self.request.retries,
+        ).apply_async()
+        raise Ignore()
+
+    task_results = run_async(
+        _finish_streamed_indexing(project_id, workflow_id, defer_index_build, indexed_chunks)
+    )
+
+    return {
+        "project_id": project_id,
+        "workflow_id": workflow_id,
+        "task_results": task_results
+    }
+
+
+async def _report_streamed_indexing(project_id: int, workflow_id: str, first_poll: bool,
+                                    indexed_chunks: int, total_chunks: int):
+    if not workflow_id:
+        return
+
+    db_engine, vectordb_client = None, None
+    try:
+        (db_engine, db_client, llm_provider_factory,
+        vectordb_provider_factory,
+        generation_client, embedding_client,
+        vectordb_client, template_parser) = await get_setup_utils()
+
+        broadcaster = ProgressBroadcaster(db_client, db_engine)
+        if first_poll:
+            await broadcaster.start_embedding(workflow_id, project_id, total_chunks)
+
+        await broadcaster.update_embedding(
+            workflow_id=workflow_id,
+            project_id=project_id,
+            chunks_embedded=indexed_chunks,
+            total_chunks=total_chunks
+        )
+    except Exception as e:
+        logger.error(f"Failed to report streamed indexing progress: {e}")
+    finally:
+        await release_setup_utils(db_engine, vectordb_client)
+
+
+async def _fail_streamed_indexing(project_id: int, workflow_id: str, defer_index_build: bool,
+                                  error: str):
+    """A batch failed: restore the deferred vector index and mark the workflow failed."""
+    db_engine, vectordb_client = None, None
+    try:
+        (db_engine, db_client, llm_provider_factory,
+        vectordb_provider_factory,
+        generation_client, embedding_client,
+        vectordb_client, template_parser) = await get_setup_utils()
+
+        if defer_index_build:
+            nlp_controller = NLPController(
+                vectordb_client=vectordb_client,
+                generation_client=generation_client,
+                embedding_client=embedding_client,
+                template_parser=template_parser,
+            )
+            await abort_bulk_load(vectordb_client, nlp_controller.create_collection_name(project_id=project_id))
+
+        if workflow_id:
+            broadcaster = ProgressBroadcaster(db_client, db_engine)
+            await broadcaster.fail_workflow(workflow_id, project_id, error)
+    except Exception as e:
+        logger.error(f"Failed to mark workflow failure: {e}")
+    finally:
+        await release_setup_utils(db_engine, vectordb_client)
+
+
+async def _finish_streamed_indexing(project_id: int, workflow_id: str, defer_index_build: bool,
+                                    indexed_chunks: int):
+    """Build the deferred vector index, drop cached collection state and mark the workflow done."""
+    db_engine, vectordb_client = None, None
+    broadcaster = None
+    try:
+        (db_engine, db_client, llm_provider_factory, 
+        vectordb_provider_factory,
+        generation_client, embedding_client,
+        vectordb_client, template_parser) = await get_setup_utils()
+
+        if workflow_id:
+            broadcaster = ProgressBroadcaster(db_client, db_engine)
+
+        nlp_controller = NLPController(
+            vectordb_client=vectordb_client,
+            generation_client=generation_client,
+            embedding_client=embedding_client,
+            template_parser=template_parser,
+        )
+        collection_name = nlp_controller.create_collection_name(project_id=project_id)
+
+        if defer_index_build:
+            if broadcaster:
+                await broadcaster.start_indexing(workflow_id, project_id, collection_name)
+
+            _ = await vectordb_client.finish_bulk_load(collection_name=collection_name)
+
+            if broadcaster:
+                await broadcaster.complete_indexing(workflow_id, project_id, collection_name)
+
+        # new vectors: let the API drop cached metadata and search results for this collection
+        await vectordb_client.metadata_cache.invalidate(collection_name)
+
+        task_results = {
+            "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
+            "inserted_items_count": indexed_chunks
+        }
+
+        if broadcaster:
+            await broadcaster.complete_workflow(workflow_id, project_id, task_results)
+
+        return task_results
+
+    except Exception as e:
+        if broadcaster:
+            try:
+                await broadcaster.fail_workflow(workflow_id, project_id, str(e))
+            except Exception as inner_e:
+                logger.error(f"Failed to mark workflow failure: {inner_e}")
+        raise
+    finally:
+        await release_setup_utils(db_engine, vectordb_client)
+
+
 async def _run_embedding_phase(task_instance, project_id: int, do_reset: int, workflow_id: str, total_chunks: int):
     """Run the embedding phase with progress tracking - all in one async context."""
-    db_engine = None
+    db_engine, vectordb_client = None, None
     try:
         (db_engine, db_client, llm_provider_factory, 
         vectordb_provider_factory,
@@ -69,17 +269,16 @@ async def _run_embedding_phase(task_instance, project_id: int, do_reset: int, wo
         # Update progress: failure
         if workflow_id:
             try:
-                db_engine2, db_client2 = (await get_setup_utils())[0:2]
+                setup_utils = await get_setup_utils()
+                db_engine2, db_client2 = setup_utils[0:2]
                 progress_manager = ProgressManager(db_client2, db_engine2)
                 await progress_manager.mark_workflow_failure(workflow_id, str(e))
-                if db_engine2:
-                    await db_engine2.dispose()
+                await release_setup_utils(db_engine2, setup_utils[6])
             except Exception as inner_e:
                 logger.error(f"Failed to mark workflow failure: {inner_e}")
         raise
     finally:
-        if db_engine:
-            await db_engine.dispose()
+        await release_setup_utils(db_engine, vectordb_client)
 
 
 from utils.idempotency_manager import IdempotencyManager
@@ -91,49 +290,168 @@ from utils.idempotency_manager import IdempotencyManager
                 )
 def process_and_push_workflow(  self, project_id: int, 
                                 file_id: int, chunk_size: int,
-                                overlap_size: int, do_reset: int, chunking_method: str = "simple"):
+                                overlap_size: int, do_reset: int, chunking_method: str = "simple",
+                                fan_out: bool = None, streaming: bool = None):
 
     # Use the current task's ID as the workflow ID, as this is what the frontend receives
     workflow_id = self.request.id
     logger.warning(f"Starting workflow with ID: {workflow_id} for project: {project_id}")
 
     # Initialize workflow progress and create task record in a SINGLE async context
+    # (without it the index is maintained inline, nothing waits on a deferred build)
+    defer_index_build = False
     try:
-        asyncio.run(_initialize_all(workflow_id, project_id, file_id, chunk_size, overlap_size, do_reset, chunking_method))
+        defer_index_build = run_async(_initialize_all(workflow_id, project_id, file_id, chunk_size, overlap_size, do_reset, chunking_method))
         logger.warning(f"Workflow initialized successfully: {workflow_id}")
     except Exception as e:
         logger.error(f"Failed to initialize workflow: {e}")
         logger.error(traceback.format_exc())
 
-    # Start the actual workflow chain
-    workflow = chain(
-        process_project_files.s(project_id, file_id, chunk_size, overlap_size, do_reset, chunking_method, workflow_id=workflow_id),
-        push_after_process_task.s()
-    )
+    settings = get_settings()
+    if fan_out is None:
+        fan_out = settings.FILE_PROCESSING_FAN_OUT
+    if streaming is None:
+        streaming = settings.FILE_PROCESSING_STREAM_TO_INDEX
+
+    file_ids = []
+    if fan_out and not file_id:
+        try:
+            file_ids = run_async(_prepare_file_fan_out(workflow_id, project_id, do_reset,
+                                                         streaming=streaming,
+                                                         defer_index_build=defer_index_build))
+        except Exception as e:
+            logger.error(f"Failed to fan out workflow per file, processing files in series: {e}")
+            logger.error(traceback.format_exc())
+
+    if streaming:
+        # embedding runs while chunking goes on, the last step only wraps up
+        final_step = finish_streamed_workflow.s(defer_index_build=defer_index_build, workflow_id=workflow_id)
+    else:
+        final_step = push_after_process_task.s(do_reset=do_reset, workflow_id=workflow_id)
+
+    if len(file_ids) > 1:
+        # one chunking task per file, indexing starts once all of them are done
+        workflow = chord(
+            group(
+                process_project_files.s(project_id, asset_name, chunk_size, overlap_size, 0, chunking_method,
+                                        workflow_id=workflow_id, per_file_progress=True,
+                                        stream_to_index=streaming, defer_index_build=defer_index_build)
+                for asset_name in file_ids
+            ),
+            final_step
+        )
+    elif streaming:
+        workflow = chain(
+            process_project_files.s(project_id, file_id, chunk_size, overlap_size, do_reset, chunking_method,
+                                    workflow_id=workflow_id, stream_to_index=True,
+                                    defer_index_build=defer_index_build),
+            final_step
+        )
+    else:
+        # Start the actual workflow chain
+        workflow = chain(
+            process_project_files.s(project_id, file_id, chunk_size, overlap_size, do_reset, chunking_method, workflow_id=workflow_id),
+            push_after_process_task.s()
+        )
 
     result = workflow.apply_async()
     
     return {
         "signal": "WORKFLOW_STARTED",
         "workflow_id": workflow_id,
+        "fan_out_files": len(file_ids) if len(file_ids) > 1 else 0,
+        "streaming": bool(streaming),
         "tasks": ["tasks.file_processing.process_project_files", 
                   "tasks.data_indexing.index_data_content"]
     }
 
 
+async def _prepare_file_fan_out(workflow_id: str, project_id: int, do_reset: int,
+                                streaming: bool = False, defer_index_build: bool = False) -> list:
+    """
+    List the project files to fan out over. With more than one file, the
+    project data is reset here once (instead of in every file task) and the
+    per-file progress of the workflow is initialized. Streaming workflows
+    also get their collection created here, before the file tasks race for it.
+    """
+    db_engine, vectordb_client = None, None
+    try:
+        (db_engine, db_client, llm_provider_factory,
+        vectordb_provider_factory,
+        generation_client, embedding_client,
+        vectordb_client, template_parser) = await get_setup_utils()
+
+        project_model = await ProjectModel.create_instance(db_client=db_client)
+        project = await project_model.get_project_or_create_one(project_id=project_id)
+
+        asset_model = await AssetModel.create_instance(db_client=db_client)
+        project_files = await asset_model.get_all_project_assets(
+            asset_project_id=project.project_id,
+            asset_type=AssetTypeEnum.FILE.value,
+        )
+
+        file_ids = [ record.asset_name for record in project_files ]
+        if len(file_ids) <= 1:
+            return file_ids
+
+        nlp_controller = NLPController(
+            vectordb_client=vectordb_client,
+            generation_client=generation_client,
+            embedding_client=embedding_client,
+            template_parser=template_parser,
+        )
+        collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
+
+        if do_reset == 1:
+            _ = await vectordb_client.delete_collection(collection_name=collection_name)
+
+            chunk_model = await ChunkModel.create_instance(db_client=db_client)
+            _ = await chunk_model.delete_chunks_by_project_id(project_id=project.project_id)
+
+        if streaming:
+            _ = await vectordb_client.create_collection(
+                collection_name=collection_name,
+                embedding_size=embedding_client.embedding_size,
+                do_reset=False,
+            )
+            if defer_index_build:
+                # drop the index once up front, each file task defers it in its own process
+                try:
+                    _ = await vectordb_client.begin_bulk_load(collection_name=collection_name)
+                finally:
+                    _ = await vectordb_client.release_bulk_load(collection_name=collection_name)
+
+        broadcaster = ProgressBroadcaster(db_client, db_engine)
+        await broadcaster.start_file_chunking(workflow_id, project_id, file_ids)
+
+        return file_ids
+
+    finally:
+        await release_setup_utils(db_engine, vectordb_client)
+
+
 async def _initialize_all(workflow_id: str, project_id: int, file_id: int, 
                           chunk_size: int, overlap_size: int, do_reset: int, chunking_method: str):
-    """Initialize workflow progress and task record in a single async context."""
-    db_engine = None
+    """
+    Initialize workflow progress and task record in a single async context.
+    Returns whether the vector index build is deferred to the end of the workflow.
+    """
+    db_engine, vectordb_client = None, None
     try:
-        db_engine, db_client = (await get_setup_utils())[0:2]
+        setup_utils = await get_setup_utils()
+        db_engine, db_client, vectordb_client = setup_utils[0], setup_utils[1], setup_utils[6]
         
         # 1. Create workflow progress record
+        # a full re-index with a deferred index build adds a third "indexing" step
+        defer_index_build = bool(do_reset) and (
+            get_settings().VECTOR_DB_PGVEC_INDEX_BUILD_MODE == PgVectorIndexBuildModeEnums.DEFERRED.value
+        )
+
         progress_manager = ProgressManager(db_client, db_engine)
         await progress_manager.create_workflow_progress(
             workflow_id=workflow_id,
             project_id=project_id,
-            total_steps=2
+            total_steps=3 if defer_index_build else 2
         )
         logger.info(f"Created workflow progress record for: {workflow_id}")
         
@@ -153,11 +471,12 @@ async def _initialize_all(workflow_id: str, project_id: int, file_id: int,
             celery_task_id=workflow_id
         )
         logger.info(f"Created task record for: {workflow_id}")
+
+        return defer_index_build
         
     except Exception as e:
         logger.error(f"Error in _initialize_all: {e}")
         logger.error(traceback.format_exc())
         raise
     finally:
-        if db_engine:
-            await db_engine.dispose()
+        await release_setup_utils(db_engine, vectordb_client)
@@ -80,6 +80,45 @@ class IdempotencyManager:
         finally:
             await session.close()
 
+    async def get_checkpoint(self, task_name: str, task_args: dict, celery_task_id: str) -> dict:
+        """Checkpoint saved by a previous attempt of this task, None if there is none."""
+        existing_task = await self.get_existing_task(task_name, task_args, celery_task_id)
+        return existing_task.checkpoint if existing_task else None
+
+    async def save_checkpoint(self, task_name: str, task_args: dict,
+                              celery_task_id: str, checkpoint: dict):
+        """Record how far the task got, so a retry (same celery task id) can resume from there."""
+        args_hash = self.create_args_hash(task_name, task_args)
+
+        session = self.db_client()
+        try:
+            stmt = select(CeleryTaskExecution).where(
+                CeleryTaskExecution.celery_task_id == celery_task_id,
+                CeleryTaskExecution.task_name == task_name,
+                CeleryTaskExecution.task_args_hash == args_hash
+            )
+            result = await session.execute(stmt)
+            task_record = result.scalar_one_or_none()
+
+            if task_record is None:
+                task_record = CeleryTaskExecution(
+                    task_name=task_name,
+                    task_args_hash=args_hash,
+                    task_args=task_args,
+                    celery_task_id=celery_task_id,
+                    status='STARTED',
+                    started_at=datetime.utcnow()
+                )
+                session.add(task_record)
+
+            task_record.checkpoint = checkpoint
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise e
+        finally:
+            await session.close()
+
     async def should_execute_task(self, task_name: str, task_args: dict,
                                   celery_task_id: str, 
                                   task_time_limit: int = 600) -> tuple[bool, CeleryTaskExecution]:
@@ -0,0 +1,105 @@
+"""
+In-process LRU + TTL cache for the async request path.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class AsyncLRUCache:
+    """
+    Bounded LRU cache with per-entry TTL, safe to share between coroutines.
+
+    Concurrent misses on the same key share one computation (single flight),
+    so a burst of identical queries triggers a single embedding / search.
+    Results that are None or False are not cached, nor are results of
+    computations still running when their key was invalidated.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._in_flight = {}
+        self._stale = set()     # in-flight futures whose key was invalidated meanwhile
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() > expires_at:
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_set(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        _missing = object()
+        value = self.get(key, _missing)
+        if value is not _missing:
+            self.hits += 1
+            return value
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.hits += 1
+            return await asyncio.shield(in_flight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+
+        try:
+            value = await factory()
+        except BaseException as e:
+            future.set_exception(e)
+            # nobody else may be waiting, keep the loop from logging it
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if value is not None and value is not False and future not in self._stale:
+                self.set(key, value)
+            return value
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            self._stale.discard(future)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool] = None):
+        """
+        Drop every entry whose key matches `predicate`, or everything. Matching
+        computations still running are not cached when they finish, and later
+        misses start a new one instead of waiting for them.
+        """
+        for key in [ k for k in self._in_flight if predicate is None or predicate(k) ]:
+            self._stale.add(self._in_flight.pop(key))
+
+        if predicate is None:
+            self._entries.clear()
+            return
+
+        for key in [ k for k in self._entries if predicate(k) ]:
+            del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
@@ -6,6 +6,8 @@ import time
 # Define metrics
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP Requests', ['method', 'endpoint', 'status'])
 REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'HTTP Request Latency', ['method', 'endpoint'])
+EMBEDDING_CACHE_HITS = Counter('embedding_cache_hits_total', 'Embeddings served from the embedding cache', ['model'])
+EMBEDDING_CACHE_MISSES = Counter('embedding_cache_misses_total', 'Embeddings requested from the provider', ['model'])
 
 class PrometheusMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
@@ -119,6 +119,55 @@ class ProgressBroadcaster:
             message=f"Chunking complete! Created {total_chunks} chunks. Starting embedding..."
         )
 
+    async def start_file_chunking(
+        self,
+        workflow_id: str,
+        project_id: int,
+        file_ids: list
+    ):
+        """Mark the start of a chunking phase fanned out as one task per file."""
+        await self.progress_manager.mark_file_chunking_start(
+            workflow_id=workflow_id,
+            file_ids=file_ids
+        )
+        await self._publish_to_redis(
+            workflow_id=workflow_id,
+            project_id=project_id,
+            status="CHUNKING",
+            current_step="chunking",
+            current_step_number=1,
+            message=f"Starting chunking phase for {len(file_ids)} file(s) in parallel...",
+            overall_progress=5.0
+        )
+
+    async def update_file_chunking(
+        self,
+        workflow_id: str,
+        project_id: int,
+        file_id: str,
+        chunks_created: int,
+        completed: bool = False
+    ):
+        """Update the progress of one file and the aggregated chunking progress."""
+        progress_record = await self.progress_manager.update_file_chunking_progress(
+            workflow_id=workflow_id,
+            file_id=file_id,
+            chunks_created=chunks_created,
+            completed=completed
+        )
+        if progress_record is None:
+            return
+
+        await self._publish_to_redis(
+            workflow_id=workflow_id,
+            project_id=project_id,
+            status="CHUNKING",
+            current_step="chunking",
+            step_progress=progress_record.step_progress,
+            overall_progress=progress_record.overall_progress,
+            message=progress_record.message
+        )
+
     async def start_embedding(
         self,
         workflow_id: str,
@@ -168,6 +217,49 @@ class ProgressBroadcaster:
             message=f"Embedding: Indexed {chunks_embedded}/{total_chunks} chunks"
         )
 
+    async def start_indexing(
+        self,
+        workflow_id: str,
+        project_id: int,
+        collection_name: str
+    ):
+        """Mark the start of the deferred vector index build."""
+        await self.progress_manager.mark_indexing_start(
+            workflow_id=workflow_id,
+            collection_name=collection_name
+        )
+        await self._publish_to_redis(
+            workflow_id=workflow_id,
+            project_id=project_id,
+            status="INDEXING",
+            current_step="indexing",
+            current_step_number=3,
+            step_progress=0.0,
+            overall_progress=98.0,
+            message=f"Building vector index for {collection_name}..."
+        )
+
+    async def complete_indexing(
+        self,
+        workflow_id: str,
+        project_id: int,
+        collection_name: str
+    ):
+        """Mark the vector index build as complete."""
+        await self.progress_manager.mark_indexing_complete(
+            workflow_id=workflow_id,
+            collection_name=collection_name
+        )
+        await self._publish_to_redis(
+            workflow_id=workflow_id,
+            project_id=project_id,
+            status="INDEXING",
+            current_step="indexing",
+            step_progress=100.0,
+            overall_progress=99.0,
+            message=f"Vector index for {collection_name} is ready."
+        )
+
     async def complete_workflow(
         self,
         workflow_id: str,
@@ -20,12 +20,14 @@ class ProgressManager:
     # Step definitions
     STEP_CHUNKING = ProgressStatusEnum.STEP_CHUNKING.value
     STEP_EMBEDDING = ProgressStatusEnum.STEP_EMBEDDING.value
+    STEP_INDEXING = ProgressStatusEnum.STEP_INDEXING.value
     
     # Status definitions
     STATUS_PENDING = ProgressStatusEnum.STATUS_PENDING.value
     STATUS_STARTED = ProgressStatusEnum.STATUS_STARTED.value
     STATUS_CHUNKING = ProgressStatusEnum.STATUS_CHUNKING.value
     STATUS_EMBEDDING = ProgressStatusEnum.STATUS_EMBEDDING.value
+    STATUS_INDEXING = ProgressStatusEnum.STATUS_INDEXING.value
     STATUS_SUCCESS = ProgressStatusEnum.STATUS_SUCCESS.value
     STATUS_FAILURE = ProgressStatusEnum.STATUS_FAILURE.value
 
@@ -89,7 +91,8 @@ class ProgressManager:
         message: Optional[str] = None,
         result: Optional[Dict[str, Any]] = None,
         error_message: Optional[str] = None,
-        completed: bool = False
+        completed: bool = False,
+        file_progress: Optional[Dict[str, Any]] = None
     ) -> Optional[WorkflowProgress]:
         """
         Update workflow progress in the database.
@@ -105,6 +108,7 @@ class ProgressManager:
             result: JSON result data (on success)
             error_message: Error message (on failure)
             completed: Whether the workflow is complete
+            file_progress: Per-file progress map (fanned out workflows)
         
         Returns:
             Updated WorkflowProgress record or None if not found
@@ -132,6 +136,8 @@ class ProgressManager:
                 update_values["error_message"] = error_message
             if completed:
                 update_values["completed_at"] = datetime.now(timezone.utc)
+            if file_progress is not None:
+                update_values["file_progress"] = file_progress
             
             # Update the record
             stmt = (
@@ -250,6 +256,95 @@ class ProgressManager:
             message=f"Chunking complete! Created {total_chunks} chunks. Starting embedding..."
         )
 
+    async def mark_file_chunking_start(
+        self,
+        workflow_id: str,
+        file_ids: list
+    ) -> Optional[WorkflowProgress]:
+        """Mark the start of a chunking phase fanned out as one task per file."""
+        return await self.update_progress(
+            workflow_id=workflow_id,
+            status=self.STATUS_CHUNKING,
+            current_step=self.STEP_CHUNKING,
+            current_step_number=1,
+            step_progress=0.0,
+            overall_progress=5.0,
+            message=f"Starting chunking phase for {len(file_ids)} file(s) in parallel...",
+            file_progress={
+                file_id: {"status": self.STATUS_PENDING, "chunks_created": 0}
+                for file_id in file_ids
+            }
+        )
+
+    async def update_file_chunking_progress(
+        self,
+        workflow_id: str,
+        file_id: str,
+        chunks_created: int,
+        completed: bool = False
+    ) -> Optional[WorkflowProgress]:
+        """
+        Record the progress of one file of a fanned out chunking phase and
+        recompute the step progress over all files.
+
+        The row is locked while it is read and written back, so concurrent
+        file tasks never overwrite each other's entries.
+        """
+        session: AsyncSession = self.db_client()
+        try:
+            stmt = (
+                select(WorkflowProgress)
+                .where(WorkflowProgress.workflow_id == workflow_id)
+                .with_for_update()
+            )
+            progress_record = (await session.execute(stmt)).scalar_one_or_none()
+            if progress_record is None:
+                await session.rollback()
+                return None
+
+            file_progress = dict(progress_record.file_progress or {})
+            file_progress[file_id] = {
+                "status": self.STATUS_SUCCESS if completed else self.STATUS_CHUNKING,
+                "chunks_created": chunks_created,
+            }
+
+            total_files = len(file_progress)
+            files_processed = sum(
+                1 for entry in file_progress.values()
+                if entry["status"] == self.STATUS_SUCCESS
+            )
+            total_chunks = sum(entry["chunks_created"] for entry in file_progress.values())
+
+            step_progress = (files_processed / max(total_files, 1)) * 100
+            overall_progress = 5 + (step_progress * 0.45)  # 5% to 50%
+            message = f"Chunking: Processed {files_processed}/{total_files} files ({total_chunks} chunks created)"
+
+            await session.execute(
+                update(WorkflowProgress)
+                .where(WorkflowProgress.workflow_id == workflow_id)
+                .values(
+                    file_progress=file_progress,
+                    step_progress=step_progress,
+                    overall_progress=overall_progress,
+                    message=message,
+                    updated_at=datetime.now(timezone.utc)
+                )
+            )
+            await session.commit()
+
+            progress_record.file_progress = file_progress
+            progress_record.step_progress = step_progress
+            progress_record.overall_progress = overall_progress
+            progress_record.message = message
+            return progress_record
+
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Failed to update file progress: {e}")
+            raise e
+        finally:
+            await session.close()
+
     async def mark_embedding_start(
         self,
         workflow_id: str,
@@ -284,6 +379,35 @@ class ProgressManager:
             message=f"Embedding: Indexed {chunks_embedded}/{total_chunks} chunks into vector database"
         )
 
+    async def mark_indexing_start(
+        self,
+        workflow_id: str,
+        collection_name: str
+    ) -> Optional[WorkflowProgress]:
+        """Convenience method to mark the start of the deferred vector index build."""
+        return await self.update_progress(
+            workflow_id=workflow_id,
+            status=self.STATUS_INDEXING,
+            current_step=self.STEP_INDEXING,
+            current_step_number=3,
+            step_progress=0.0,
+            overall_progress=98.0,
+            message=f"Building vector index for {collection_name}..."
+        )
+
+    async def mark_indexing_complete(
+        self,
+        workflow_id: str,
+        collection_name: str
+    ) -> Optional[WorkflowProgress]:
+        """Convenience method to mark the vector index build as complete."""
+        return await self.update_progress(
+            workflow_id=workflow_id,
+            step_progress=100.0,
+            overall_progress=99.0,
+            message=f"Vector index for {collection_name} is ready."
+        )
+
     async def mark_workflow_success(
         self,
         workflow_id: str,
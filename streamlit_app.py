@@ -118,6 +118,8 @@ if 'current_workflow_id' not in st.session_state:
     st.session_state.current_workflow_id = None
 if 'is_processing' not in st.session_state:
     st.session_state.is_processing = False
+if 'eda_cache' not in st.session_state:
+    st.session_state.eda_cache = {}  # (project_id, file_id) -> (etag, data)
 
 # API Configuration
 API_BASE = os.getenv("API_BASE_URL", "http://4.232.170.195/")
@@ -432,10 +434,18 @@ with tab3:
             st.error("Please upload and process a file first")
         else:
             with st.spinner("Loading dashboard data..."):
-                response = make_request("GET", f"api/v1/data/eda/{project_id}/{st.session_state.last_file_id}")
+                cache_key = (project_id, st.session_state.last_file_id)
+                cached = st.session_state.eda_cache.get(cache_key)
+                response = make_request("GET", f"api/v1/data/eda/{project_id}/{st.session_state.last_file_id}",
+                                        headers={"If-None-Match": cached[0]} if cached else {})
                 
-                if response and response.status_code == 200:
-                    data = response.json()
+                if response and response.status_code in (200, 304):
+                    if response.status_code == 304:
+                        data = cached[1]
+                    else:
+                        data = response.json()
+                        if response.headers.get("ETag"):
+                            st.session_state.eda_cache[cache_key] = (response.headers["ETag"], data)
                     
                     if "error" in data:
                         st.error(f"❌ {data['error']}")